@@ -7,7 +7,7 @@ from alembic import context
 
 from app.config import settings
 from app.db.base import Base
-from app.models import Case, Topic, CaseTopic  # noqa: F401
+from app.models import Case, Topic, CaseTopic, CaseText, CaseNeighbor, CorpusState, IngestionJob  # noqa: F401
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url.replace("postgresql://", "postgresql+psycopg2://"))
@@ -0,0 +1,26 @@
+"""Add content fingerprint and embedding model to cases for resumable ingestion
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("cases", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("cases", sa.Column("embedding_model", sa.String(100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("cases", "embedding_model")
+    op.drop_column("cases", "content_hash")
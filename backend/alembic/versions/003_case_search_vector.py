@@ -0,0 +1,38 @@
+"""Add generated tsvector column with GIN index for lexical / hybrid search
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(citation, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(case_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(ratio_decidendi, '') || ' ' || coalesce(legal_issues, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', coalesce(key_principles, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(facts, '') || ' ' || coalesce(judgment, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "cases",
+        sa.Column("search_vector", TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True),
+    )
+    op.create_index("ix_cases_search_vector", "cases", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cases_search_vector", "cases")
+    op.drop_column("cases", "search_vector")
@@ -0,0 +1,31 @@
+"""Add corpus_state table holding the corpus version used for response cache invalidation
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "corpus_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO corpus_state (id, version, updated_at) VALUES (1, 1, now())")
+
+
+def downgrade() -> None:
+    op.drop_table("corpus_state")
@@ -0,0 +1,35 @@
+"""Add case_neighbors table with precomputed similar cases
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "case_neighbors",
+        sa.Column("case_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.SmallInteger(), nullable=False),
+        sa.Column("neighbor_id", sa.Integer(), nullable=False),
+        sa.Column("similarity", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["neighbor_id"], ["cases.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("case_id", "rank"),
+    )
+    op.create_index("ix_case_neighbors_neighbor_id", "case_neighbors", ["neighbor_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_case_neighbors_neighbor_id", "case_neighbors")
+    op.drop_table("case_neighbors")
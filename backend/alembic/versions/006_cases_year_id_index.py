@@ -0,0 +1,27 @@
+"""Replace ix_cases_year with a (year, id) index for keyset browsing
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Scanned backwards, this serves ORDER BY year DESC, id DESC and the
+    # (year, id) < (:year, :id) seek; it also covers plain year filters.
+    op.create_index("ix_cases_year_id", "cases", ["year", "id"])
+    op.drop_index("ix_cases_year", "cases")
+
+
+def downgrade() -> None:
+    op.create_index("ix_cases_year", "cases", ["year"])
+    op.drop_index("ix_cases_year_id", "cases")
@@ -0,0 +1,53 @@
+"""Add ingestion_jobs queue table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("batch_id", sa.String(length=36), nullable=False),
+        sa.Column("citation", sa.String(length=200), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("force", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("case_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ingestion_jobs_batch_id", "ingestion_jobs", ["batch_id"])
+    op.create_index(
+        "ix_ingestion_jobs_claim",
+        "ingestion_jobs",
+        ["run_after", "id"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_jobs_claim", "ingestion_jobs")
+    op.drop_index("ix_ingestion_jobs_batch_id", "ingestion_jobs")
+    op.drop_table("ingestion_jobs")
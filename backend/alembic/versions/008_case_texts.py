@@ -0,0 +1,116 @@
+"""Move cases.full_text into a compressed case_texts side table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 00:00:00
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+# Codecs as of this revision, frozen here rather than imported from
+# app.services.text_store so later changes to the app cannot alter the migration.
+def compress_text(text: str) -> tuple[str, bytes]:
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(raw)
+    return "zlib", zlib.compress(raw, 9)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("case texts are zstd-compressed; install zstandard to downgrade")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown case text codec {codec!r}")
+
+
+case_texts = sa.table(
+    "case_texts",
+    sa.column("case_id", sa.Integer),
+    sa.column("codec", sa.String),
+    sa.column("raw_size", sa.Integer),
+    sa.column("data", sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "case_texts",
+        sa.Column("case_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(length=10), nullable=False),
+        sa.Column("raw_size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("case_id"),
+    )
+    # Already compressed: store out of line without a second (pglz) compression pass.
+    op.execute("ALTER TABLE case_texts ALTER COLUMN data SET STORAGE EXTERNAL")
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, full_text FROM cases WHERE id > :last_id AND coalesce(full_text, '') <> '' "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        values = []
+        for case_id, text in rows:
+            codec, data = compress_text(text)
+            values.append(
+                {"case_id": case_id, "codec": codec, "raw_size": len(text.encode("utf-8")), "data": data}
+            )
+        bind.execute(case_texts.insert(), values)
+        last_id = rows[-1][0]
+
+    # The dropped column's data stays in the cases heap until it is rewritten
+    # (VACUUM FULL cases, or pg_repack to avoid the exclusive lock).
+    op.drop_column("cases", "full_text")
+
+
+def downgrade() -> None:
+    op.add_column("cases", sa.Column("full_text", sa.Text(), nullable=True))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT case_id, codec, data FROM case_texts WHERE case_id > :last_id "
+                "ORDER BY case_id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE cases SET full_text = :full_text WHERE id = :case_id"),
+            [
+                {"case_id": case_id, "full_text": decompress_text(codec, bytes(data))}
+                for case_id, codec, data in rows
+            ],
+        )
+        last_id = rows[-1][0]
+    op.drop_table("case_texts")
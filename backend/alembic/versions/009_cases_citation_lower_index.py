@@ -0,0 +1,27 @@
+"""Add a lower(citation) expression index for exact citation matches in lexical search
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lexical search matches `search_vector @@ query OR lower(citation) = :q`.
+    # With this index beside the GIN one, Postgres answers the OR with a
+    # BitmapOr of two index scans instead of a sequential scan of cases.
+    op.create_index("ix_cases_citation_lower", "cases", [sa.text("lower(citation)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cases_citation_lower", "cases")
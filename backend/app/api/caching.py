@@ -0,0 +1,104 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import orjson
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.serializers import dumps
+from app.config import settings
+from app.services.corpus_version import get_corpus_version
+from app.services.embedding_cache import normalize_query
+from app.services.metrics import stage
+from app.services.response_cache import response_cache
+from app.services.single_flight import SingleFlight
+
+# Query params that do not affect the response body.
+_IGNORED_PARAMS = {"api_key"}
+
+# Concurrent misses for the same cache key build the response once.
+build_flights = SingleFlight("response_build")
+
+
+@dataclass
+class Payload:
+    """Response content plus extra headers (e.g. X-Next-Cursor) cached alongside it."""
+
+    content: Any
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def normalized_params(request: Request) -> str:
+    """Canonical query string: sorted keys, normalised search text and topic ids."""
+    parts = []
+    for key in sorted(set(request.query_params.keys()) - _IGNORED_PARAMS):
+        values = request.query_params.getlist(key)
+        if key == "q":
+            values = [normalize_query(v) for v in values]
+        elif key == "topic_ids":
+            ids = {x.strip() for v in values for x in v.split(",") if x.strip()}
+            values = [",".join(sorted(ids, key=lambda x: (len(x), x)))]
+        parts.append(f"{key}={'|'.join(values)}")
+    return "&".join(parts)
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _cache_headers() -> dict[str, str]:
+    """Cache-Control for clients; shared caches must not serve keyed responses to other callers."""
+    max_age = settings.response_cache_max_age
+    if settings.api_key:
+        return {"Cache-Control": f"private, max-age={max_age}", "Vary": "X-API-Key"}
+    return {"Cache-Control": f"public, max-age={max_age}"}
+
+
+async def cached_json(
+    request: Request,
+    db: AsyncSession,
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve `build()` as JSON through the response cache, with ETag revalidation.
+
+    Entries are keyed on the route path, the normalised query parameters and
+    the corpus version, so an ingest run implicitly invalidates everything.
+    Concurrent misses for one key share a single build (see SingleFlight).
+    `build` may return a Payload to attach extra headers.
+    """
+    version = await get_corpus_version(db)
+    key = f"{request.url.path}?{normalized_params(request)}#v{version}"
+
+    cached = await response_cache.get(key)
+    if cached is not None:
+        etag, extra, body = cached.split(b"\n", 2)
+        etag = etag.decode()
+        extra_headers = orjson.loads(extra)
+    else:
+
+        async def produce() -> tuple[str, dict[str, str], bytes]:
+            with stage("api", "build"):
+                payload = await build()
+            if not isinstance(payload, Payload):
+                payload = Payload(payload)
+            with stage("api", "serialize"):
+                body = dumps(payload.content)
+            etag = _etag(body)
+            entry = b"\n".join([etag.encode(), orjson.dumps(payload.headers), body])
+            await response_cache.set(key, entry, settings.response_cache_ttl_seconds)
+            return etag, payload.headers, body
+
+        etag, extra_headers, body = await build_flights.do(key, produce)
+
+    headers = {**extra_headers, "ETag": etag, **_cache_headers()}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
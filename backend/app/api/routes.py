@@ -1,26 +1,45 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import defer
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.api.caching import Payload, cached_json
+from app.api.serializers import case_detail, case_summary, search_result
 from app.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, get_primary_db
 from app.models import Case, Topic
-from app.schemas import CaseResponse, CaseDetailResponse, CaseSearchResult, TopicResponse
-from app.services.search_service import search_cases, get_similar_cases
+from app.schemas import (
+    CaseResponse,
+    CaseDetailResponse,
+    CaseSearchResult,
+    IngestBatchCreated,
+    IngestBatchRequest,
+    IngestBatchStatus,
+    TopicResponse,
+)
+from app.services.job_queue import batch_progress, enqueue_batch, retry_dead_jobs
+from app.services.pagination import InvalidCursor
+from app.services.search_service import PageTooDeep, search_cases, get_similar_cases
 from app.middleware.auth import require_api_key
 
 limiter = Limiter(key_func=get_remote_address)
 
 router = APIRouter(dependencies=[Depends(require_api_key)])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-def _snippet(case: Case, max_len: int = 150) -> str | None:
-    for field in [case.ratio_decidendi, case.facts, case.judgment]:
-        if field and len(field) > 0:
-            return field[:max_len] + "..." if len(field) > max_len else field
-    return None
+
+async def _search_page(db: AsyncSession, **kwargs):
+    try:
+        return await search_cases(db, **kwargs)
+    except (InvalidCursor, PageTooDeep) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _cursor_headers(page) -> dict[str, str]:
+    return {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
 
 
 @router.get("/search", response_model=list[CaseSearchResult])
@@ -28,34 +47,37 @@ def _snippet(case: Case, max_len: int = 150) -> str | None:
 async def search(
     request: Request,
     q: str | None = Query(None, description="Search query for semantic search"),
+    mode: str | None = Query(
+        None, pattern="^(hybrid|semantic|lexical)$", description="Ranking mode (default: semantic)"
+    ),
     topic_ids: str | None = Query(None, description="Comma-separated topic IDs"),
     year_from: int | None = Query(None),
     year_to: int | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description=f"Opaque {NEXT_CURSOR_HEADER} from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
     topic_id_list = None
     if topic_ids:
         topic_id_list = [int(x.strip()) for x in topic_ids.split(",") if x.strip()]
-    results = await search_cases(
-        db, q=q, topic_ids=topic_id_list, year_from=year_from, year_to=year_to, limit=limit, offset=offset
-    )
-    return [
-        CaseSearchResult(
-            case=CaseResponse(
-                id=c.id,
-                case_name=c.case_name,
-                citation=c.citation,
-                year=c.year,
-                bench=c.bench,
-                snippet=_snippet(c),
-                similarity=sim,
-            ),
-            similarity=sim,
+
+    async def build():
+        page = await _search_page(
+            db,
+            q=q,
+            topic_ids=topic_id_list,
+            year_from=year_from,
+            year_to=year_to,
+            limit=limit,
+            offset=offset,
+            mode=mode,
+            cursor=cursor,
         )
-        for c, sim in results
-    ]
+        items = [search_result(c, sim) for c, sim in page.results]
+        return Payload(items, _cursor_headers(page))
+
+    return await cached_json(request, db, build)
 
 
 @router.get("/cases", response_model=list[CaseResponse])
@@ -67,46 +89,42 @@ async def list_cases(
     year_to: int | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description=f"Opaque {NEXT_CURSOR_HEADER} from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Browse cases with filters (no semantic search)."""
+    """Browse cases with filters (no semantic search), newest first."""
     topic_id_list = [int(x.strip()) for x in topic_ids.split(",")] if topic_ids else None
-    results = await search_cases(
-        db, q=None, topic_ids=topic_id_list, year_from=year_from, year_to=year_to, limit=limit, offset=offset
-    )
-    return [
-        CaseResponse(
-            id=c.id,
-            case_name=c.case_name,
-            citation=c.citation,
-            year=c.year,
-            bench=c.bench,
-            snippet=_snippet(c),
+
+    async def build():
+        page = await _search_page(
+            db,
+            q=None,
+            topic_ids=topic_id_list,
+            year_from=year_from,
+            year_to=year_to,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
         )
-        for c, _ in results
-    ]
+        items = [case_summary(c) for c, _ in page.results]
+        return Payload(items, _cursor_headers(page))
+
+    return await cached_json(request, db, build)
 
 
 @router.get("/cases/{case_id}", response_model=CaseDetailResponse)
 @limiter.limit(settings.rate_limit_default)
 async def get_case(request: Request, case_id: int, db: AsyncSession = Depends(get_db)):
-    r = await db.execute(select(Case).where(Case.id == case_id))
-    case = r.scalar_one_or_none()
-    if not case:
-        raise HTTPException(status_code=404, detail="Case not found")
-    return CaseDetailResponse(
-        id=case.id,
-        case_name=case.case_name,
-        citation=case.citation,
-        year=case.year,
-        bench=case.bench,
-        facts=case.facts,
-        legal_issues=case.legal_issues,
-        judgment=case.judgment,
-        ratio_decidendi=case.ratio_decidendi,
-        key_principles=case.key_principles or [],
-        source_url=case.source_url,
-    )
+    async def build():
+        r = await db.execute(
+            select(Case).options(defer(Case.embedding)).where(Case.id == case_id)
+        )
+        case = r.scalar_one_or_none()
+        if not case:
+            raise HTTPException(status_code=404, detail="Case not found")
+        return case_detail(case)
+
+    return await cached_json(request, db, build)
 
 
 @router.get("/cases/{case_id}/similar", response_model=list[CaseSearchResult])
@@ -117,26 +135,53 @@ async def similar_cases(
     limit: int = Query(5, ge=1, le=20),
     db: AsyncSession = Depends(get_db),
 ):
-    results = await get_similar_cases(db, case_id=case_id, limit=limit)
-    return [
-        CaseSearchResult(
-            case=CaseResponse(
-                id=c.id,
-                case_name=c.case_name,
-                citation=c.citation,
-                year=c.year,
-                bench=c.bench,
-                snippet=_snippet(c),
-                similarity=sim,
-            ),
-            similarity=sim,
-        )
-        for c, sim in results
-    ]
+    async def build():
+        results = await get_similar_cases(db, case_id=case_id, limit=limit)
+        return [search_result(c, sim) for c, sim in results]
+
+    return await cached_json(request, db, build)
 
 
 @router.get("/topics", response_model=list[TopicResponse])
 @limiter.limit(settings.rate_limit_default)
 async def list_topics(request: Request, db: AsyncSession = Depends(get_db)):
-    r = await db.execute(select(Topic).order_by(Topic.name))
-    return [TopicResponse.model_validate(t) for t in r.scalars().all()]
+    async def build():
+        r = await db.execute(select(Topic).order_by(Topic.name))
+        return [TopicResponse.model_validate(t) for t in r.scalars().all()]
+
+    return await cached_json(request, db, build)
+
+
+@router.post("/ingest/batches", response_model=IngestBatchCreated, status_code=202)
+@limiter.limit(settings.rate_limit_default)
+async def submit_ingest_batch(
+    request: Request, body: IngestBatchRequest, db: AsyncSession = Depends(get_primary_db)
+):
+    """Queue cases for the ingestion workers; poll the returned batch for progress."""
+    if len(body.cases) > settings.ingest_batch_max_cases:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.ingest_batch_max_cases} cases per batch"
+        )
+    batch_id, queued = await enqueue_batch(
+        db, [c.model_dump(exclude_none=True) for c in body.cases], force=body.force
+    )
+    await db.commit()
+    return IngestBatchCreated(batch_id=batch_id, queued=queued)
+
+
+@router.get("/ingest/batches/{batch_id}", response_model=IngestBatchStatus)
+@limiter.limit(settings.rate_limit_default)
+async def get_ingest_batch(request: Request, batch_id: str, db: AsyncSession = Depends(get_primary_db)):
+    progress = await batch_progress(db, batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return progress
+
+
+@router.post("/ingest/batches/{batch_id}/retry")
+@limiter.limit(settings.rate_limit_default)
+async def retry_ingest_batch(request: Request, batch_id: str, db: AsyncSession = Depends(get_primary_db)):
+    """Re-queue the batch's dead-lettered jobs."""
+    requeued = await retry_dead_jobs(db, batch_id)
+    await db.commit()
+    return {"requeued": requeued}
@@ -0,0 +1,56 @@
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+# Fast path for list/search/detail responses: rows become plain dicts shaped
+# exactly like the published schemas (CaseResponse, CaseSearchResult,
+# CaseDetailResponse) and go straight to orjson, with no model instances built
+# per row. tests/test_serializers.py keeps the shapes in step with the schemas.
+
+
+def case_summary(row, similarity: float | None = None) -> dict:
+    """CaseResponse fields from a CASE_SUMMARY_COLUMNS row."""
+    return {
+        "id": row.id,
+        "case_name": row.case_name,
+        "citation": row.citation,
+        "year": row.year,
+        "bench": row.bench,
+        "snippet": row.snippet,
+        "similarity": similarity,
+    }
+
+
+def search_result(row, similarity: float | None) -> dict:
+    """CaseSearchResult: the case plus its similarity (repeated at the top level)."""
+    return {"case": case_summary(row, similarity), "similarity": similarity}
+
+
+def case_detail(case) -> dict:
+    """CaseDetailResponse fields from a Case."""
+    return {
+        "id": case.id,
+        "case_name": case.case_name,
+        "citation": case.citation,
+        "year": case.year,
+        "bench": case.bench,
+        "facts": case.facts,
+        "legal_issues": case.legal_issues,
+        "judgment": case.judgment,
+        "ratio_decidendi": case.ratio_decidendi,
+        "key_principles": case.key_principles or [],
+        "source_url": case.source_url,
+    }
+
+
+def _default(obj: Any) -> Any:
+    # Responses still built as Pydantic models (e.g. topics) take this slower path.
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes for dicts, lists, scalars and Pydantic models."""
+    return orjson.dumps(content, default=_default)
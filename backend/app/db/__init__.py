@@ -1,4 +1,23 @@
-from .session import get_db, engine, async_session_maker, init_db
+from .session import (
+    get_db,
+    get_primary_db,
+    get_sync_engine,
+    async_engine,
+    async_session_maker,
+    init_db,
+    pool_status,
+    replica_status,
+)
 from .base import Base
 
-__all__ = ["get_db", "engine", "async_session_maker", "init_db", "Base"]
+__all__ = [
+    "get_db",
+    "get_primary_db",
+    "get_sync_engine",
+    "async_engine",
+    "async_session_maker",
+    "init_db",
+    "pool_status",
+    "replica_status",
+    "Base",
+]
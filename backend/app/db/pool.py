@@ -0,0 +1,83 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.services.metrics import DB_POOL_WAIT_SECONDS, DB_QUERY_SECONDS, statement_type
+
+
+@dataclass
+class PoolStats:
+    """Cumulative checkout counters for one connection pool."""
+
+    name: str = "primary"
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        DB_POOL_WAIT_SECONDS.labels(self.name).observe(seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Counters plus the pool's live occupancy."""
+        status = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            status.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return status
+
+
+def instrumented_pool_class(stats: PoolStats) -> type[AsyncAdaptedQueuePool]:
+    """AsyncAdaptedQueuePool that records checkout wait time into `stats`.
+
+    Wait time covers queueing for a free connection, opening overflow
+    connections and the pre-ping. The class is bound to `stats` so the pool
+    SQLAlchemy recreates on dispose() keeps reporting into it.
+    """
+
+    class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                stats.timeouts += 1
+                raise
+            finally:
+                stats.observe(time.perf_counter() - started)
+
+    return InstrumentedAsyncPool
+
+
+def record_query_timings(engine: Engine) -> None:
+    """Observe db_query_duration_seconds for every statement run on `engine`.
+
+    For async engines pass `async_engine.sync_engine`. A connection runs one
+    statement at a time, so the start time is simply kept in its info dict;
+    executemany batches count as one statement.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started", None)
+        if started is not None:
+            DB_QUERY_SECONDS.labels(statement_type(statement)).observe(time.perf_counter() - started)
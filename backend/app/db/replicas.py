@@ -0,0 +1,65 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.db.pool import PoolStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Replica:
+    name: str  # URL with the password masked
+    session_maker: Any
+    engine: Any = None
+    stats: PoolStats = field(default_factory=PoolStats)
+    down_until: float = 0.0
+    failures: int = 0
+    last_error: str | None = None
+
+
+class ReadRouter:
+    """Round-robin over read replicas, skipping ones recently seen failing.
+
+    A replica that fails to hand out a connection is marked down for
+    `retry_after` seconds, after which it is tried again; until then reads go
+    to the remaining replicas, or to the primary when none is left.
+    """
+
+    def __init__(self, replicas: list[Replica], retry_after: float = 30.0, clock=time.monotonic):
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self._clock = clock
+        self._next = 0
+
+    def candidates(self) -> list[Replica]:
+        """Healthy replicas, rotated so consecutive calls start at the next one."""
+        if not self.replicas:
+            return []
+        start = self._next % len(self.replicas)
+        self._next += 1
+        now = self._clock()
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [r for r in ordered if r.down_until <= now]
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        replica.down_until = self._clock() + self.retry_after
+        replica.failures += 1
+        replica.last_error = str(error) or type(error).__name__
+        logger.warning(
+            "Read replica %s unavailable, retrying in %.0fs: %s", replica.name, self.retry_after, error
+        )
+
+    def status(self) -> list[dict]:
+        now = self._clock()
+        return [
+            {
+                "name": r.name,
+                "healthy": r.down_until <= now,
+                "failures": r.failures,
+                "last_error": r.last_error,
+                "pool": r.stats.snapshot(r.engine.pool if r.engine is not None else None),
+            }
+            for r in self.replicas
+        ]
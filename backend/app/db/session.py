@@ -1,24 +1,150 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+from functools import lru_cache
+from uuid import uuid4
+
+from sqlalchemy import Engine, create_engine, exc, make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.config import settings
 from app.db.base import Base
+from app.db.pool import PoolStats, instrumented_pool_class, record_query_timings
+from app.db.replicas import ReadRouter, Replica
 
-# Sync engine for migrations and scripts
 sync_url = settings.database_url.replace("postgresql://", "postgresql+psycopg2://")
-engine = create_engine(sync_url, echo=False)
-
-# Async engine for FastAPI
 async_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
-async_engine = create_async_engine(async_url, echo=False)
+read_urls = [
+    u.strip().replace("postgresql://", "postgresql+asyncpg://")
+    for u in settings.database_read_urls.split(",")
+    if u.strip()
+]
+
+
+def _pgbouncer_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def asyncpg_connect_args() -> dict:
+    """Prepared-statement caching for asyncpg.
+
+    Both caches (asyncpg's own and SQLAlchemy's per-connection cache of
+    prepared statements) keep DB_STATEMENT_CACHE_SIZE statements per
+    connection. Behind PgBouncer in transaction mode a server connection can
+    change between statements, so DB_PGBOUNCER disables both caches and gives
+    every prepared statement a unique name so they never collide.
+    """
+    if settings.db_pgbouncer:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _pgbouncer_statement_name,
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+
+def async_engine_kwargs(**overrides) -> dict:
+    """Pool and driver options shared by the API engine and the batch scripts."""
+    options = dict(
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=asyncpg_connect_args(),
+    )
+    options.update(overrides)
+    return options
+
+
+# Async engine on the primary: all writes (ingestion) and reads when no replica is usable
+pool_stats = PoolStats()
+async_engine = create_async_engine(
+    async_url, poolclass=instrumented_pool_class(pool_stats), **async_engine_kwargs()
+)
+record_query_timings(async_engine.sync_engine)
 
 async_session_maker = async_sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
+def _build_replica(url: str) -> Replica:
+    name = make_url(url).render_as_string(hide_password=True)
+    stats = PoolStats(name=name)
+    connect_args = {**asyncpg_connect_args(), "timeout": settings.replica_connect_timeout}
+    engine = create_async_engine(
+        url, poolclass=instrumented_pool_class(stats), **async_engine_kwargs(connect_args=connect_args)
+    )
+    record_query_timings(engine.sync_engine)
+    return Replica(
+        name=name,
+        session_maker=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        engine=engine,
+        stats=stats,
+    )
+
+
+read_router = ReadRouter([_build_replica(u) for u in read_urls], retry_after=settings.replica_retry_seconds)
+
+# Errors that mean "this server cannot serve us right now"; pool exhaustion
+# (sqlalchemy.exc.TimeoutError) just moves on without marking the replica down.
+_UNAVAILABLE = (OSError, asyncio.TimeoutError, exc.DBAPIError)
+
+
+async def open_read_session() -> AsyncSession:
+    """Session on the next healthy read replica, failing over to the primary.
+
+    The connection is checked out eagerly so an unreachable replica is
+    detected here, marked down and skipped, rather than failing the request.
+    """
+    for replica in read_router.candidates():
+        session = replica.session_maker()
+        try:
+            await session.connection()
+        except exc.TimeoutError:
+            await session.close()
+            continue
+        except _UNAVAILABLE as e:
+            await session.close()
+            read_router.mark_down(replica, e)
+            continue
+        return session
+    return async_session_maker()
+
+
+@lru_cache(maxsize=None)
+def get_sync_engine() -> Engine:
+    """Sync engine for migrations and scripts, created on first use (never by the API)."""
+    return create_engine(
+        sync_url, echo=False, pool_pre_ping=settings.db_pool_pre_ping, pool_recycle=settings.db_pool_recycle
+    )
+
+
+def pool_status() -> dict:
+    return pool_stats.snapshot(async_engine.pool)
+
+
+def replica_status() -> list[dict]:
+    return read_router.status()
+
+
 async def get_db():
+    """Read-only session for query endpoints, load-balanced across read replicas."""
+    session = await open_read_session()
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def get_primary_db():
+    """Session on the primary, for endpoints that write or must read their own writes."""
     async with async_session_maker() as session:
         try:
             yield session
@@ -31,5 +157,5 @@ async def get_db():
 
 def init_db():
     """Create all tables. Called from migration or startup."""
-    from app.models import Case, Topic, CaseTopic  # noqa: F401 - register models
-    Base.metadata.create_all(bind=engine)
+    from app.models import Case, Topic, CaseTopic, CaseNeighbor, CorpusState, IngestionJob  # noqa: F401 - register models
+    Base.metadata.create_all(bind=get_sync_engine())
@@ -1,19 +1,42 @@
-from fastapi import FastAPI, Request
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+from sqlalchemy import text
+
 from app.config import settings
 from app.api.routes import router
+from app.db.session import async_session_maker, pool_status, replica_status
+from app.services.embedding_cache import embedding_cache
+from app.middleware.metrics import RequestMetricsMiddleware
+from app.services.metrics import EmbeddingCacheCollector, PoolCollector
+from app.services.ollama_client import ollama_client
+
+logger = logging.getLogger(__name__)
 
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ollama_client.start()
+    yield
+    await ollama_client.aclose()
+
+
 app = FastAPI(
     title="Supreme Court AI Case Explorer",
     description="AI-assisted semantic search for Indian Supreme Court landmark cases",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.state.limiter = limiter
@@ -33,11 +56,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+
 app.include_router(router, prefix="/api", tags=["api"])
 
 
+def _pool_snapshots() -> dict[str, dict]:
+    return {"primary": pool_status(), **{r["name"]: r["pool"] for r in replica_status()}}
+
+
+REGISTRY.register(PoolCollector(_pool_snapshots))
+REGISTRY.register(EmbeddingCacheCollector(embedding_cache.stats))
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/db")
+async def health_db():
+    """Primary reachability, pool occupancy and checkout wait times, and replica health."""
+    try:
+        async with async_session_maker() as session:
+            await session.execute(text("SELECT 1"))
+    except Exception:
+        # Unauthenticated endpoint: driver errors can name hosts and users, so they only go to the log.
+        logger.exception("Database health check failed")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "error",
+                "detail": "database unavailable",
+                "pool": pool_status(),
+                "replicas": replica_status(),
+            },
+        )
+    return {"status": "ok", "pool": pool_status(), "replicas": replica_status()}
+
+
+@app.get("/health/ollama")
+async def health_ollama():
+    """Per-instance Ollama health, load and resident models; 503 when no instance is routable."""
+    status = ollama_client.status()
+    if not any(endpoint["available"] for endpoint in status["endpoints"]):
+        return JSONResponse(status_code=503, content={"status": "error", **status})
+    return {"status": "ok", **status}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition of request, stage, Ollama, embedding cache and database metrics."""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
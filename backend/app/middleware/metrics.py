@@ -0,0 +1,39 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import REQUEST_SECONDS
+
+
+class RequestMetricsMiddleware:
+    """Observe http_request_duration_seconds per route template.
+
+    Plain ASGI (no BaseHTTPMiddleware) so the per-request cost is one
+    histogram observation. Labels use the matched route's path template, not
+    the raw URL, to keep cardinality bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path_format", "unmatched"), str(status)
+            ).observe(time.perf_counter() - started)
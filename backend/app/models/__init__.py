@@ -1,4 +1,6 @@
-from .case import Case, CaseTopic
+from .case import Case, CaseNeighbor, CaseText, CaseTopic
+from .corpus import CorpusState
+from .ingestion_job import IngestionJob
 from .topic import Topic
 
-__all__ = ["Case", "Topic", "CaseTopic"]
+__all__ = ["Case", "Topic", "CaseTopic", "CaseNeighbor", "CaseText", "CorpusState", "IngestionJob"]
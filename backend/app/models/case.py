@@ -1,10 +1,33 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from pgvector.sqlalchemy import Vector
 
+from app.config import settings
 from app.db.base import Base
 
+# Weighted full-text document: citation and name (A), ratio, issues and principles (B),
+# facts and judgment (C). Citation uses the 'simple' config so reporter tokens are kept verbatim.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(citation, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(case_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(ratio_decidendi, '') || ' ' || coalesce(legal_issues, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', coalesce(key_principles, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(facts, '') || ' ' || coalesce(judgment, '')), 'C')"
+)
+
 
 class Case(Base):
     __tablename__ = "cases"
@@ -14,13 +37,15 @@ class Case(Base):
     citation = Column(String(200), nullable=False, unique=True)
     year = Column(Integer, nullable=False)
     bench = Column(String(200), nullable=True)
-    full_text = Column(Text, nullable=True)
     facts = Column(Text, nullable=True)
     legal_issues = Column(Text, nullable=True)
     judgment = Column(Text, nullable=True)
     ratio_decidendi = Column(Text, nullable=True)
     key_principles = Column(JSONB, nullable=True)  # array of strings
-    embedding = Column(Vector(768), nullable=True)
+    embedding = Column(Vector(settings.embedding_dimension), nullable=True)
+    embedding_model = Column(String(100), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of raw input + LLM model + prompt version
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True)
     source_url = Column(String(1000), nullable=True)
     processed_at = Column(DateTime, nullable=True)
 
@@ -37,3 +62,25 @@ class CaseTopic(Base):
     source_type = Column(String(20), nullable=False, default="ai_suggested")  # manual | ai_suggested
 
     __table_args__ = (UniqueConstraint("case_id", "topic_id", name="uq_case_topic"),)
+
+
+class CaseText(Base):
+    """Raw judgment text, compressed and kept out of the hot cases heap (see app.services.text_store)."""
+
+    __tablename__ = "case_texts"
+
+    case_id = Column(Integer, ForeignKey("cases.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd | zlib
+    raw_size = Column(Integer, nullable=False)  # UTF-8 bytes before compression
+    data = Column(LargeBinary, nullable=False)
+
+
+class CaseNeighbor(Base):
+    """Precomputed top-N most similar cases per case, maintained at ingest time."""
+
+    __tablename__ = "case_neighbors"
+
+    case_id = Column(Integer, ForeignKey("cases.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(SmallInteger, primary_key=True)  # 1 = most similar
+    neighbor_id = Column(Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False, index=True)
+    similarity = Column(Float, nullable=False)
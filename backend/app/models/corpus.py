@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+
+from app.db.base import Base
+
+
+class CorpusState(Base):
+    """Single-row table whose version is bumped whenever ingestion changes case data."""
+
+    __tablename__ = "corpus_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,50 @@
+from datetime import datetime
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base import Base
+
+
+class IngestionJob(Base):
+    """One case queued for ingestion; workers claim rows with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    batch_id = Column(String(36), nullable=False, index=True)
+    citation = Column(String(200), nullable=False)
+    payload = Column(JSONB, nullable=False)  # raw case as accepted by process_case
+    force = Column(Boolean, nullable=False, default=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued | running | done | skipped | dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # retry backoff
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)  # lease; expired running jobs are reclaimed
+    last_error = Column(Text, nullable=True)
+    case_id = Column(Integer, ForeignKey("cases.id", ondelete="SET NULL"), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Only unfinished jobs are indexed, so claiming stays cheap however many
+    # finished jobs accumulate.
+    __table_args__ = (
+        Index(
+            "ix_ingestion_jobs_claim",
+            "run_after",
+            "id",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
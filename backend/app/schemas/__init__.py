@@ -1,4 +1,15 @@
 from .case import CaseResponse, CaseDetailResponse, CaseSearchResult
+from .ingestion import CaseInput, IngestBatchCreated, IngestBatchRequest, IngestBatchStatus, IngestJobError
 from .topic import TopicResponse
 
-__all__ = ["CaseResponse", "CaseDetailResponse", "CaseSearchResult", "TopicResponse"]
+__all__ = [
+    "CaseResponse",
+    "CaseDetailResponse",
+    "CaseSearchResult",
+    "TopicResponse",
+    "CaseInput",
+    "IngestBatchRequest",
+    "IngestBatchCreated",
+    "IngestBatchStatus",
+    "IngestJobError",
+]
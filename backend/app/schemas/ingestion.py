@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+
+
+class CaseInput(BaseModel):
+    """One case in the ingest_cases.py input format."""
+
+    case_name: str = Field(min_length=1, max_length=500)
+    citation: str = Field(min_length=1, max_length=200)
+    year: int
+    bench: str | None = None
+    full_text: str | None = None
+    source_url: str | None = None
+
+
+class IngestBatchRequest(BaseModel):
+    cases: list[CaseInput] = Field(min_length=1)
+    force: bool = False  # reprocess cases whose fingerprint is unchanged
+
+
+class IngestBatchCreated(BaseModel):
+    batch_id: str
+    queued: int
+
+
+class IngestJobError(BaseModel):
+    citation: str
+    status: str
+    attempts: int
+    last_error: str | None
+
+
+class IngestBatchStatus(BaseModel):
+    batch_id: str
+    total: int
+    finished: int
+    counts: dict[str, int]  # queued | running | done | skipped | dead
+    errors: list[IngestJobError]
@@ -0,0 +1,153 @@
+"""Incremental readers for case dumps (JSON array, JSON object stream, JSONL, gzip).
+
+Records are yielded one at a time so memory stays proportional to the
+largest single case rather than the whole corpus.
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Iterator
+
+GZIP_MAGIC = b"\x1f\x8b"
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+_WHITESPACE = " \t\r\n"
+MAX_RECORD_CHARS = 64 << 20
+# A value cut off by the end of the buffer fails within a few characters of it
+# (the longest token is "-Infinity"); an error further back is in the data.
+_TRUNCATION_MARGIN = 16
+
+
+def _open_text(path: Path) -> IO[str]:
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _is_jsonl(path: Path) -> bool:
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    return bool(suffixes) and suffixes[-1] in JSONL_SUFFIXES
+
+
+class _StreamDecoder:
+    """Decodes consecutive JSON values from a text stream without reading it all."""
+
+    def __init__(self, f: IO[str], chunk_size: int, max_record_chars: int = MAX_RECORD_CHARS):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._max_record_chars = max_record_chars
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0  # characters dropped from the front of _buf
+        self._eof = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos:
+            self._offset += self._pos
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at EOF) without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def consume(self) -> str:
+        ch = self.peek()
+        self._pos += len(ch)
+        return ch
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Fail at the bad record rather than buffering the rest of the
+                # file looking for its end. Unterminated strings are the one
+                # truncation reported at their start, so they are only bounded
+                # by max_record_chars.
+                pending = len(self._buf) - self._pos
+                if not e.msg.startswith("Unterminated string") and e.pos + _TRUNCATION_MARGIN < len(self._buf):
+                    raise ValueError(f"Malformed JSON at character {self._offset + e.pos}: {e.msg}") from e
+                if pending > self._max_record_chars:
+                    raise ValueError(
+                        f"JSON record at character {self._offset + self._pos} "
+                        f"exceeds {self._max_record_chars} characters"
+                    ) from e
+                # Likely a value split across reads; grow geometrically so a
+                # single huge record is not re-parsed once per chunk.
+                if not self._fill(max(self._chunk_size, pending)):
+                    raise
+                continue
+            if end == len(self._buf) and self._fill():
+                # A bare number may have been cut short at the buffer edge.
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_array(stream: _StreamDecoder) -> Iterator:
+    stream.consume()
+    if stream.peek() == "]":
+        stream.consume()
+        return
+    while True:
+        yield stream.decode()
+        sep = stream.consume()
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {sep!r}")
+
+
+def _iter_values(stream: _StreamDecoder) -> Iterator:
+    while stream.peek():
+        yield stream.decode()
+
+
+def _iter_lines(f: IO[str]) -> Iterator:
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_cases(
+    path: str | Path, chunk_size: int = 1 << 16, max_record_chars: int = MAX_RECORD_CHARS
+) -> Iterator[dict]:
+    """Yield case records from `path` one by one.
+
+    Supports a JSON array of cases, a single case object or a stream of
+    concatenated objects, and JSONL (.jsonl/.ndjson). Any of these may be
+    gzip-compressed. A malformed or oversized (> max_record_chars) record
+    raises ValueError at that record instead of after buffering to EOF.
+    """
+    path = Path(path)
+    with _open_text(path) as f:
+        if _is_jsonl(path):
+            records = _iter_lines(f)
+        else:
+            stream = _StreamDecoder(f, chunk_size, max_record_chars)
+            records = _iter_array(stream) if stream.peek() == "[" else _iter_values(stream)
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise ValueError(f"Record {i + 1} in {path} is not a JSON object")
+            yield record
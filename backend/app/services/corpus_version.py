@@ -0,0 +1,46 @@
+import time
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import CorpusState
+
+CORPUS_STATE_ID = 1
+
+_cached: tuple[float, int] | None = None
+
+
+async def get_corpus_version(session: AsyncSession) -> int:
+    """Current corpus version, re-read from the database at most every few seconds."""
+    global _cached
+    now = time.monotonic()
+    if _cached is not None and _cached[0] > now:
+        return _cached[1]
+    result = await session.execute(
+        select(CorpusState.version).where(CorpusState.id == CORPUS_STATE_ID)
+    )
+    version = int(result.scalar_one_or_none() or 0)
+    _cached = (now + settings.corpus_version_ttl_seconds, version)
+    return version
+
+
+def reset_corpus_version_cache() -> None:
+    global _cached
+    _cached = None
+
+
+async def bump_corpus_version(session: AsyncSession) -> None:
+    """Mark cached API responses stale; runs in the caller's transaction.
+
+    An upsert, so databases built with create_all (no seeded row) start at 1.
+    """
+    stmt = pg_insert(CorpusState).values(id=CORPUS_STATE_ID, version=1, updated_at=datetime.utcnow())
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CorpusState.id],
+            set_={"version": CorpusState.version + 1, "updated_at": stmt.excluded.updated_at},
+        )
+    )
@@ -0,0 +1,63 @@
+import asyncio
+
+from app.config import settings
+from app.services.ollama_client import OllamaClient, ollama_client
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embed calls into batched /api/embed requests.
+
+    Callers await `embed(text)` as they would `OllamaClient.embed`; pending texts
+    are sent together once `batch_size` accumulate or `max_wait` seconds pass.
+    """
+
+    def __init__(
+        self,
+        client: OllamaClient | None = None,
+        batch_size: int | None = None,
+        max_wait: float = 0.05,
+    ):
+        self.client = client or ollama_client
+        self.batch_size = batch_size or settings.ollama_embed_batch_size
+        self.max_wait = max_wait
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await self.client.embed_many([text for text, _ in batch], self.batch_size)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    async def aclose(self) -> None:
+        """Flush anything still pending and wait for in-flight batches."""
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
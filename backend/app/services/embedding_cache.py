@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.ollama_client import OllamaClient, ollama_client
+from app.services.single_flight import SingleFlight
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: the text that is embedded, i.e. stripped of surrounding whitespace.
+
+    Case and inner spacing are kept. The model sees them, so folding them
+    into one key would make a cached vector (and the ranking) depend on
+    which spelling happened to arrive first.
+    """
+    return text.strip()
+
+
+class EmbeddingCache:
+    """Bounded LRU cache of query embeddings with per-entry TTL.
+
+    Keys include the embedding model name so switching models never serves
+    vectors from the previous model.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, list[float]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        key = (model, normalize_query(text))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, embedding = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return embedding
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (model, normalize_query(text))
+        self._entries[key] = (self._clock() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    max_entries=settings.embedding_cache_size,
+    ttl_seconds=settings.embedding_cache_ttl_seconds,
+)
+
+
+embed_flights = SingleFlight("embed_query")
+
+
+async def embed_query(text: str, client: OllamaClient | None = None) -> list[float]:
+    """Embed a search query, serving repeats from the in-process cache.
+
+    The query is embedded as its cache key (normalize_query), so a cached
+    vector is always the one this exact query would get. Concurrent misses
+    for the same key share one Ollama call.
+    """
+    client = client or ollama_client
+    cached = embedding_cache.get(client.embedding_model, text)
+    if cached is not None:
+        return cached
+    normalized = normalize_query(text)
+
+    async def embed() -> list[float]:
+        embedding = await client.embed(normalized)
+        embedding_cache.put(client.embedding_model, text, embedding)
+        return embedding
+
+    return await embed_flights.do((client.embedding_model, normalized), embed)
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+
+class IngestCheckpoint:
+    """Append-only record of (citation, fingerprint) pairs finished by an ingest run.
+
+    An interrupted run can be restarted with the same checkpoint file and will
+    skip cases already completed without touching the database or Ollama. A
+    case whose input changed gets a new fingerprint and is processed again.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._done: set[tuple[str, str]] = set()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    citation, sep, fingerprint = line.rstrip("\n").rpartition("\t")
+                    if sep:
+                        self._done.add((citation, fingerprint))
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, citation: str, fingerprint: str) -> bool:
+        return (citation, fingerprint) in self._done
+
+    def mark_done(self, citation: str, fingerprint: str) -> None:
+        if (citation, fingerprint) in self._done:
+            return
+        self._done.add((citation, fingerprint))
+        self._file.write(f"{citation}\t{fingerprint}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
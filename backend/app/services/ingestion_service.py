@@ -1,13 +1,30 @@
+import hashlib
 import json
-import re
 from datetime import datetime
+from typing import Awaitable, Callable
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Case, Topic, CaseTopic
+from app.config import settings
+from app.models import Case, CaseTopic
+from app.services.metrics import stage
+from app.services.neighbor_service import update_neighbors
 from app.services.ollama_client import ollama_client
+from app.services.text_store import save_full_text
+from app.services.topic_cache import topic_cache
 
+EmbedFn = Callable[[str], Awaitable[list[float]]]
+
+# Bump whenever SUMMARY_PROMPT / TOPICS_PROMPT (two_call) or EXTRACTION_PROMPT
+# (combined) change meaningfully so that previously ingested cases are picked up
+# again by fingerprint comparison.
+PROMPT_VERSIONS = {"two_call": "1", "combined": "2"}
+
+# Raw input fields that feed the LLM output; changes to any of them invalidate
+# the stored summary.
+FINGERPRINT_FIELDS = ("case_name", "citation", "year", "bench", "full_text", "source_url")
 
 SUMMARY_SYSTEM = """You are an expert legal summarizer for Indian Supreme Court judgments.
 Output ONLY valid JSON. No markdown, no code blocks, no extra text."""
@@ -40,8 +57,44 @@ Summary excerpt: {summary_excerpt}
 """
 
 
-def slugify(name: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+# Single-pass alternative: summary fields and topic labels from one call,
+# constrained by Ollama structured outputs to EXTRACTION_SCHEMA.
+EXTRACTION_PROMPT = """Summarize this Indian Supreme Court case and label it with 3-5 legal topics.
+
+Fields:
+- facts: brief factual background (2-4 sentences)
+- legal_issues: key legal questions raised (2-4 sentences)
+- judgment: court's decision and outcome (2-4 sentences)
+- ratio_decidendi: the legal principle/ratio of the decision (2-4 sentences)
+- key_principles: 3 short principles established
+- topics: 3-5 legal topic names, e.g. "Constitutional Law", "Right to Privacy"
+
+Case name: {case_name}
+Citation: {citation}
+Year: {year}
+
+Full text (excerpt):
+{full_text_excerpt}
+"""
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "facts": {"type": "string"},
+        "legal_issues": {"type": "string"},
+        "judgment": {"type": "string"},
+        "ratio_decidendi": {"type": "string"},
+        "key_principles": _STRING_LIST,
+        "topics": {**_STRING_LIST, "minItems": 1, "maxItems": 5},
+    },
+    "required": ["facts", "legal_issues", "judgment", "ratio_decidendi", "key_principles", "topics"],
+}
+
+
+def current_prompt_version(mode: str | None = None) -> str:
+    return PROMPT_VERSIONS[mode or settings.ingestion_extraction_mode]
 
 
 def _truncate(text: str, max_chars: int = 8000) -> str:
@@ -50,40 +103,77 @@ def _truncate(text: str, max_chars: int = 8000) -> str:
     return text[:max_chars] + "..." if len(text) > max_chars else text
 
 
-async def get_or_create_topic(session: AsyncSession, name: str, source_type: str = "ai_suggested") -> Topic:
-    slug = slugify(name)
-    result = await session.execute(select(Topic).where(Topic.slug == slug))
-    topic = result.scalar_one_or_none()
-    if not topic:
-        topic = Topic(name=name, slug=slug)
-        session.add(topic)
-        await session.flush()
-    return topic
+def case_fingerprint(raw: dict, llm_model: str | None = None, prompt_version: str | None = None) -> str:
+    """Stable hash of everything that determines a case's summary and topics.
 
+    `prompt_version` defaults to that of the configured extraction mode, so
+    switching modes reprocesses cases on the next (non-forced) ingest.
+    """
+    payload = {field: raw.get(field) for field in FINGERPRINT_FIELDS}
+    payload["llm_model"] = llm_model or ollama_client.llm_model
+    payload["prompt_version"] = prompt_version or current_prompt_version()
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
-async def process_case(session: AsyncSession, raw: dict) -> Case:
-    """Process a single case: summarize, suggest topics, embed, store."""
-    case_name = raw.get("case_name", "")
+
+def build_embedding_text(
+    facts: str | None,
+    legal_issues: str | None,
+    judgment: str | None,
+    ratio_decidendi: str | None,
+    key_principles: list | None,
+) -> str:
+    return f"{facts or ''} {legal_issues or ''} {judgment or ''} {ratio_decidendi or ''} " + " ".join(
+        key_principles if isinstance(key_principles, list) else []
+    )
+
+
+async def process_case(
+    session: AsyncSession, raw: dict, force: bool = False, embed: EmbedFn | None = None
+) -> Case | None:
+    """Process a single case: summarize, suggest topics, embed, store.
+
+    Unless `force` is set, a case whose stored fingerprint matches the input is
+    skipped and None is returned. If only the embedding model changed, the
+    stored summary is re-embedded without calling the LLM again.
+
+    `embed` defaults to `ollama_client.embed`; pass `EmbeddingBatcher.embed` to
+    share batched embedding requests across concurrent workers.
+
+    The corpus version is not bumped here: callers bump it once per run or
+    batch (bump_corpus_version), so concurrent workers do not serialize on
+    the corpus_state row and the response cache is not flushed per case.
+    """
+    embed = embed or ollama_client.embed
     citation = raw.get("citation", "")
+    fingerprint = case_fingerprint(raw)
+    if not force:
+        with stage("ingest", "lookup"):
+            result = await session.execute(
+                select(Case.id, Case.content_hash, Case.embedding_model).where(Case.citation == citation)
+            )
+        existing = result.one_or_none()
+        if existing is not None and existing.content_hash == fingerprint:
+            if existing.embedding_model == ollama_client.embedding_model:
+                return None
+            return await _reembed_case(session, existing.id, embed)
+
+    case_name = raw.get("case_name", "")
     year = int(raw.get("year", 0))
     bench = raw.get("bench", "")
     full_text = raw.get("full_text", "")
     source_url = raw.get("source_url", "")
 
-    full_text_excerpt = _truncate(full_text, 6000)
-
-    summary_prompt = SUMMARY_PROMPT.format(
+    prompt_fields = dict(
         case_name=case_name,
         citation=citation,
         year=year,
-        full_text_excerpt=full_text_excerpt or "Not available",
+        full_text_excerpt=_truncate(full_text, 6000) or "Not available",
     )
-    summary_raw = await ollama_client.generate(summary_prompt, system=SUMMARY_SYSTEM)
-
-    try:
-        summary_json = json.loads(summary_raw)
-    except json.JSONDecodeError:
-        summary_json = _extract_json_from_response(summary_raw)
+    if settings.ingestion_extraction_mode == "combined":
+        summary_json, topic_names = await _extract_combined(prompt_fields)
+    else:
+        summary_json, topic_names = await _extract_two_call(prompt_fields)
 
     facts = summary_json.get("facts", "")
     legal_issues = summary_json.get("legal_issues", "")
@@ -91,65 +181,124 @@ async def process_case(session: AsyncSession, raw: dict) -> Case:
     ratio_decidendi = summary_json.get("ratio_decidendi", "")
     key_principles = summary_json.get("key_principles", [])
 
+    text_for_embedding = build_embedding_text(facts, legal_issues, judgment, ratio_decidendi, key_principles)
+    with stage("ingest", "embed"):
+        embedding = await embed(text_for_embedding)
+
+    with stage("ingest", "upsert"):
+        result = await session.execute(select(Case).where(Case.citation == citation))
+        case = result.scalar_one_or_none()
+        if case:
+            case.case_name = case_name
+            case.year = year
+            case.bench = bench
+            case.facts = facts
+            case.legal_issues = legal_issues
+            case.judgment = judgment
+            case.ratio_decidendi = ratio_decidendi
+            case.key_principles = key_principles
+            case.embedding = embedding
+            case.embedding_model = ollama_client.embedding_model
+            case.content_hash = fingerprint
+            case.source_url = source_url
+            case.processed_at = datetime.utcnow()
+            case.updated_at = datetime.utcnow()
+            await session.execute(
+                CaseTopic.__table__.delete().where(CaseTopic.case_id == case.id)
+            )
+        else:
+            case = Case(
+                case_name=case_name,
+                citation=citation,
+                year=year,
+                bench=bench,
+                facts=facts,
+                legal_issues=legal_issues,
+                judgment=judgment,
+                ratio_decidendi=ratio_decidendi,
+                key_principles=key_principles,
+                embedding=embedding,
+                embedding_model=ollama_client.embedding_model,
+                content_hash=fingerprint,
+                source_url=source_url,
+                processed_at=datetime.utcnow(),
+            )
+            session.add(case)
+            await session.flush()
+        await save_full_text(session, case.id, full_text)
+
+        topic_ids = await topic_cache.resolve(session, topic_names)
+        if topic_ids:
+            await session.execute(
+                pg_insert(CaseTopic)
+                .values(
+                    [{"case_id": case.id, "topic_id": tid, "source_type": "ai_suggested"} for tid in topic_ids]
+                )
+                .on_conflict_do_nothing(constraint="uq_case_topic")
+            )
+        await session.flush()
+
+    with stage("ingest", "neighbors"):
+        await update_neighbors(session, case.id, embedding)
+    await session.flush()
+    return case
+
+
+async def _extract_two_call(prompt_fields: dict) -> tuple[dict, list[str]]:
+    """Summary, then topics suggested from it: two sequential LLM calls."""
+    with stage("ingest", "summary"):
+        summary_raw = await ollama_client.generate(
+            SUMMARY_PROMPT.format(**prompt_fields), system=SUMMARY_SYSTEM
+        )
+    summary_json = _parse_json_object(summary_raw)
+
     topics_prompt = TOPICS_PROMPT.format(
-        case_name=case_name,
-        summary_excerpt=_truncate(f"{facts} {legal_issues} {ratio_decidendi}", 1500),
+        case_name=prompt_fields["case_name"],
+        summary_excerpt=_truncate(
+            f"{summary_json.get('facts', '')} {summary_json.get('legal_issues', '')} "
+            f"{summary_json.get('ratio_decidendi', '')}",
+            1500,
+        ),
     )
-    topics_raw = await ollama_client.generate(topics_prompt, system=SUMMARY_SYSTEM)
-    topic_names = _parse_topic_list(topics_raw)
+    with stage("ingest", "topics"):
+        topics_raw = await ollama_client.generate(topics_prompt, system=SUMMARY_SYSTEM)
+    return summary_json, _parse_topic_list(topics_raw)
 
-    text_for_embedding = f"{facts} {legal_issues} {judgment} {ratio_decidendi} " + " ".join(
-        key_principles if isinstance(key_principles, list) else []
-    )
-    embedding = await ollama_client.embed(text_for_embedding)
-
-    result = await session.execute(select(Case).where(Case.citation == citation))
-    case = result.scalar_one_or_none()
-    if case:
-        case.case_name = case_name
-        case.year = year
-        case.bench = bench
-        case.full_text = full_text
-        case.facts = facts
-        case.legal_issues = legal_issues
-        case.judgment = judgment
-        case.ratio_decidendi = ratio_decidendi
-        case.key_principles = key_principles
-        case.embedding = embedding
-        case.source_url = source_url
-        case.processed_at = datetime.utcnow()
-        case.updated_at = datetime.utcnow()
-        await session.execute(
-            CaseTopic.__table__.delete().where(CaseTopic.case_id == case.id)
-        )
-    else:
-        case = Case(
-            case_name=case_name,
-            citation=citation,
-            year=year,
-            bench=bench,
-            full_text=full_text,
-            facts=facts,
-            legal_issues=legal_issues,
-            judgment=judgment,
-            ratio_decidendi=ratio_decidendi,
-            key_principles=key_principles,
-            embedding=embedding,
-            source_url=source_url,
-            processed_at=datetime.utcnow(),
+
+async def _extract_combined(prompt_fields: dict) -> tuple[dict, list[str]]:
+    """Summary fields and topics from one schema-constrained LLM call."""
+    with stage("ingest", "extract"):
+        raw = await ollama_client.generate(
+            EXTRACTION_PROMPT.format(**prompt_fields), system=SUMMARY_SYSTEM, format=EXTRACTION_SCHEMA
         )
-        session.add(case)
-        await session.flush()
+    extracted = _parse_json_object(raw)
+    topics = extracted.pop("topics", [])
+    topic_names = [str(t) for t in topics if str(t).strip()] if isinstance(topics, list) else []
+    return extracted, topic_names
 
-    for name in topic_names:
-        topic = await get_or_create_topic(session, name.strip())
-        ct = CaseTopic(case_id=case.id, topic_id=topic.id, source_type="ai_suggested")
-        session.add(ct)
 
+async def _reembed_case(session: AsyncSession, case_id: int, embed: EmbedFn) -> Case:
+    result = await session.execute(select(Case).where(Case.id == case_id))
+    case = result.scalar_one()
+    case.embedding = await embed(
+        build_embedding_text(case.facts, case.legal_issues, case.judgment, case.ratio_decidendi, case.key_principles)
+    )
+    case.embedding_model = ollama_client.embedding_model
+    case.updated_at = datetime.utcnow()
+    await session.flush()
+    await update_neighbors(session, case.id, case.embedding)
     await session.flush()
     return case
 
 
+def _parse_json_object(text: str) -> dict:
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError:
+        return _extract_json_from_response(text)
+    return parsed if isinstance(parsed, dict) else {}
+
+
 def _extract_json_from_response(text: str) -> dict:
     start = text.find("{")
     end = text.rfind("}") + 1
@@ -0,0 +1,316 @@
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import DateTime, and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import IngestionJob
+from app.services.corpus_version import bump_corpus_version
+from app.services.ingestion_service import EmbedFn, process_case
+from app.services.metrics import INGEST_JOBS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+SKIPPED = "skipped"  # fingerprint unchanged, nothing to do
+DEAD = "dead"  # out of attempts; kept for inspection and manual retry
+STATUSES = (QUEUED, RUNNING, DONE, SKIPPED, DEAD)
+LOST = "lost"  # a run's outcome, not a status: the lease expired and another worker reclaimed the job
+
+# Errors kept per job are truncated; the full traceback goes to the worker log.
+MAX_ERROR_CHARS = 2000
+LEASE_EXPIRED_ERROR = "Lease expired on the last attempt: the worker died or hung while running the job"
+
+
+def _db_now():
+    """Database clock in UTC, so leases and backoff do not depend on worker clocks."""
+    return func.timezone("utc", func.now(), type_=DateTime)
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff after the `attempts`-th failed attempt, capped."""
+    base = settings.ingest_job_backoff_seconds
+    return min(base * 2 ** max(attempts - 1, 0), settings.ingest_job_backoff_max_seconds)
+
+
+async def enqueue_batch(
+    session: AsyncSession,
+    cases: Iterable[dict],
+    force: bool = False,
+    max_attempts: int | None = None,
+    batch_id: str | None = None,
+) -> tuple[str, int]:
+    """Queue one job per case under `batch_id` (new if omitted); returns (batch_id, jobs queued)."""
+    batch_id = batch_id or str(uuid.uuid4())
+    rows = [
+        {
+            "batch_id": batch_id,
+            "citation": raw.get("citation", ""),
+            "payload": raw,
+            "force": force,
+            "status": QUEUED,
+            "max_attempts": max_attempts or settings.ingest_job_max_attempts,
+        }
+        for raw in cases
+    ]
+    if rows:
+        await session.execute(insert(IngestionJob), rows)
+    return batch_id, len(rows)
+
+
+async def bump_if_batch_finished(session: AsyncSession, batch_id: str) -> bool:
+    """Bump the corpus version if no job of `batch_id` is queued or running any more.
+
+    Cached API responses are invalidated once per batch rather than once per
+    case, so concurrent workers do not serialize on the corpus_state row.
+    Call it after committing a job's outcome: whichever worker commits last
+    then sees the whole batch finished (two may both bump, which is harmless).
+    """
+    pending = await session.execute(
+        select(IngestionJob.id)
+        .where(IngestionJob.batch_id == batch_id)
+        .where(IngestionJob.status.in_((QUEUED, RUNNING)))
+        .limit(1)
+    )
+    if pending.first() is not None:
+        return False
+    await bump_corpus_version(session)
+    return True
+
+
+async def dead_letter_expired(session: AsyncSession) -> int:
+    """Dead-letter running jobs whose lease expired on their last attempt; returns how many.
+
+    A job that kills its worker (OOM, segfault, eviction) is only ever seen
+    again as an expired lease, so this is where it stops being retried.
+    """
+    now = _db_now()
+    result = await session.execute(
+        update(IngestionJob)
+        .where(IngestionJob.status == RUNNING)
+        .where(IngestionJob.locked_until < now)
+        .where(IngestionJob.attempts >= IngestionJob.max_attempts)
+        .values(
+            status=DEAD,
+            locked_by=None,
+            locked_until=None,
+            last_error=LEASE_EXPIRED_ERROR,
+            updated_at=now,
+        )
+        .returning(IngestionJob.batch_id)
+        .execution_options(synchronize_session=False)
+    )
+    batch_ids = list(result.scalars().all())
+    if batch_ids:
+        logger.warning(
+            "Dead-lettered %d ingestion jobs whose worker died on the last attempt", len(batch_ids)
+        )
+    for batch_id in set(batch_ids):
+        await bump_if_batch_finished(session, batch_id)
+    return len(batch_ids)
+
+
+async def claim_jobs(
+    session: AsyncSession, worker_id: str, limit: int = 1, lease_seconds: float | None = None
+) -> list[Any]:
+    """Atomically lease up to `limit` runnable jobs to `worker_id`.
+
+    Runnable means queued and past its backoff, or running with an expired
+    lease (its worker died) and attempts to spare. Expired jobs that are out
+    of attempts never reach fail_job, because their worker crashed each time,
+    so they are dead-lettered here first (see dead_letter_expired). SKIP LOCKED
+    lets any number of workers claim concurrently without blocking on, or
+    double-claiming, each other's rows. Commit straight after, so the lease is
+    visible while the job runs.
+    """
+    await dead_letter_expired(session)
+    lease = timedelta(seconds=lease_seconds or settings.ingest_job_lease_seconds)
+    now = _db_now()
+    runnable = (
+        select(IngestionJob.id)
+        .where(
+            or_(
+                and_(IngestionJob.status == QUEUED, IngestionJob.run_after <= now),
+                and_(
+                    IngestionJob.status == RUNNING,
+                    IngestionJob.locked_until < now,
+                    IngestionJob.attempts < IngestionJob.max_attempts,
+                ),
+            )
+        )
+        .order_by(IngestionJob.run_after, IngestionJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        update(IngestionJob)
+        .where(IngestionJob.id.in_(runnable.scalar_subquery()))
+        .values(
+            status=RUNNING,
+            attempts=IngestionJob.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + lease,
+            updated_at=now,
+        )
+        .returning(
+            IngestionJob.id,
+            IngestionJob.batch_id,
+            IngestionJob.citation,
+            IngestionJob.payload,
+            IngestionJob.force,
+            IngestionJob.attempts,
+            IngestionJob.max_attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.all())
+
+
+def _leased_to(job_id: int, worker_id: str):
+    """WHERE clause for a job still leased to `worker_id`: reclaimed jobs belong to their new worker."""
+    return and_(
+        IngestionJob.id == job_id, IngestionJob.locked_by == worker_id, IngestionJob.status == RUNNING
+    )
+
+
+async def complete_job(session: AsyncSession, job_id: int, worker_id: str, case_id: int | None) -> bool:
+    """Mark the job done (or skipped); False, changing nothing, if `worker_id` lost its lease."""
+    result = await session.execute(
+        update(IngestionJob)
+        .where(_leased_to(job_id, worker_id))
+        .values(
+            status=DONE if case_id is not None else SKIPPED,
+            case_id=case_id,
+            locked_by=None,
+            locked_until=None,
+            last_error=None,
+            updated_at=_db_now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def fail_job(session: AsyncSession, job_id: int, worker_id: str, error: str) -> str | None:
+    """Schedule a retry with backoff, or dead-letter the job when out of attempts.
+
+    Attempts are read from the row under the lease, not from the claim, so a
+    reclaimed job is never judged on its previous worker's count. Returns the
+    new status, or None, changing nothing, if `worker_id` lost its lease.
+    """
+    leased = await session.execute(
+        select(IngestionJob.attempts, IngestionJob.max_attempts)
+        .where(_leased_to(job_id, worker_id))
+        .with_for_update()
+    )
+    row = leased.one_or_none()
+    if row is None:
+        return None
+    status = DEAD if row.attempts >= row.max_attempts else QUEUED
+    values = dict(
+        status=status,
+        locked_by=None,
+        locked_until=None,
+        last_error=error[:MAX_ERROR_CHARS],
+        updated_at=_db_now(),
+    )
+    if status == QUEUED:
+        values["run_after"] = _db_now() + timedelta(seconds=retry_delay(row.attempts))
+    await session.execute(
+        update(IngestionJob)
+        .where(IngestionJob.id == job_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return status
+
+
+async def run_job(async_session, job, worker_id: str, embed: EmbedFn | None = None) -> str:
+    """Ingest one job claimed by `worker_id` and record the outcome; returns the job's new status.
+
+    The case and the job's completion are committed in one transaction, so a
+    crash in between leaves the job to be reclaimed rather than lost. When
+    the job was its batch's last, the corpus version is bumped. If the
+    lease expired and another worker reclaimed the job meanwhile, this run is
+    rolled back and reported as "lost"; the new owner records the outcome.
+    """
+    try:
+        async with async_session() as session:
+            case = await process_case(session, job.payload, force=job.force, embed=embed)
+            if await complete_job(session, job.id, worker_id, case.id if case is not None else None):
+                await session.commit()
+                status = DONE if case is not None else SKIPPED
+            else:
+                await session.rollback()
+                status = LOST
+    except Exception as e:
+        logger.warning(
+            "Ingestion job %s (%s) failed on attempt %d/%d",
+            job.id,
+            job.citation,
+            job.attempts,
+            job.max_attempts,
+            exc_info=True,
+        )
+        async with async_session() as session:
+            status = await fail_job(session, job.id, worker_id, f"{type(e).__name__}: {e}")
+            await session.commit()
+        if status == QUEUED:
+            status = "retry"
+        elif status is None:
+            status = LOST
+    if status == LOST:
+        logger.warning(
+            "Ingestion job %s (%s) was reclaimed from %s; result dropped", job.id, job.citation, worker_id
+        )
+    elif status != "retry":
+        async with async_session() as session:
+            if await bump_if_batch_finished(session, job.batch_id):
+                await session.commit()
+    INGEST_JOBS.labels(status).inc()
+    return status
+
+
+async def batch_progress(session: AsyncSession, batch_id: str, max_errors: int = 20) -> dict | None:
+    """Job counts per status for a batch, plus the latest errors; None for an unknown batch."""
+    result = await session.execute(
+        select(IngestionJob.status, func.count())
+        .where(IngestionJob.batch_id == batch_id)
+        .group_by(IngestionJob.status)
+    )
+    counts = {status: 0 for status in STATUSES}
+    counts.update({status: n for status, n in result.all()})
+    total = sum(counts.values())
+    if not total:
+        return None
+    errors = await session.execute(
+        select(IngestionJob.citation, IngestionJob.status, IngestionJob.attempts, IngestionJob.last_error)
+        .where(IngestionJob.batch_id == batch_id)
+        .where(IngestionJob.last_error.isnot(None))
+        .order_by(IngestionJob.updated_at.desc())
+        .limit(max_errors)
+    )
+    return {
+        "batch_id": batch_id,
+        "total": total,
+        "counts": counts,
+        "finished": total - counts[QUEUED] - counts[RUNNING],
+        "errors": [row._asdict() for row in errors.all()],
+    }
+
+
+async def retry_dead_jobs(session: AsyncSession, batch_id: str) -> int:
+    """Re-queue a batch's dead-lettered jobs with a fresh set of attempts."""
+    result = await session.execute(
+        update(IngestionJob)
+        .where(IngestionJob.batch_id == batch_id)
+        .where(IngestionJob.status == DEAD)
+        .values(status=QUEUED, attempts=0, run_after=_db_now(), updated_at=_db_now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
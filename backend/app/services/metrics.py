@@ -0,0 +1,124 @@
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Latency buckets (seconds) from sub-millisecond cache hits to multi-minute LLM calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "stage_duration_seconds",
+    "Time spent in each stage of search, similar-cases and ingestion.",
+    ["operation", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_REQUESTS = Counter(
+    "ollama_requests_total",
+    "Ollama API calls by endpoint, model and outcome.",
+    ["endpoint", "model", "outcome"],
+)
+OLLAMA_SECONDS = Histogram(
+    "ollama_request_duration_seconds",
+    "Ollama API call latency.",
+    ["endpoint", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_INSTANCE_UP = Gauge(
+    "ollama_instance_up",
+    "1 while an Ollama instance is routable, 0 while ejected by health checks.",
+    ["instance"],
+)
+OLLAMA_INSTANCE_IN_FLIGHT = Gauge(
+    "ollama_instance_in_flight",
+    "Requests in flight per Ollama instance (the least-outstanding routing key).",
+    ["instance"],
+)
+INGEST_JOBS = Counter(
+    "ingest_jobs_total",
+    "Ingestion queue jobs run by workers, by outcome (done, skipped, retry, dead, lost).",
+    ["outcome"],
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Coalesced calls by group and role; followers shared a leader's in-flight work instead of repeating it.",
+    ["group", "role"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement type.",
+    ["statement"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a pooled connection.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def stage(operation: str, name: str):
+    """Time a block into stage_duration_seconds{operation, stage}."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(operation, name).observe(time.perf_counter() - started)
+
+
+def statement_type(sql: str) -> str:
+    """Leading SQL keyword (select, insert, ...) as a bounded label value."""
+    keyword = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else ""
+    return keyword if keyword in {"select", "insert", "update", "delete", "with"} else "other"
+
+
+class PoolCollector:
+    """Scrape-time gauges for connection pools; `pools` maps pool name -> PoolStats snapshot."""
+
+    def __init__(self, pools: Callable[[], dict[str, dict]]):
+        self._pools = pools
+
+    def collect(self):
+        gauges = {
+            key: GaugeMetricFamily(f"db_pool_connections_{key}", f"Pooled connections: {key}.", labels=["pool"])
+            for key in ("size", "in_use", "idle", "overflow")
+        }
+        timeouts = CounterMetricFamily(
+            "db_pool_checkout_timeouts", "Checkouts that timed out waiting for a connection.", labels=["pool"]
+        )
+        for name, status in self._pools().items():
+            for key, gauge in gauges.items():
+                if key in status:
+                    gauge.add_metric([name], status[key])
+            timeouts.add_metric([name], status["timeouts"])
+        yield from gauges.values()
+        yield timeouts
+
+
+class EmbeddingCacheCollector:
+    """Scrape-time hit/miss counters and size of the query embedding cache (EmbeddingCache.stats)."""
+
+    def __init__(self, stats: Callable[[], dict]):
+        self._stats = stats
+
+    def collect(self):
+        stats = self._stats()
+        for key in ("hits", "misses"):
+            counter = CounterMetricFamily(f"embedding_cache_{key}", f"Query embedding cache {key}.")
+            counter.add_metric([], stats[key])
+            yield counter
+        for key in ("size", "max_entries"):
+            gauge = GaugeMetricFamily(
+                f"embedding_cache_{key}", f"Query embedding cache {key.replace('_', ' ')}."
+            )
+            gauge.add_metric([], stats[key])
+            yield gauge
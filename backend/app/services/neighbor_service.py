@@ -0,0 +1,190 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Case, CaseNeighbor
+from app.services.vector_index import index_depth, nearest_stmt, widen_ef_search
+
+# First key of the two-int advisory locks that serialise writers of one case's list.
+NEIGHBOR_LOCK_NAMESPACE = 12012
+
+Neighbors = list[tuple[int, float]]
+
+
+async def nearest_neighbors(
+    session: AsyncSession, case_id: int, embedding: list[float], n: int
+) -> Neighbors:
+    distance = Case.embedding.cosine_distance(embedding)
+    stmt = nearest_stmt(
+        (Case.id, (1 - distance).label("sim")), embedding, n, lambda s: s.where(Case.id != case_id)
+    ).limit(n)
+    await widen_ef_search(session, index_depth(n))
+    result = await session.execute(stmt)
+    return [(row.id, float(row.sim)) for row in result.all()]
+
+
+def merge_neighbor(existing: Neighbors, case_id: int, similarity: float, n: int) -> Neighbors | None:
+    """Insert (or re-score) `case_id` in another case's top-n list.
+
+    Returns the new list, or None when the list is unchanged because the case
+    neither was nor now is among the top n.
+    """
+    was_listed = any(nid == case_id for nid, _ in existing)
+    merged = [(nid, sim) for nid, sim in existing if nid != case_id]
+    merged.append((case_id, similarity))
+    merged.sort(key=lambda item: (-item[1], item[0]))
+    merged = merged[:n]
+    if not was_listed and all(nid != case_id for nid, _ in merged):
+        return None
+    return merged
+
+
+async def _lock(session: AsyncSession, case_ids) -> None:
+    """Take transaction-scoped locks in id order so concurrent ingests cannot deadlock."""
+    ids = sorted(set(case_ids))
+    if not ids:
+        return
+    await session.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(:ns, id) "
+            "FROM (SELECT unnest(CAST(:ids AS integer[])) AS id ORDER BY 1) AS ordered"
+        ),
+        {"ns": NEIGHBOR_LOCK_NAMESPACE, "ids": ids},
+    )
+
+
+async def _load_lists(session: AsyncSession, case_ids: list[int]) -> dict[int, Neighbors]:
+    if not case_ids:
+        return {}
+    result = await session.execute(
+        select(CaseNeighbor.case_id, CaseNeighbor.neighbor_id, CaseNeighbor.similarity)
+        .where(CaseNeighbor.case_id.in_(case_ids))
+        .order_by(CaseNeighbor.case_id, CaseNeighbor.rank)
+    )
+    lists: dict[int, Neighbors] = {}
+    for row in result.all():
+        lists.setdefault(row.case_id, []).append((row.neighbor_id, row.similarity))
+    return lists
+
+
+async def _write_lists(session: AsyncSession, lists: dict[int, Neighbors]) -> None:
+    if not lists:
+        return
+    await session.execute(delete(CaseNeighbor).where(CaseNeighbor.case_id.in_(list(lists))))
+    rows = [
+        {"case_id": case_id, "rank": rank, "neighbor_id": neighbor_id, "similarity": sim}
+        for case_id, neighbors in lists.items()
+        for rank, (neighbor_id, sim) in enumerate(neighbors, start=1)
+    ]
+    if rows:
+        await session.execute(insert(CaseNeighbor), rows)
+
+
+async def refresh_neighbors(session: AsyncSession, case_ids: list[int], n: int | None = None) -> None:
+    """Recompute the neighbour lists of `case_ids` from scratch with an ANN query each."""
+    n = n or settings.similar_cases_precomputed
+    result = await session.execute(
+        select(Case.id, Case.embedding).where(Case.id.in_(case_ids)).where(Case.embedding.isnot(None))
+    )
+    lists = {
+        row.id: await nearest_neighbors(session, row.id, list(row.embedding), n) for row in result.all()
+    }
+    await _lock(session, lists)
+    await _write_lists(session, lists)
+
+
+async def update_neighbors(
+    session: AsyncSession, case_id: int, embedding: list[float], n: int | None = None
+) -> None:
+    """Maintain the precomputed table after `case_id` was (re-)embedded.
+
+    Recomputes the case's own list, merges the case into the lists of its new
+    neighbours (similarity is symmetric, so no extra ANN query is needed) and
+    fully refreshes cases that listed it before but are no longer close.
+    Lists that were never computed are left to the backfill script.
+    """
+    n = n or settings.similar_cases_precomputed
+    own = await nearest_neighbors(session, case_id, embedding, n)
+    own_ids = [nid for nid, _ in own]
+    referrers = await session.execute(
+        select(CaseNeighbor.case_id).where(CaseNeighbor.neighbor_id == case_id)
+    )
+    stale = set(referrers.scalars().all()) - set(own_ids)
+
+    await _lock(session, [case_id, *own_ids, *stale])
+    current = await _load_lists(session, own_ids)
+    lists: dict[int, Neighbors] = {case_id: own}
+    for neighbor_id, sim in own:
+        if neighbor_id not in current:
+            continue
+        merged = merge_neighbor(current[neighbor_id], case_id, sim, n)
+        if merged is not None:
+            lists[neighbor_id] = merged
+    await _write_lists(session, lists)
+    if stale:
+        await refresh_neighbors(session, sorted(stale), n)
+
+
+async def stream_embedded_case_ids(session: AsyncSession, batch_size: int) -> AsyncIterator[list[int]]:
+    stmt = select(Case.id).where(Case.embedding.isnot(None)).order_by(Case.id)
+    result = await session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        yield list(partition)
+
+
+async def refresh_all(
+    async_session, batch_size: int, parallel: int, report: Callable[[str], None] | None = None
+) -> tuple[int, int]:
+    """Rebuild every embedded case's list, `parallel` batches at a time; returns (refreshed, failed).
+
+    Each batch commits on its own session, so a failed batch is counted and
+    skipped without undoing the others. `report` receives progress lines.
+    """
+    report = report or (lambda line: None)
+    done = 0
+    failed = 0
+    started = time.monotonic()
+    slots = asyncio.Semaphore(parallel)
+    tasks: set[asyncio.Task] = set()
+
+    async def refresh_batch(ids: list[int]):
+        nonlocal done, failed
+        try:
+            async with async_session() as session:
+                await refresh_neighbors(session, ids)
+                await session.commit()
+            done += len(ids)
+            rate = done / max(time.monotonic() - started, 1e-6)
+            report(f"  [{done}] {rate:.1f} cases/s")
+        except Exception as e:
+            failed += len(ids)
+            report(f"  ERROR: ids {ids[0]}..{ids[-1]} - {e}")
+        finally:
+            slots.release()
+
+    async with async_session() as reader:
+        async for ids in stream_embedded_case_ids(reader, batch_size):
+            await slots.acquire()
+            task = asyncio.create_task(refresh_batch(ids))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    return done, failed
+
+
+async def get_precomputed_neighbors(session: AsyncSession, case_id: int, limit: int, columns) -> list:
+    """Single indexed lookup on (case_id, rank), joined to the requested case columns."""
+    stmt = (
+        select(*columns, CaseNeighbor.similarity.label("sim"))
+        .join(CaseNeighbor, CaseNeighbor.neighbor_id == Case.id)
+        .where(CaseNeighbor.case_id == case_id)
+        .order_by(CaseNeighbor.rank)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return result.all()
@@ -1,29 +1,252 @@
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+
 import httpx
 from app.config import settings
+from app.services.metrics import OLLAMA_REQUESTS, OLLAMA_SECONDS
+from app.services.ollama_pool import EndpointPool, OllamaEndpoint, build_pools, model_key
+
+logger = logging.getLogger(__name__)
 
 
 class OllamaClient:
+    """Ollama API client over one or more instances.
+
+    `base_url` (OLLAMA_BASE_URL) may list several comma-separated instances;
+    embedding and generation traffic can be split onto their own instances
+    with `embed_urls` / `generate_urls`. Each request goes to the available
+    instance with the fewest requests in flight, and moves to another
+    instance if the connection is refused.
+    """
+
     def __init__(
         self,
         base_url: str | None = None,
         embedding_model: str | None = None,
         llm_model: str | None = None,
+        max_concurrency: int | None = None,
+        embed_urls: str | None = None,
+        generate_urls: str | None = None,
     ):
         self.base_url = base_url or settings.ollama_base_url
         self.embedding_model = embedding_model or settings.ollama_embedding_model
         self.llm_model = llm_model or settings.ollama_llm_model
         self.dimension = settings.embedding_dimension
+        self.embed_pool, self.generate_pool = build_pools(
+            self.base_url,
+            settings.ollama_embed_urls if embed_urls is None else embed_urls,
+            settings.ollama_generate_urls if generate_urls is None else generate_urls,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._health_task: asyncio.Task | None = None
+        self._warming: dict[tuple[str, str], asyncio.Task] = {}
+        self.limit_concurrency(
+            settings.ollama_max_concurrency if max_concurrency is None else max_concurrency
+        )
+
+    def limit_concurrency(self, max_concurrency: int) -> None:
+        """Cap the number of in-flight Ollama requests (0 = unlimited)."""
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else nullcontext()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=settings.ollama_http2,
+            limits=httpx.Limits(
+                max_connections=settings.ollama_max_connections,
+                max_keepalive_connections=settings.ollama_max_keepalive_connections,
+                keepalive_expiry=settings.ollama_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                settings.ollama_generate_timeout, connect=settings.ollama_connect_timeout
+            ),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled client, created on first use and reused across calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    @property
+    def endpoints(self) -> list[OllamaEndpoint]:
+        """Every instance, once, embedding pool first."""
+        seen = {}
+        for endpoint in (*self.embed_pool.endpoints, *self.generate_pool.endpoints):
+            seen.setdefault(endpoint.url, endpoint)
+        return list(seen.values())
+
+    async def start(self) -> None:
+        """Open the connection pool and start health checks, which also warm the models."""
+        self.client
+        if settings.ollama_health_check_seconds > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def aclose(self) -> None:
+        tasks = [t for t in (self._health_task, *self._warming.values()) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._health_task = None
+        self._warming.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def status(self) -> dict:
+        """Per-instance health and load, and which instances serve each kind of traffic."""
+        return {
+            "endpoints": [endpoint.status() for endpoint in self.endpoints],
+            "embed": [endpoint.url for endpoint in self.embed_pool.endpoints],
+            "generate": [endpoint.url for endpoint in self.generate_pool.endpoints],
+        }
+
+    async def _post(
+        self, pool: EndpointPool, path: str, model: str, payload: dict, timeout=httpx.USE_CLIENT_DEFAULT
+    ) -> dict:
+        """POST under the concurrency cap to the least-loaded instance of `pool`.
+
+        Latency and outcome are recorded per API path and model. Transport
+        errors, timeouts and 5xx responses count against the instance (see
+        OllamaEndpoint); a refused connection moves on to the next instance,
+        each tried at most once, since the request never reached Ollama.
+        """
+        if settings.ollama_keep_alive:
+            payload = {**payload, "keep_alive": settings.ollama_keep_alive}
+        tried: list[OllamaEndpoint] = []
+        async with self._slots:
+            while True:
+                endpoint = pool.pick(exclude=tried)
+                tried.append(endpoint)
+                started = time.perf_counter()
+                outcome = "error"
+                endpoint.acquire()
+                try:
+                    resp = await self.client.post(endpoint.url + path, json=payload, timeout=timeout)
+                    resp.raise_for_status()
+                    outcome = "ok"
+                    endpoint.record_success()
+                    return resp.json()
+                except httpx.TimeoutException as e:
+                    outcome = "timeout"
+                    endpoint.record_failure(f"{type(e).__name__}: {e}")
+                    raise
+                except httpx.HTTPStatusError as e:
+                    outcome = "http_error"
+                    if e.response.status_code >= 500:
+                        endpoint.record_failure(f"HTTP {e.response.status_code}")
+                    raise
+                except httpx.TransportError as e:
+                    outcome = "connect_error"
+                    endpoint.record_failure(f"{type(e).__name__}: {e}")
+                    if isinstance(e, httpx.ConnectError) and len(tried) < len(pool):
+                        continue
+                    raise
+                finally:
+                    endpoint.release()
+                    OLLAMA_SECONDS.labels(path, model).observe(time.perf_counter() - started)
+                    OLLAMA_REQUESTS.labels(path, model, outcome).inc()
+
+    async def check_endpoints(self) -> None:
+        """Active health check: GET /api/ps on every instance, then warm any model not resident.
+
+        An unreachable instance is ejected until it answers again. /api/ps
+        lists the models an instance has loaded, so a model evicted since
+        the last check (keep_alive expired, instance restarted) is loaded
+        again in the background before the next request has to wait for it.
+        """
+
+        async def check(endpoint: OllamaEndpoint) -> None:
+            try:
+                resp = await self.client.get(
+                    endpoint.url + "/api/ps", timeout=settings.ollama_connect_timeout
+                )
+                resp.raise_for_status()
+            except httpx.HTTPError as e:
+                endpoint.record_failure(f"health check: {type(e).__name__}: {e}", eject=True)
+                return
+            endpoint.record_success()
+            endpoint.loaded_models = {model_key(m.get("name", "")) for m in resp.json().get("models", [])}
+
+        await asyncio.gather(*(check(endpoint) for endpoint in self.endpoints))
+        for pool, model, kind in (
+            (self.embed_pool, self.embedding_model, "embed"),
+            (self.generate_pool, self.llm_model, "generate"),
+        ):
+            for endpoint in pool.endpoints:
+                if endpoint.available and model_key(model) not in (endpoint.loaded_models or set()):
+                    self._warm(endpoint, model, kind)
+
+    def _warm(self, endpoint: OllamaEndpoint, model: str, kind: str) -> None:
+        """Load `model` on `endpoint` in the background, held for OLLAMA_KEEP_ALIVE."""
+        key = (endpoint.url, model)
+        if key in self._warming:
+            return
+        if kind == "embed":
+            path, payload = "/api/embed", {"model": model, "input": "warm-up"}
+        else:
+            path, payload = "/api/generate", {"model": model}  # no prompt: load only
+        if settings.ollama_keep_alive:
+            payload["keep_alive"] = settings.ollama_keep_alive
+
+        async def warm():
+            try:
+                resp = await self.client.post(endpoint.url + path, json=payload)
+                resp.raise_for_status()
+                logger.info("Loaded %s on %s", model, endpoint.url)
+            except httpx.HTTPError as e:
+                logger.warning("Could not warm %s on %s: %s", model, endpoint.url, e)
+            finally:
+                self._warming.pop(key, None)
+
+        self._warming[key] = asyncio.create_task(warm())
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_endpoints()
+            except Exception:
+                logger.exception("Ollama health check failed")
+            await asyncio.sleep(settings.ollama_health_check_seconds)
+
+    def _embed_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(settings.ollama_embed_timeout, connect=settings.ollama_connect_timeout)
 
     async def embed(self, text: str) -> list[float]:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{self.base_url.rstrip('/')}/api/embeddings",
-                json={"model": self.embedding_model, "prompt": text},
-            )
-            resp.raise_for_status()
-            return resp.json()["embedding"]
-
-    async def generate(self, prompt: str, system: str | None = None) -> str:
+        body = await self._post(
+            self.embed_pool,
+            "/api/embeddings",
+            self.embedding_model,
+            {"model": self.embedding_model, "prompt": text},
+            timeout=self._embed_timeout(),
+        )
+        return body["embedding"]
+
+    async def embed_many(self, texts: list[str], batch_size: int | None = None) -> list[list[float]]:
+        """Embed many texts via the batch /api/embed endpoint, `batch_size` inputs per request."""
+        batch_size = batch_size or settings.ollama_embed_batch_size
+        chunks = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(self._embed_batch(chunk) for chunk in chunks))
+        return [embedding for chunk in results for embedding in chunk]
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        body = await self._post(
+            self.embed_pool,
+            "/api/embed",
+            self.embedding_model,
+            {"model": self.embedding_model, "input": texts},
+            timeout=self._embed_timeout(),
+        )
+        embeddings = body["embeddings"]
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs")
+        return embeddings
+
+    async def generate(self, prompt: str, system: str | None = None, format: str | dict | None = None) -> str:
+        """Completion for `prompt`; `format` is "json" or a JSON schema for structured output."""
         payload = {
             "model": self.llm_model,
             "prompt": prompt,
@@ -32,14 +255,11 @@ class OllamaClient:
         }
         if system:
             payload["system"] = system
+        if format:
+            payload["format"] = format
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            resp = await client.post(
-                f"{self.base_url.rstrip('/')}/api/generate",
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()["response"].strip()
+        body = await self._post(self.generate_pool, "/api/generate", self.llm_model, payload)
+        return body["response"].strip()
 
 
 ollama_client = OllamaClient()
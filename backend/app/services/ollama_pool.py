@@ -0,0 +1,116 @@
+import time
+
+from app.config import settings
+from app.services.metrics import OLLAMA_INSTANCE_IN_FLIGHT, OLLAMA_INSTANCE_UP
+
+
+def parse_urls(value: str) -> list[str]:
+    """Comma-separated Ollama base URLs, de-duplicated in order."""
+    urls = []
+    for url in value.split(","):
+        url = url.strip().rstrip("/")
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def model_key(name: str) -> str:
+    """Model name as Ollama reports it: an untagged name means ":latest"."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class OllamaEndpoint:
+    """One Ollama instance: in-flight requests and health, shared by every pool that routes to it.
+
+    Passive checks eject it for OLLAMA_EJECT_SECONDS after
+    OLLAMA_EJECT_AFTER_FAILURES consecutive connection errors, timeouts or
+    5xx responses; an active check (see OllamaClient.check_endpoints) ejects
+    it at once when unreachable and restores it when it answers again.
+    """
+
+    def __init__(self, url: str, clock=time.monotonic):
+        self.url = url
+        self._clock = clock
+        self.in_flight = 0
+        self.failures = 0  # consecutive
+        self.ejected_until = 0.0
+        self.last_error: str | None = None
+        self.loaded_models: set[str] | None = None  # from /api/ps; None until checked
+        OLLAMA_INSTANCE_UP.labels(url).set(1)
+
+    @property
+    def available(self) -> bool:
+        return self._clock() >= self.ejected_until
+
+    def acquire(self) -> None:
+        self.in_flight += 1
+        OLLAMA_INSTANCE_IN_FLIGHT.labels(self.url).set(self.in_flight)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        OLLAMA_INSTANCE_IN_FLIGHT.labels(self.url).set(self.in_flight)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.ejected_until = 0.0
+        OLLAMA_INSTANCE_UP.labels(self.url).set(1)
+
+    def record_failure(self, error: str, eject: bool = False) -> None:
+        self.failures += 1
+        self.last_error = error
+        if eject or self.failures >= settings.ollama_eject_after_failures:
+            self.ejected_until = self._clock() + settings.ollama_eject_seconds
+            OLLAMA_INSTANCE_UP.labels(self.url).set(0)
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "available": self.available,
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "loaded_models": sorted(self.loaded_models) if self.loaded_models is not None else None,
+        }
+
+
+class EndpointPool:
+    """Least-outstanding-requests routing over the available endpoints.
+
+    Ties rotate, so idle endpoints share light traffic. When every endpoint
+    is ejected the pool fails open and picks the one whose ejection ends
+    first, rather than refusing all requests.
+    """
+
+    def __init__(self, endpoints: list[OllamaEndpoint]):
+        if not endpoints:
+            raise ValueError("An Ollama endpoint pool needs at least one URL")
+        self.endpoints = endpoints
+        self._turn = 0
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def pick(self, exclude: list[OllamaEndpoint] = ()) -> OllamaEndpoint:
+        candidates = [e for e in self.endpoints if e not in exclude] or self.endpoints
+        available = [e for e in candidates if e.available]
+        if not available:
+            return min(candidates, key=lambda e: e.ejected_until)
+        fewest = min(e.in_flight for e in available)
+        tied = [e for e in available if e.in_flight == fewest]
+        self._turn += 1
+        return tied[self._turn % len(tied)]
+
+
+def build_pools(
+    base_urls: str, embed_urls: str = "", generate_urls: str = ""
+) -> tuple[EndpointPool, EndpointPool]:
+    """(embed pool, generate pool); each falls back to `base_urls`, and a URL in both is one endpoint."""
+    endpoints: dict[str, OllamaEndpoint] = {}
+
+    def pool(urls: str) -> EndpointPool:
+        for url in parse_urls(urls or base_urls):
+            if url not in endpoints:
+                endpoints[url] = OllamaEndpoint(url)
+        return EndpointPool([endpoints[url] for url in parse_urls(urls or base_urls)])
+
+    return pool(embed_urls), pool(generate_urls)
@@ -0,0 +1,40 @@
+import base64
+import json
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that are malformed or belong to a different kind of listing."""
+
+
+def encode_cursor(kind: str, values: list[Any]) -> str:
+    """Opaque, URL-safe token carrying the sort key of the last row served."""
+    raw = json.dumps({"k": kind, "v": values}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, kind: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(payload, dict) or payload.get("k") != kind or not isinstance(payload.get("v"), list):
+        raise InvalidCursor("Cursor does not belong to this query")
+    return payload["v"]
+
+
+def seek_after(keys: list[tuple[ColumnElement, bool]], values: list[Any]) -> ColumnElement:
+    """WHERE clause selecting rows strictly after `values` in the ordering `keys`.
+
+    `keys` is a list of (expression, descending) pairs matching the ORDER BY,
+    e.g. [(rank, True), (Case.id, False)] for ``ORDER BY rank DESC, id``.
+    """
+    clause = None
+    for (expr, descending), value in reversed(list(zip(keys, values))):
+        past = expr < value if descending else expr > value
+        clause = past if clause is None else or_(past, and_(expr == value, clause))
+    return clause
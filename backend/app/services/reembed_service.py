@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import Row, bindparam, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Case
+from app.services.ingestion_service import build_embedding_text
+from app.services.vector_index import VECTOR_INDEXES, index_ddl, quantization
+
+_REEMBED_COLUMNS = (
+    Case.id,
+    Case.facts,
+    Case.legal_issues,
+    Case.judgment,
+    Case.ratio_decidendi,
+    Case.key_principles,
+)
+
+
+def _stale_filter(stmt, model: str, include_current: bool, after_id: int):
+    stmt = stmt.where(Case.facts.isnot(None)).where(Case.id > after_id)
+    if not include_current:
+        stmt = stmt.where(
+            or_(Case.embedding.is_(None), Case.embedding_model.is_distinct_from(model))
+        )
+    return stmt
+
+
+async def count_cases_to_reembed(
+    session: AsyncSession, model: str, include_current: bool = False, after_id: int = 0
+) -> int:
+    stmt = _stale_filter(select(func.count(Case.id)), model, include_current, after_id)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def stream_cases_to_reembed(
+    session: AsyncSession,
+    model: str,
+    batch_size: int,
+    include_current: bool = False,
+    after_id: int = 0,
+) -> AsyncIterator[list[Row]]:
+    """Yield batches of cases whose embedding is missing or from another model.
+
+    Uses a server-side cursor, so only one batch of summaries is in memory.
+    Because finished cases are tagged with `model`, a restarted run naturally
+    continues with what is left.
+    """
+    stmt = _stale_filter(select(*_REEMBED_COLUMNS), model, include_current, after_id).order_by(Case.id)
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        yield list(partition)
+
+
+def embedding_text(row: Row) -> str:
+    return build_embedding_text(
+        row.facts, row.legal_issues, row.judgment, row.ratio_decidendi, row.key_principles
+    )
+
+
+async def write_embeddings(
+    session: AsyncSession, embeddings: list[tuple[int, list[float]]], model: str
+) -> None:
+    """Bulk UPDATE embeddings by id in a single executemany round-trip.
+
+    Does not bump the corpus version; the caller does that once per run.
+    """
+    table = Case.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("case_id"))
+        .values(
+            embedding=bindparam("embedding"),
+            embedding_model=bindparam("embedding_model"),
+            updated_at=bindparam("updated_at"),
+        )
+    )
+    now = datetime.utcnow()
+    await session.execute(
+        stmt,
+        [
+            {"case_id": case_id, "embedding": embedding, "embedding_model": model, "updated_at": now}
+            for case_id, embedding in embeddings
+        ],
+    )
+
+
+async def embedding_column_dimension(session: AsyncSession) -> int | None:
+    result = await session.execute(
+        text(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = 'cases'::regclass AND attname = 'embedding'"
+        )
+    )
+    typmod = result.scalar_one_or_none()
+    return typmod if typmod and typmod > 0 else None
+
+
+async def resize_embedding_column(
+    session: AsyncSession, dimension: int, create_index: bool = True
+) -> None:
+    """Change the vector dimension; existing embeddings are cleared since they cannot be cast.
+
+    The HNSW index cannot survive the type change, so it is dropped and, with
+    `create_index`, rebuilt at once for the configured quantization (cheap on
+    the emptied column). Pass False only if the caller rebuilds it itself
+    after bulk-loading the new embeddings; until then searches scan the table.
+    """
+    await drop_vector_index(session)
+    await session.execute(
+        text(f"ALTER TABLE cases ALTER COLUMN embedding TYPE vector({int(dimension)}) USING NULL")
+    )
+    await session.execute(text("UPDATE cases SET embedding_model = NULL"))
+    if create_index:
+        await create_vector_index(session)
+
+
+async def drop_vector_index(session: AsyncSession) -> None:
+    """Drop every HNSW index on cases.embedding, full-precision and quantized."""
+    for name, _ in VECTOR_INDEXES.values():
+        await session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+async def create_vector_index(session: AsyncSession) -> None:
+    """Build the HNSW index that queries use under the configured VECTOR_QUANTIZATION."""
+    await session.execute(text(index_ddl(quantization())))
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+
+from app.config import settings
+
+
+class MemoryCacheBackend:
+    """In-process LRU of serialized responses with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 2048, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Shared cache for multi-replica deployments; any Redis-protocol server works."""
+
+    def __init__(self, url: str, prefix: str = "sce:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+
+class NullCacheBackend:
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+def build_response_cache():
+    backend = settings.response_cache_backend
+    if backend == "redis":
+        return RedisCacheBackend(settings.redis_url)
+    if backend == "memory":
+        return MemoryCacheBackend(settings.response_cache_size)
+    return NullCacheBackend()
+
+
+def build_snapshot_store(cache):
+    """Store for hybrid-search cursor snapshots (see search_service._hybrid_search).
+
+    Snapshots go through Redis when the response cache does, so any replica
+    can serve the next page. Otherwise they get an in-process LRU of their
+    own: RESPONSE_CACHE_BACKEND=none must not turn cursor pages into fresh
+    rankings, and cached responses must not evict snapshots.
+    """
+    if isinstance(cache, RedisCacheBackend):
+        return cache
+    return MemoryCacheBackend(settings.hybrid_snapshot_size)
+
+
+response_cache = build_response_cache()
+snapshot_store = build_snapshot_store(response_cache)
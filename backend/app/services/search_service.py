@@ -1,30 +1,70 @@
-from sqlalchemy import select, exists
+import hashlib
+import json
+import re
+import secrets
+from typing import NamedTuple
+
+from sqlalchemy import Row, case, exists, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models import Case, CaseTopic
-from app.services.ollama_client import ollama_client
+from app.services.embedding_cache import embed_query, normalize_query
+from app.services.metrics import stage
+from app.services.neighbor_service import get_precomputed_neighbors
+from app.services.pagination import decode_cursor, encode_cursor, seek_after
+from app.services.response_cache import snapshot_store
+from app.services.vector_index import HNSW_MAX_EF_SEARCH, index_depth, nearest_stmt, widen_ef_search
 
+SNIPPET_LENGTH = 150
+TS_CONFIG = "english"
+RRF_K = 60
 
-async def search_cases(
-    session: AsyncSession,
-    q: str | None = None,
+CITATION_PATTERN = re.compile(
+    r"^\s*("
+    r"AIR\s+\d{4}\s+[A-Z]{2,6}\s+\d+"  # AIR 1973 SC 1461
+    r"|\(\d{4}\)\s*\d+\s+[A-Z]{2,6}\s+\d+"  # (2017) 10 SCC 1
+    r"|\[\d{4}\]\s*\d+\s+[A-Z]{2,6}\s+\d+"  # [1950] 1 SCR 88
+    r"|\d{4}\s+(INSC|SCC\s+OnLine\s+SC)\s+\d+"  # 2023 INSC 920
+    r")\s*$",
+    re.IGNORECASE,
+)
+
+
+class PageTooDeep(ValueError):
+    """Raised when a vector-ranked page lies deeper than the HNSW index scan can reach."""
+
+
+def _snippet_expr(max_len: int = SNIPPET_LENGTH):
+    """First non-empty of ratio/facts/judgment, truncated in SQL so full texts never leave Postgres."""
+    source = func.coalesce(
+        func.nullif(Case.ratio_decidendi, ""),
+        func.nullif(Case.facts, ""),
+        func.nullif(Case.judgment, ""),
+    )
+    return case(
+        (func.length(source) > max_len, func.concat(func.left(source, max_len), "...")),
+        else_=source,
+    )
+
+
+# Columns needed by list/search responses; avoids loading summaries and the vector.
+CASE_SUMMARY_COLUMNS = (
+    Case.id,
+    Case.case_name,
+    Case.citation,
+    Case.year,
+    Case.bench,
+    _snippet_expr().label("snippet"),
+)
+
+
+def _apply_filters(
+    stmt,
     topic_ids: list[int] | None = None,
     year_from: int | None = None,
     year_to: int | None = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> list[tuple[Case, float | None]]:
-    if q and q.strip():
-        embedding = await ollama_client.embed(q.strip())
-        sim_expr = (1 - Case.embedding.cosine_distance(embedding)).label("sim")
-        stmt = (
-            select(Case, sim_expr)
-            .where(Case.embedding.isnot(None))
-            .order_by(Case.embedding.cosine_distance(embedding))
-        )
-    else:
-        stmt = select(Case).order_by(Case.year.desc())
-
+):
     if topic_ids:
         stmt = stmt.where(
             exists(
@@ -37,34 +77,328 @@ async def search_cases(
         stmt = stmt.where(Case.year >= year_from)
     if year_to is not None:
         stmt = stmt.where(Case.year <= year_to)
+    return stmt
+
+
+def _has_filters(filters: dict) -> bool:
+    return bool(filters.get("topic_ids")) or any(
+        filters.get(k) is not None for k in ("year_from", "year_to")
+    )
+
+
+async def _plan_vector_scan(session: AsyncSession, filters: dict, depth: int) -> bool:
+    """Pick a filter-aware strategy for the next ANN query; True means use an exact scan.
+
+    HNSW returns at most ef_search candidates *before* WHERE clauses are
+    applied, so selective topic/year filters can leave a page short. When the
+    filtered set is small (<= settings.exact_scan_threshold rows) it is cheaper
+    and exact to rank it directly. Otherwise ef_search is raised to cover the
+    requested depth and, on pgvector >= 0.8, iterative index scans keep
+    walking the graph until enough filtered rows are found, bounded by
+    hnsw.max_scan_tuples. Pages deeper than HNSW_MAX_EF_SEARCH need iterative
+    scans even unfiltered: a plain scan stops after ef_search rows and would
+    end the listing early, so without them (or past max_scan_tuples) they
+    raise PageTooDeep instead. Settings are transaction-local.
+    """
+    filtered = _has_filters(filters)
+    if filtered:
+        threshold = settings.exact_scan_threshold
+        candidates = _apply_filters(select(Case.id).where(Case.embedding.isnot(None)), **filters)
+        count_stmt = select(func.count()).select_from(candidates.limit(threshold + 1).subquery())
+        if (await session.execute(count_stmt)).scalar_one() <= threshold:
+            return True
+
+    deep = depth > HNSW_MAX_EF_SEARCH
+    reach = max(HNSW_MAX_EF_SEARCH, settings.hnsw_max_scan_tuples if settings.hnsw_iterative_scan else 0)
+    if depth > reach:
+        raise PageTooDeep(f"Vector search ranks at most {reach} results; refine the query or add filters")
+    ef_search = min(HNSW_MAX_EF_SEARCH, max(settings.hnsw_ef_search, depth * 2))
+    gucs = [func.set_config("hnsw.ef_search", str(ef_search), True)]
+    if (filtered or deep) and settings.hnsw_iterative_scan:
+        gucs.append(func.set_config("hnsw.iterative_scan", settings.hnsw_iterative_scan, True))
+        gucs.append(func.set_config("hnsw.max_scan_tuples", str(settings.hnsw_max_scan_tuples), True))
+    await session.execute(select(*gucs))
+    return False
+
+
+def _exact_candidates(embedding: list[float], filters: dict):
+    """Filtered rows with their distance, materialized so the HNSW index is bypassed."""
+    stmt = select(Case.id.label("id"), Case.embedding.cosine_distance(embedding).label("distance"))
+    stmt = _apply_filters(stmt.where(Case.embedding.isnot(None)), **filters)
+    return stmt.cte("candidates").prefix_with("MATERIALIZED")
+
+
+def looks_like_citation(q: str) -> bool:
+    """True for reporter citations such as 'AIR 1973 SC 1461' or '(2017) 10 SCC 1'."""
+    return bool(CITATION_PATTERN.match(q))
+
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = RRF_K) -> list[tuple[int, float]]:
+    """Merge ranked id lists by summed 1 / (k + rank), best first (ties broken by id)."""
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, case_id in enumerate(ranking, start=1):
+            scores[case_id] = scores.get(case_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _tsquery(q: str):
+    return func.websearch_to_tsquery(TS_CONFIG, q)
+
+
+class SearchPage(NamedTuple):
+    results: list[tuple[Row, float | None]]
+    next_cursor: str | None = None
+
+
+def _cursor_kind(mode: str, q: str | None, filters: dict) -> str:
+    """Cursor namespace: the ranking mode plus a digest of the query and filters."""
+    key = json.dumps(
+        [
+            normalize_query(q or ""),
+            sorted(filters.get("topic_ids") or []),
+            filters.get("year_from"),
+            filters.get("year_to"),
+        ]
+    )
+    return f"{mode}:{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+
+
+def _page(results: list, limit: int, kind: str, last_key) -> SearchPage:
+    """Attach a cursor for the following page when this one is full."""
+    if len(results) < limit or not results:
+        return SearchPage(results)
+    return SearchPage(results, encode_cursor(kind, last_key(results[-1])))
+
+
+async def search_cases(
+    session: AsyncSession,
+    q: str | None = None,
+    topic_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    mode: str | None = None,
+    cursor: str | None = None,
+) -> SearchPage:
+    """Return a page of (summary row, similarity) pairs; rows carry CASE_SUMMARY_COLUMNS.
+
+    Without `q` cases are browsed newest first. With `q`, `mode` (default
+    settings.search_mode, "semantic") selects "semantic" (vector only),
+    "lexical" (full-text only, no embedding call) or "hybrid" (both, merged
+    by reciprocal rank fusion; citation-like queries take the lexical path).
+    Similarity is the cosine similarity, or None for lexical results.
+
+    `cursor` (the `next_cursor` of the previous page) resumes after the last
+    row served by seeking on the ranking key, so deep pages neither rescan
+    skipped rows nor repeat or drop rows when ranks tie. It takes precedence
+    over `offset`. Raises InvalidCursor for tokens from another query and
+    PageTooDeep for vector-ranked pages the index cannot reach.
+    """
+    filters = dict(topic_ids=topic_ids, year_from=year_from, year_to=year_to)
+    if not (q and q.strip()):
+        return await _browse(session, filters, limit, offset, cursor)
 
-    stmt = stmt.limit(limit).offset(offset)
-    result = await session.execute(stmt)
-    rows = result.all()
+    q = q.strip()
+    mode = mode or settings.search_mode
+    if mode == "lexical" or (mode == "hybrid" and looks_like_citation(q)):
+        return await _lexical_search(session, q, filters, limit, offset, cursor)
+    if mode == "semantic":
+        return await _semantic_search(session, q, filters, limit, offset, cursor)
+    return await _hybrid_search(session, q, filters, limit, offset, cursor)
 
-    if rows and hasattr(rows[0], '__len__') and len(rows[0]) == 2:
-        return [(r[0], float(r[1]) if r[1] is not None else None) for r in rows]
-    return [(r[0], None) for r in rows]
+
+async def _browse(
+    session: AsyncSession, filters: dict, limit: int, offset: int, cursor: str | None
+) -> SearchPage:
+    kind = _cursor_kind("browse", None, filters)
+    stmt = _apply_filters(
+        select(*CASE_SUMMARY_COLUMNS).order_by(Case.year.desc(), Case.id.desc()), **filters
+    )
+    if cursor:
+        year, case_id = decode_cursor(cursor, kind)
+        stmt = stmt.where(tuple_(Case.year, Case.id) < tuple_(year, case_id))
+    else:
+        stmt = stmt.offset(offset)
+    with stage("search", "browse_query"):
+        result = await session.execute(stmt.limit(limit))
+    results = [(r, None) for r in result.all()]
+    return _page(results, limit, kind, lambda last: [last[0].year, last[0].id])
+
+
+async def _semantic_search(
+    session: AsyncSession, q: str, filters: dict, limit: int, offset: int, cursor: str | None
+) -> SearchPage:
+    kind = _cursor_kind("semantic", q, filters)
+    after = decode_cursor(cursor, kind) if cursor else None
+    served = after[2] if after else offset
+    with stage("search", "embed"):
+        embedding = await embed_query(q)
+    with stage("search", "plan"):
+        exact = await _plan_vector_scan(session, filters, index_depth(served + limit))
+    if exact:
+        candidates = _exact_candidates(embedding, filters)
+        stmt = (
+            select(*CASE_SUMMARY_COLUMNS, candidates.c.distance, (1 - candidates.c.distance).label("sim"))
+            .join(candidates, candidates.c.id == Case.id)
+            .order_by(candidates.c.distance, Case.id)
+        )
+        if after:
+            stmt = stmt.where(tuple_(candidates.c.distance, candidates.c.id) > tuple_(after[0], after[1]))
+    else:
+        distance = Case.embedding.cosine_distance(embedding)
+        stmt = nearest_stmt(
+            (*CASE_SUMMARY_COLUMNS, distance.label("distance"), (1 - distance).label("sim")),
+            embedding,
+            served + limit,
+            lambda s: _apply_filters(s, **filters),
+        )
+        if after:
+            stmt = stmt.where(tuple_(distance, Case.id) > tuple_(after[0], after[1]))
+    if not after:
+        stmt = stmt.offset(offset)
+    with stage("search", "vector_query"):
+        result = await session.execute(stmt.limit(limit))
+    results = [(r, float(r.sim) if r.sim is not None else None) for r in result.all()]
+    return _page(
+        results, limit, kind, lambda last: [float(last[0].distance), last[0].id, served + len(results)]
+    )
+
+
+async def _lexical_search(
+    session: AsyncSession, q: str, filters: dict, limit: int, offset: int, cursor: str | None
+) -> SearchPage:
+    kind = _cursor_kind("lexical", q, filters)
+    tsquery = _tsquery(q)
+    exact_citation = case((func.lower(Case.citation) == q.lower(), 1), else_=0)
+    rank = func.ts_rank_cd(Case.search_vector, tsquery)
+    # Both sides of the OR are indexed (GIN on search_vector, ix_cases_citation_lower),
+    # so Postgres combines two index scans instead of scanning cases.
+    stmt = (
+        select(*CASE_SUMMARY_COLUMNS, exact_citation.label("exact"), rank.label("rank"))
+        .where(or_(Case.search_vector.op("@@")(tsquery), func.lower(Case.citation) == q.lower()))
+        .order_by(exact_citation.desc(), rank.desc(), Case.id)
+    )
+    stmt = _apply_filters(stmt, **filters)
+    if cursor:
+        stmt = stmt.where(
+            seek_after([(exact_citation, True), (rank, True), (Case.id, False)], decode_cursor(cursor, kind))
+        )
+    else:
+        stmt = stmt.offset(offset)
+    with stage("search", "lexical_query"):
+        result = await session.execute(stmt.limit(limit))
+    results = [(r, None) for r in result.all()]
+    return _page(results, limit, kind, lambda last: [last[0].exact, float(last[0].rank), last[0].id])
+
+
+async def _fused_ranking(
+    session: AsyncSession, q: str, embedding: list[float], filters: dict, depth: int
+) -> list[int]:
+    with stage("search", "plan"):
+        exact = await _plan_vector_scan(session, filters, index_depth(depth))
+    if exact:
+        candidates = _exact_candidates(embedding, filters)
+        vector_stmt = select(candidates.c.id).order_by(candidates.c.distance, candidates.c.id)
+    else:
+        vector_stmt = nearest_stmt((Case.id,), embedding, depth, lambda s: _apply_filters(s, **filters))
+    vector_stmt = vector_stmt.limit(depth)
+    tsquery = _tsquery(q)
+    lexical_stmt = _apply_filters(
+        select(Case.id)
+        .where(Case.search_vector.op("@@")(tsquery))
+        .order_by(func.ts_rank_cd(Case.search_vector, tsquery).desc(), Case.id),
+        **filters,
+    ).limit(depth)
+
+    with stage("search", "vector_query"):
+        vector_ids = list((await session.execute(vector_stmt)).scalars().all())
+    with stage("search", "lexical_query"):
+        lexical_ids = list((await session.execute(lexical_stmt)).scalars().all())
+    return [case_id for case_id, _ in reciprocal_rank_fusion([vector_ids, lexical_ids])]
+
+
+async def _hybrid_search(
+    session: AsyncSession, q: str, filters: dict, limit: int, offset: int, cursor: str | None
+) -> SearchPage:
+    """Rank-fused search; cursors page through a server-side snapshot of the fused order.
+
+    Fusion needs both full candidate lists, so there is no key to seek on.
+    Instead the fused id list is kept in snapshot_store, whatever
+    RESPONSE_CACHE_BACKEND is, and cursors carry (snapshot token, position):
+    later pages fetch only their ids, and stay consistent even if ingestion
+    reorders results meanwhile. A snapshot that expired, was evicted, or lives
+    in another replica's memory (only Redis is shared) is recomputed, so that
+    page follows the current ranking.
+    """
+    kind = _cursor_kind("hybrid", q, filters)
+    token, position = decode_cursor(cursor, kind) if cursor else (None, offset)
+    with stage("search", "embed"):
+        embedding = await embed_query(q)
+
+    snapshot = await snapshot_store.get(f"snapshot:{token}") if token else None
+    if snapshot is not None:
+        ranking = json.loads(snapshot)
+    else:
+        depth = max(settings.hybrid_candidates, position + limit)
+        ranking = await _fused_ranking(session, q, embedding, filters, depth)
+        token = secrets.token_urlsafe(12)
+        await snapshot_store.set(
+            f"snapshot:{token}", json.dumps(ranking).encode(), settings.response_cache_ttl_seconds
+        )
+
+    page_ids = ranking[position : position + limit]
+    if not page_ids:
+        return SearchPage([])
+
+    distance = Case.embedding.cosine_distance(embedding)
+    sim_expr = case((Case.embedding.isnot(None), 1 - distance), else_=None).label("sim")
+    with stage("search", "fetch"):
+        result = await session.execute(
+            select(*CASE_SUMMARY_COLUMNS, sim_expr).where(Case.id.in_(page_ids))
+        )
+    rows = {r.id: r for r in result.all()}
+    results = [
+        (rows[case_id], float(rows[case_id].sim) if rows[case_id].sim is not None else None)
+        for case_id in page_ids
+        if case_id in rows
+    ]
+    end = position + len(page_ids)
+    if end >= len(ranking):
+        return SearchPage(results)
+    return SearchPage(results, encode_cursor(kind, [token, end]))
 
 
 async def get_similar_cases(
     session: AsyncSession, case_id: int, limit: int = 5
-) -> list[tuple[Case, float]]:
-    r = await session.execute(
-        select(Case).where(Case.id == case_id).where(Case.embedding.isnot(None))
-    )
-    case = r.scalar_one_or_none()
-    if not case or not case.embedding:
+) -> list[tuple[Row, float]]:
+    """Serve from the precomputed case_neighbors table, else rank on the fly."""
+    if limit <= settings.similar_cases_precomputed:
+        with stage("similar", "precomputed"):
+            rows = await get_precomputed_neighbors(session, case_id, limit, CASE_SUMMARY_COLUMNS)
+        if rows:
+            return [(row, float(row.sim)) for row in rows]
+    return await _similar_cases_on_the_fly(session, case_id, limit)
+
+
+async def _similar_cases_on_the_fly(
+    session: AsyncSession, case_id: int, limit: int
+) -> list[tuple[Row, float]]:
+    with stage("similar", "embedding_lookup"):
+        r = await session.execute(
+            select(Case.embedding).where(Case.id == case_id).where(Case.embedding.isnot(None))
+        )
+    source_embedding = r.scalar_one_or_none()
+    if source_embedding is None:
         return []
 
-    embedding = list(case.embedding)
+    embedding = list(source_embedding)
     sim_expr = (1 - Case.embedding.cosine_distance(embedding)).label("sim")
-    stmt = (
-        select(Case, sim_expr)
-        .where(Case.id != case_id)
-        .where(Case.embedding.isnot(None))
-        .order_by(Case.embedding.cosine_distance(embedding))
-        .limit(limit)
-    )
-    result = await session.execute(stmt)
-    return [(row[0], float(row[1])) for row in result.all()]
+    stmt = nearest_stmt(
+        (*CASE_SUMMARY_COLUMNS, sim_expr), embedding, limit, lambda s: s.where(Case.id != case_id)
+    ).limit(limit)
+    with stage("similar", "ann_query"):
+        await widen_ef_search(session, index_depth(limit))
+        result = await session.execute(stmt)
+    return [(row, float(row.sim)) for row in result.all()]
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.services.metrics import SINGLE_FLIGHT_CALLS
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight execution.
+
+    The first caller for a key (the leader) starts `fn()` as a task; callers
+    arriving while it runs (followers) await that task instead of repeating
+    the work, and all of them get its result or its exception. Nothing is
+    kept once the task finishes, so a later call (e.g. after an error) runs
+    afresh; caching results is the caller's business.
+
+    The task runs with the leader's resources (its DB session, say), so it
+    belongs to the leader: if the leader is cancelled the task is cancelled
+    too, and the followers retry, one of them becoming the new leader. A
+    cancelled follower just stops waiting.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            task = self._flights.get(key)
+            if task is None:
+                SINGLE_FLIGHT_CALLS.labels(self.name, "leader").inc()
+                task = asyncio.create_task(fn())
+                self._flights[key] = task
+                task.add_done_callback(lambda t, key=key: self._forget(key, t))
+                try:
+                    return await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    task.cancel()
+                    raise
+
+            SINGLE_FLIGHT_CALLS.labels(self.name, "follower").inc()
+            # wait() returns however the task ends; only our own cancellation raises here.
+            await asyncio.wait({task})
+            if not task.cancelled():
+                return task.result()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
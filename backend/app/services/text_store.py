@@ -0,0 +1,68 @@
+import zlib
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import CaseText
+
+try:
+    import zstandard
+except ImportError:  # optional; texts are zlib-compressed without it
+    zstandard = None
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def codec() -> str:
+    """Codec for newly written texts: FULL_TEXT_CODEC, or zlib when zstandard is not installed."""
+    if settings.full_text_codec == "zstd" and zstandard is not None:
+        return "zstd"
+    return "zlib"
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    """(codec, compressed UTF-8 bytes). The codec is stored per row so both can be read back."""
+    raw = text.encode("utf-8")
+    name = codec()
+    if name == "zstd":
+        return name, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return name, zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("case text is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown case text codec {codec!r}")
+
+
+async def save_full_text(session: AsyncSession, case_id: int, text: str | None) -> None:
+    """Store (or replace) a case's raw judgment text; an empty text removes it."""
+    if not text:
+        await session.execute(delete(CaseText).where(CaseText.case_id == case_id))
+        return
+    name, data = compress_text(text)
+    stmt = pg_insert(CaseText).values(
+        case_id=case_id, codec=name, raw_size=len(text.encode("utf-8")), data=data
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CaseText.case_id],
+            set_={"codec": stmt.excluded.codec, "raw_size": stmt.excluded.raw_size, "data": stmt.excluded.data},
+        )
+    )
+
+
+async def load_full_text(session: AsyncSession, case_id: int) -> str | None:
+    """A case's raw judgment text, fetched and decompressed on demand."""
+    result = await session.execute(
+        select(CaseText.codec, CaseText.data).where(CaseText.case_id == case_id)
+    )
+    row = result.one_or_none()
+    return decompress_text(row.codec, row.data) if row is not None else None
@@ -0,0 +1,96 @@
+import re
+from typing import Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Topic
+
+# session.info key holding, per cache, topics created in the open transaction.
+_PENDING = "topic_cache_pending"
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class TopicCache:
+    """Process-wide slug -> topic id map for ingestion.
+
+    The topic vocabulary saturates quickly, so after warm-up resolving a
+    case's topics costs no queries. Misses are looked up in one SELECT and
+    the rest created with one INSERT ... ON CONFLICT DO NOTHING RETURNING; a
+    topic inserted concurrently by another worker is picked up by re-selecting
+    (ON CONFLICT waits for that worker's transaction, so the row is visible).
+
+    Ids of topics this session created are only cached once its transaction
+    commits, so a rolled-back case cannot leave a dangling id behind. Topics
+    are never deleted by the application; call clear() if they are.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    async def resolve(self, session: AsyncSession, names: Iterable[str]) -> list[int]:
+        """Topic ids for `names` (created as needed), de-duplicated by slug, in order."""
+        wanted: dict[str, str] = {}
+        for name in names:
+            name = str(name).strip()[:200]
+            slug = slugify(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name
+
+        pending = session.info.get(_PENDING, {}).get(self, {})
+        found = {slug: self._ids.get(slug) or pending.get(slug) for slug in wanted}
+        missing = [slug for slug, topic_id in found.items() if topic_id is None]
+        if missing:
+            existing = await self._select(session, missing)
+            self._ids.update(existing)
+            found.update(existing)
+            # Sorted so concurrent inserts of overlapping sets lock in the same order.
+            to_create = sorted(slug for slug in missing if slug not in existing)
+            if to_create:
+                result = await session.execute(
+                    pg_insert(Topic)
+                    .values([{"name": wanted[slug], "slug": slug} for slug in to_create])
+                    .on_conflict_do_nothing()
+                    .returning(Topic.slug, Topic.id)
+                )
+                created = dict(result.all())
+                session.info.setdefault(_PENDING, {}).setdefault(self, {}).update(created)
+                found.update(created)
+                raced = [slug for slug in to_create if slug not in created]
+                if raced:
+                    committed = await self._select(session, raced)
+                    self._ids.update(committed)
+                    found.update(committed)
+        return [topic_id for topic_id in found.values() if topic_id is not None]
+
+    @staticmethod
+    async def _select(session: AsyncSession, slugs: list[str]) -> dict[str, int]:
+        result = await session.execute(select(Topic.slug, Topic.id).where(Topic.slug.in_(slugs)))
+        return dict(result.all())
+
+
+topic_cache = TopicCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _promote_created_topics(session: Session) -> None:
+    for cache, created in session.info.pop(_PENDING, {}).items():
+        cache._ids.update(created)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_created_topics(session: Session, transaction) -> None:
+    # Runs after after_commit; anything left was rolled back or closed unfinished.
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
@@ -0,0 +1,109 @@
+from sqlalchemy import Float, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import UserDefinedType
+from pgvector.sqlalchemy import Vector
+
+from app.config import settings
+from app.models import Case
+
+HNSW_MAX_EF_SEARCH = 1000  # pgvector's upper bound
+
+# HNSW index per VECTOR_QUANTIZATION mode. The quantized ones are expression
+# indexes over the full-precision column, which is kept for the exact re-rank:
+# halfvec halves the index size, binary (1 bit per dimension) shrinks it 32x.
+VECTOR_INDEXES = {
+    "none": ("idx_cases_embedding_hnsw", "embedding vector_cosine_ops"),
+    "halfvec": ("idx_cases_embedding_halfvec_hnsw", "(embedding::halfvec({dim})) halfvec_cosine_ops"),
+    "binary": ("idx_cases_embedding_bit_hnsw", "(binary_quantize(embedding)::bit({dim})) bit_hamming_ops"),
+}
+
+
+class HalfVector(UserDefinedType):
+    """pgvector's 16-bit halfvec, used only as a cast target (bound as vector text)."""
+
+    cache_ok = True
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def get_col_spec(self, **kw):
+        return f"HALFVEC({self.dim})"
+
+
+def quantization() -> str:
+    mode = settings.vector_quantization
+    if mode not in VECTOR_INDEXES:
+        raise ValueError(f"Unknown VECTOR_QUANTIZATION {mode!r}; expected one of {', '.join(VECTOR_INDEXES)}")
+    return mode
+
+
+def index_ddl(mode: str, dim: int | None = None, concurrently: bool = False) -> str:
+    name, expression = VECTOR_INDEXES[mode]
+    expression = expression.format(dim=int(dim or settings.embedding_dimension))
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON cases USING hnsw ({expression})"
+    )
+
+
+def quantized_distance(embedding: list[float], mode: str | None = None):
+    """Distance expression that matches (and so can use) the index of `mode`."""
+    mode = mode or quantization()
+    dim = settings.embedding_dimension
+    if mode == "halfvec":
+        query = cast(literal(embedding, Vector(dim)), HalfVector(dim))
+        return cast(Case.embedding, HalfVector(dim)).op("<=>", return_type=Float)(query)
+    if mode == "binary":
+        query = func.binary_quantize(cast(literal(embedding, Vector(dim)), Vector(dim)))
+        return cast(func.binary_quantize(Case.embedding), BIT(dim)).op("<~>", return_type=Float)(
+            cast(query, BIT(dim))
+        )
+    return Case.embedding.cosine_distance(embedding)
+
+
+def index_depth(k: int) -> int:
+    """Index rows needed for the top `k`; over-fetched by VECTOR_RERANK_FACTOR when quantized."""
+    return k if quantization() == "none" else k * max(1, settings.vector_rerank_factor)
+
+
+async def widen_ef_search(session: AsyncSession, depth: int) -> None:
+    """Raise hnsw.ef_search (transaction-local) when an index scan must return more than it."""
+    if depth > settings.hnsw_ef_search:
+        ef_search = min(HNSW_MAX_EF_SEARCH, depth)
+        await session.execute(select(func.set_config("hnsw.ef_search", str(ef_search), True)))
+
+
+def ann_candidates(embedding: list[float], depth: int, restrict=None, mode: str | None = None):
+    """Stage one of two-stage search: ids of the `depth` nearest cases by the index distance.
+
+    `restrict` adds WHERE clauses (filters) to the candidate query. Ties are
+    broken by id so LIMIT cuts at the same row every time: the index scan
+    supplies distance order and an incremental sort only reorders rows of equal
+    distance. The CTE is materialized so the outer query ranks exactly these
+    rows by full-precision cosine distance instead of folding back into a
+    single index scan; with VECTOR_QUANTIZATION=none the two distances agree.
+    """
+    stmt = (
+        select(Case.id.label("id"))
+        .where(Case.embedding.isnot(None))
+        .order_by(quantized_distance(embedding, mode), Case.id)
+        .limit(depth)
+    )
+    if restrict is not None:
+        stmt = restrict(stmt)
+    return stmt.cte("ann_candidates").prefix_with("MATERIALIZED")
+
+
+def nearest_stmt(columns, embedding: list[float], k: int, restrict=None):
+    """SELECT `columns` of cases nearest to `embedding` by exact cosine distance, best first.
+
+    `k` is how many rows the caller will consume (offset plus limit); it
+    sizes the candidate set. The caller adds LIMIT / OFFSET / seek predicates.
+    Both the candidates and the outer query are ordered by (distance, id), so
+    rows with equal distances (identical embeddings) have one stable order that
+    a (distance, id) keyset cursor can seek on without repeating or skipping rows.
+    """
+    distance = Case.embedding.cosine_distance(embedding)
+    candidates = ann_candidates(embedding, index_depth(k), restrict)
+    return select(*columns).join(candidates, candidates.c.id == Case.id).order_by(distance, Case.id)
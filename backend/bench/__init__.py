@@ -0,0 +1 @@
+"""Benchmark and load-test tooling: synthetic corpus, fake Ollama server, load scenarios and reports."""
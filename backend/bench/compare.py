@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark reports and flag regressions.
+Usage: python -m bench.compare baseline.json candidate.json [--threshold 0.10]
+
+Exits with status 1 when any scenario's p95 latency rose, or its throughput
+fell, by more than --threshold (a fraction), so it can gate CI.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench.report import compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    rows = compare(baseline, candidate, args.threshold)
+    print(f"baseline {baseline['meta'].get('commit')}  ->  candidate {candidate['meta'].get('commit')}")
+    print(f"{'scenario':<22} {'p95 ms':>20} {'change':>8} {'throughput/s':>22} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['scenario']:<22} {row['p95_ms'][0]:>9.1f} -> {row['p95_ms'][1]:<8.1f} "
+            f"{row['p95_change']:>+8.1%} {row['throughput'][0]:>10.1f} -> {row['throughput'][1]:<9.1f} "
+            f"{row['throughput_change']:>+8.1%}{flag}"
+        )
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Deterministic synthetic cases for benchmarks.
+
+Text is drawn from a small legal vocabulary so full-text search has realistic
+hit rates, and embeddings are random unit vectors (numpy is used when
+installed, which is much faster for 100k+ cases).
+"""
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional, only speeds up vector generation
+    np = None
+
+VOCABULARY = (
+    "article constitution fundamental right equality liberty privacy speech expression religion "
+    "property contract tort negligence criminal procedure evidence bail appeal writ petition habeas "
+    "corpus mandamus certiorari jurisdiction tribunal statute amendment basic structure doctrine "
+    "reservation backward classes election commission parliament legislature executive judiciary "
+    "federalism taxation customs excise arbitration award labour dismissal compensation land "
+    "acquisition environment pollution forest wildlife water dispute inheritance succession marriage "
+    "divorce maintenance custody adoption dowry cruelty murder culpable homicide sentence death "
+    "penalty life imprisonment acquittal conviction witness confession search seizure police custody "
+    "torture dignity livelihood education health information transparency corruption service pension"
+).split()
+
+TOPICS = (
+    "Constitutional Law", "Fundamental Rights", "Right to Privacy", "Right to Equality",
+    "Freedom of Speech", "Criminal Law", "Criminal Procedure", "Evidence", "Bail",
+    "Death Penalty", "Service Law", "Labour Law", "Taxation", "Arbitration", "Contract Law",
+    "Property Law", "Land Acquisition", "Environmental Law", "Family Law", "Election Law",
+    "Reservation", "Administrative Law", "Federalism", "Basic Structure", "Religious Freedom",
+    "Right to Education", "Right to Health", "Right to Information", "Anti-Corruption", "Tort Law",
+)
+
+BENCHES = ("Single Judge", "Division Bench", "3 Judge Bench", "5 Judge Bench", "7 Judge Bench")
+
+CITATION_PREFIX = "BENCH"  # synthetic cases are recognisable (and removable) by citation
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def query(rng: random.Random) -> str:
+    """A 2-4 word search phrase from the corpus vocabulary."""
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 4)))
+
+
+def citation(index: int, year: int) -> str:
+    return f"{CITATION_PREFIX} {year} SC {index}"
+
+
+def summary(rng: random.Random) -> dict:
+    return {
+        "facts": " ".join(sentence(rng, 14) for _ in range(3)),
+        "legal_issues": " ".join(sentence(rng, 12) for _ in range(2)),
+        "judgment": " ".join(sentence(rng, 12) for _ in range(2)),
+        "ratio_decidendi": " ".join(sentence(rng, 16) for _ in range(2)),
+        "key_principles": [sentence(rng, 5) for _ in range(3)],
+    }
+
+
+def raw_case(index: int, rng: random.Random, full_text_words: int = 400) -> dict:
+    """An input record in the format scripts/ingest_cases.py reads."""
+    year = rng.randint(1950, 2024)
+    return {
+        "case_name": f"{rng.choice(VOCABULARY).title()} v. {rng.choice(VOCABULARY).title()} ({index})",
+        "citation": citation(index, year),
+        "year": year,
+        "bench": rng.choice(BENCHES),
+        "full_text": sentence(rng, full_text_words),
+        "source_url": f"https://example.com/bench/{index}",
+    }
+
+
+def unit_vectors(count: int, dimension: int, seed: int):
+    """`count` random unit vectors (a numpy array, or a list of lists without numpy)."""
+    if np is not None:
+        vectors = np.random.default_rng(seed).standard_normal((count, dimension), dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        v = [rng.gauss(0.0, 1.0) for _ in range(dimension)]
+        norm = math.sqrt(sum(x * x for x in v)) or 1.0
+        result.append([x / norm for x in v])
+    return result
+
+
+def text_vector(text: str, dimension: int) -> list[float]:
+    """Deterministic unit vector for a text, so repeated embeddings agree."""
+    rng = random.Random(text)
+    v = [rng.gauss(0.0, 1.0) for _ in range(dimension)]
+    norm = math.sqrt(sum(x * x for x in v)) or 1.0
+    return [x / norm for x in v]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Ollama HTTP API with configurable latency, for benchmarks.
+Usage: python -m bench.fake_ollama [--port 11434] [--embed-latency 0.02]
+                                   [--generate-latency 1.0] [--jitter 0.2] [--parallel 4]
+
+Implements /api/embeddings, /api/embed, /api/generate, /api/tags and /api/ps.
+Embeddings are deterministic unit vectors derived from the input text, and
+generate returns a well-formed case summary, topic list or (for a schema
+with "topics") both, so ingestion runs end to end in either extraction mode.
+--parallel caps concurrently served requests like OLLAMA_NUM_PARALLEL;
+queued requests wait, as they would on a busy GPU.
+Batch embedding latency grows by --embed-latency-per-input per text.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, Request
+
+from bench import corpus
+
+
+@dataclass
+class FakeOllamaConfig:
+    embed_latency: float = 0.02
+    embed_latency_per_input: float = 0.002
+    generate_latency: float = 1.0
+    jitter: float = 0.2
+    parallel: int = 4
+    dimension: int = 768
+
+
+config = FakeOllamaConfig()
+app = FastAPI(title="Fake Ollama")
+_slots: asyncio.Semaphore | None = None
+_loaded: set[str] = set()  # models requested so far, reported by /api/ps
+
+
+async def _serve(latency: float) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, config.parallel))
+    async with _slots:
+        await asyncio.sleep(max(0.0, latency * random.uniform(1 - config.jitter, 1 + config.jitter)))
+
+
+@app.post("/api/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    _loaded.add(body.get("model", ""))
+    await _serve(config.embed_latency)
+    return {"embedding": corpus.text_vector(body.get("prompt", ""), config.dimension)}
+
+
+@app.post("/api/embed")
+async def embed(request: Request):
+    body = await request.json()
+    _loaded.add(body.get("model", ""))
+    inputs = body.get("input", [])
+    inputs = [inputs] if isinstance(inputs, str) else inputs
+    await _serve(config.embed_latency + config.embed_latency_per_input * len(inputs))
+    return {
+        "model": body.get("model"),
+        "embeddings": [corpus.text_vector(text, config.dimension) for text in inputs],
+    }
+
+
+@app.post("/api/generate")
+async def generate(request: Request):
+    body = await request.json()
+    _loaded.add(body.get("model", ""))
+    prompt = body.get("prompt", "")
+    await _serve(config.generate_latency)
+    rng = random.Random(prompt)
+    schema = body.get("format")
+    if isinstance(schema, dict) and "topics" in schema.get("properties", {}):
+        response = json.dumps({**corpus.summary(rng), "topics": rng.sample(corpus.TOPICS, rng.randint(3, 5))})
+    elif "topic labels" in prompt:
+        response = json.dumps(rng.sample(corpus.TOPICS, rng.randint(3, 5)))
+    else:
+        response = json.dumps(corpus.summary(rng))
+    return {"model": body.get("model"), "response": response, "done": True}
+
+
+@app.get("/api/tags")
+async def tags():
+    return {"models": [{"name": "fake-embed"}, {"name": "fake-llm"}]}
+
+
+@app.get("/api/ps")
+async def ps():
+    names = sorted(name for name in _loaded if name)
+    return {"models": [{"name": name if ":" in name else f"{name}:latest"} for name in names]}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--embed-latency", type=float, default=config.embed_latency, help="seconds per request")
+    parser.add_argument("--embed-latency-per-input", type=float, default=config.embed_latency_per_input)
+    parser.add_argument("--generate-latency", type=float, default=config.generate_latency)
+    parser.add_argument("--jitter", type=float, default=config.jitter, help="+/- fraction of latency")
+    parser.add_argument("--parallel", type=int, default=config.parallel, help="requests served at once")
+    parser.add_argument("--dimension", type=int, default=config.dimension)
+    return parser.parse_args()
+
+
+def main():
+    import uvicorn
+
+    args = parse_args()
+    config.embed_latency = args.embed_latency
+    config.embed_latency_per_input = args.embed_latency_per_input
+    config.generate_latency = args.generate_latency
+    config.jitter = args.jitter
+    config.parallel = args.parallel
+    config.dimension = args.dimension
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Load a synthetic corpus straight into Postgres for benchmarking.
+Usage: python -m bench.generate_corpus [--cases N] [--seed S] [--batch-size N]
+                                       [--clear] [--rebuild-index] [--with-neighbors]
+
+Typical sizes are 10000, 100000 and 1000000 cases. Each case gets summary
+text from a legal vocabulary, a year in 1950-2024, 1-3 topics and a random
+unit embedding of EMBEDDING_DIMENSION; rows are written with COPY, so no
+Ollama is needed. Synthetic cases have citations starting with "BENCH" and
+--clear removes them (and only them) first.
+
+--rebuild-index drops the HNSW index during the load and rebuilds it after,
+which is much faster for large corpora. --with-neighbors fills the
+precomputed similar-cases table afterwards.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from pgvector.asyncpg import register_vector
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.db.session import async_engine_kwargs
+from app.services.corpus_version import bump_corpus_version
+from app.services.topic_cache import slugify
+from app.services.reembed_service import create_vector_index, drop_vector_index
+from app.services.text_store import compress_text
+from bench import corpus
+
+CASE_COLUMNS = [
+    "id", "case_name", "citation", "year", "bench", "facts", "legal_issues", "judgment",
+    "ratio_decidendi", "key_principles", "embedding", "embedding_model", "source_url", "processed_at",
+    "created_at", "updated_at",
+]
+TEXT_COLUMNS = ["case_id", "codec", "raw_size", "data"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load a synthetic benchmark corpus.")
+    parser.add_argument("--cases", type=int, default=10000, help="e.g. 10000, 100000 or 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per COPY")
+    parser.add_argument("--clear", action="store_true", help="delete previously generated cases first")
+    parser.add_argument("--rebuild-index", action="store_true", help="drop the HNSW index during the load")
+    parser.add_argument("--with-neighbors", action="store_true", help="fill case_neighbors afterwards")
+    return parser.parse_args()
+
+
+async def ensure_topics(conn) -> list[int]:
+    await conn.executemany(
+        "INSERT INTO topics (name, slug) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+        [(name, slugify(name)) for name in corpus.TOPICS],
+    )
+    rows = await conn.fetch(
+        "SELECT id FROM topics WHERE slug = ANY($1::text[])", [slugify(n) for n in corpus.TOPICS]
+    )
+    return [r["id"] for r in rows]
+
+
+def case_rows(first_id: int, count: int, rng: random.Random, vectors, now: datetime):
+    """(cases row, case_texts row) per synthetic case."""
+    model = settings.ollama_embedding_model
+    for offset in range(count):
+        case_id = first_id + offset
+        raw = corpus.raw_case(case_id, rng, full_text_words=200)
+        s = corpus.summary(rng)
+        codec, data = compress_text(raw["full_text"])
+        yield (
+            (
+                case_id, raw["case_name"], raw["citation"], raw["year"], raw["bench"],
+                s["facts"], s["legal_issues"], s["judgment"], s["ratio_decidendi"],
+                json.dumps(s["key_principles"]), vectors[offset], model, raw["source_url"], now, now, now,
+            ),
+            (case_id, codec, len(raw["full_text"].encode("utf-8")), data),
+        )
+
+
+async def main():
+    args = parse_args()
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=2))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(args.seed)
+    started = time.monotonic()
+
+    try:
+        async with async_session() as session:
+            conn = (await (await session.connection()).get_raw_connection()).driver_connection
+            await register_vector(conn)
+            if args.clear:
+                deleted = await conn.execute(
+                    "DELETE FROM cases WHERE citation LIKE $1", f"{corpus.CITATION_PREFIX} %"
+                )
+                print(f"Cleared synthetic cases ({deleted})")
+            if args.rebuild_index:
+                await drop_vector_index(session)
+            topic_ids = await ensure_topics(conn)
+            first_id = (await conn.fetchval("SELECT coalesce(max(id), 0) FROM cases")) + 1
+            await session.commit()
+
+            print(f"Loading {args.cases} cases from id {first_id}...")
+            loaded = 0
+            while loaded < args.cases:
+                count = min(args.batch_size, args.cases - loaded)
+                batch_first = first_id + loaded
+                vectors = corpus.unit_vectors(count, settings.embedding_dimension, args.seed + batch_first)
+                now = datetime.utcnow()
+                rows = list(case_rows(batch_first, count, rng, vectors, now))
+                await conn.copy_records_to_table(
+                    "cases", records=[case for case, _ in rows], columns=CASE_COLUMNS
+                )
+                await conn.copy_records_to_table(
+                    "case_texts", records=[text for _, text in rows], columns=TEXT_COLUMNS
+                )
+                links = [
+                    (batch_first + i, topic_id, "ai_suggested")
+                    for i in range(count)
+                    for topic_id in rng.sample(topic_ids, rng.randint(1, 3))
+                ]
+                await conn.copy_records_to_table(
+                    "case_topics", records=links, columns=["case_id", "topic_id", "source_type"]
+                )
+                await session.commit()
+                loaded += count
+                rate = loaded / max(time.monotonic() - started, 1e-6)
+                print(f"  [{loaded}/{args.cases}] {rate:.0f} cases/s")
+
+            await session.execute(
+                text("SELECT setval(pg_get_serial_sequence('cases', 'id'), (SELECT max(id) FROM cases))")
+            )
+            await bump_corpus_version(session)
+            await session.commit()
+            if args.rebuild_index:
+                print("Rebuilding HNSW index...")
+                await create_vector_index(session)
+                await session.commit()
+            await session.execute(text("ANALYZE cases"))
+            await session.execute(text("ANALYZE case_topics"))
+            await session.commit()
+
+        if args.with_neighbors:
+            from refresh_neighbors import refresh_all  # scripts/refresh_neighbors.py
+
+            print("Filling similar-cases table...")
+            await refresh_all(async_session, batch_size=200, parallel=4)
+    finally:
+        await engine.dispose()
+    print(f"Done in {time.monotonic() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
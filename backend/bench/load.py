@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Latency / throughput scenarios against a running API, plus ingestion throughput.
+Usage: python -m bench.load [--base-url http://localhost:8000] [--scenarios a,b,...]
+                            [--concurrency 16] [--duration 30] [--output FILE]
+
+HTTP scenarios:
+  search_hybrid, search_semantic, search_lexical  /api/search with random queries
+  search_filtered    /api/search with topic and year filters
+  search_repeat      one fixed query (response-cache hit path)
+  cases_page1        /api/cases first page
+  cases_deep_offset  /api/cases?offset=--deep-offset
+  cases_deep_cursor  /api/cases walking X-Next-Cursor page by page
+  similar            /api/cases/{id}/similar for random ids
+The "ingest" scenario runs the ingestion pipeline in-process on --ingest-cases
+synthetic cases (point OLLAMA_BASE_URL at bench.fake_ollama) and reports
+cases/s; its cases use the BENCH citation prefix.
+
+Queries are random so most requests miss the response cache; run the API
+with RESPONSE_CACHE_BACKEND=none to measure the uncached path only.
+The per-IP rate limits (RATE_LIMIT_SEARCH, RATE_LIMIT_DEFAULT) would throttle
+every scenario at this concurrency; `make bench-api` starts the API with them
+raised. 429s are reported as `rate_limited`, separately from `errors`.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import httpx
+
+from bench import corpus
+from bench.report import ScenarioResult, build_report, git_commit, write_report
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+HTTP_SCENARIOS = (
+    "search_hybrid",
+    "search_semantic",
+    "search_lexical",
+    "search_filtered",
+    "search_repeat",
+    "cases_page1",
+    "cases_deep_offset",
+    "cases_deep_cursor",
+    "similar",
+)
+
+
+class Workload:
+    """Builds the next request of each scenario; holds per-user state such as cursors."""
+
+    def __init__(self, rng: random.Random, case_ids: list[int], topic_ids: list[int], deep_offset: int):
+        self.rng = rng
+        self.case_ids = case_ids or [1]
+        self.topic_ids = topic_ids or [1]
+        self.deep_offset = deep_offset
+        self.cursors: dict[int, str | None] = {}
+
+    def request(self, scenario: str, user: int) -> tuple[str, dict]:
+        rng = self.rng
+        if scenario.startswith("search_") and scenario not in ("search_filtered", "search_repeat"):
+            return "/api/search", {"q": corpus.query(rng), "mode": scenario.removeprefix("search_")}
+        if scenario == "search_filtered":
+            year_from = rng.randint(1950, 2015)
+            return "/api/search", {
+                "q": corpus.query(rng),
+                "topic_ids": ",".join(map(str, rng.sample(self.topic_ids, min(2, len(self.topic_ids))))),
+                "year_from": year_from,
+                "year_to": year_from + rng.randint(1, 10),
+            }
+        if scenario == "search_repeat":
+            return "/api/search", {"q": "fundamental right to privacy"}
+        if scenario == "cases_page1":
+            return "/api/cases", {"limit": 20}
+        if scenario == "cases_deep_offset":
+            return "/api/cases", {"limit": 20, "offset": self.deep_offset}
+        if scenario == "cases_deep_cursor":
+            cursor = self.cursors.get(user)
+            return "/api/cases", {"limit": 20, **({"cursor": cursor} if cursor else {})}
+        if scenario == "similar":
+            return f"/api/cases/{rng.choice(self.case_ids)}/similar", {"limit": 5}
+        raise ValueError(f"Unknown scenario {scenario}")
+
+    def observe(self, scenario: str, user: int, response: httpx.Response) -> None:
+        if scenario == "cases_deep_cursor":
+            self.cursors[user] = response.headers.get("x-next-cursor")
+
+
+async def discover(client: httpx.AsyncClient, pages: int = 10) -> tuple[list[int], list[int]]:
+    """Sample case ids (via cursor paging) and topic ids from the API."""
+    case_ids, cursor = [], None
+    for _ in range(pages):
+        resp = await client.get("/api/cases", params={"limit": 100, **({"cursor": cursor} if cursor else {})})
+        resp.raise_for_status()
+        case_ids += [c["id"] for c in resp.json()]
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    topics = await client.get("/api/topics")
+    topics.raise_for_status()
+    return case_ids, [t["id"] for t in topics.json()]
+
+
+async def run_http_scenario(
+    client: httpx.AsyncClient, workload: Workload, scenario: str, concurrency: int, duration: float
+) -> ScenarioResult:
+    result = ScenarioResult(scenario)
+    deadline = time.perf_counter() + duration
+
+    async def user(n: int):
+        while time.perf_counter() < deadline:
+            path, params = workload.request(scenario, n)
+            started = time.perf_counter()
+            try:
+                resp = await client.get(path, params=params)
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            if resp.status_code == 429:
+                result.rate_limited += 1
+                continue
+            if resp.status_code >= 400:
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            workload.observe(scenario, n, resp)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_ingest(count: int, workers: int, embed_batch_size: int, seed: int) -> ScenarioResult:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.config import settings
+    from app.db.session import async_engine_kwargs
+    from app.services.embedding_batcher import EmbeddingBatcher
+    from app.services.ollama_client import ollama_client
+    from ingest_cases import ingest  # scripts/ingest_cases.py
+
+    rng = random.Random(seed)
+    start_index = 10_000_000 + seed * count  # distinct citations per seed, away from generated corpora
+    cases = [corpus.raw_case(start_index + i, rng) for i in range(count)]
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=workers))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    batcher = EmbeddingBatcher(batch_size=embed_batch_size) if embed_batch_size > 1 else None
+    ollama_client.limit_concurrency(workers)
+
+    result = ScenarioResult("ingest")
+    started = time.perf_counter()
+    try:
+        stats = await ingest(cases, async_session, workers, force=True, embed=batcher.embed if batcher else None)
+    finally:
+        if batcher:
+            await batcher.aclose()
+        await engine.dispose()
+        await ollama_client.aclose()
+    result.elapsed = time.perf_counter() - started
+    result.items = stats.processed
+    result.errors = len(stats.failures)
+    # Per-case latency is not observable from outside the pool; report the mean.
+    if stats.processed:
+        result.latencies = [result.elapsed * workers / stats.processed] * stats.processed
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run API and ingestion benchmarks.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-key", default="")
+    parser.add_argument("--scenarios", default=",".join(HTTP_SCENARIOS), help="comma-separated, or 'all'")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users per HTTP scenario")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per HTTP scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unrecorded seconds before each scenario")
+    parser.add_argument("--deep-offset", type=int, default=5000)
+    parser.add_argument("--ingest-cases", type=int, default=200)
+    parser.add_argument("--ingest-workers", type=int, default=8)
+    parser.add_argument("--embed-batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="default: bench/results/<git commit>.json")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    names = list(HTTP_SCENARIOS) + ["ingest"] if args.scenarios == "all" else args.scenarios.split(",")
+    unknown = set(names) - set(HTTP_SCENARIOS) - {"ingest"}
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results: list[ScenarioResult] = []
+    http_names = [n for n in names if n in HTTP_SCENARIOS]
+    if http_names:
+        headers = {"X-API-Key": args.api_key} if args.api_key else {}
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=args.base_url, headers=headers, limits=limits, timeout=60.0
+        ) as client:
+            case_ids, topic_ids = await discover(client)
+            workload = Workload(random.Random(args.seed), case_ids, topic_ids, args.deep_offset)
+            for name in http_names:
+                if args.warmup:
+                    await run_http_scenario(client, workload, name, args.concurrency, args.warmup)
+                result = await run_http_scenario(client, workload, name, args.concurrency, args.duration)
+                summary = result.summary()
+                print(
+                    f"{name:<20} {summary['throughput_per_s']:>8.1f} req/s  "
+                    f"p50 {summary['latency_ms']['p50']:>7.1f} ms  p99 {summary['latency_ms']['p99']:>7.1f} ms  "
+                    f"errors {summary['errors']}  429s {summary['rate_limited']}"
+                )
+                results.append(result)
+
+    if "ingest" in names:
+        result = await run_ingest(args.ingest_cases, args.ingest_workers, args.embed_batch_size, args.seed)
+        print(f"{'ingest':<20} {result.summary()['throughput_per_s']:>8.1f} cases/s  errors {result.errors}")
+        results.append(result)
+
+    output = args.output or RESULTS_DIR / f"{git_commit() or 'local'}.json"
+    params = {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items() if k != "api_key"}
+    write_report(build_report(results, params), output)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""Machine-readable benchmark reports and regression comparison."""
+import json
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: list[float] = field(default_factory=list)  # seconds, successful requests only
+    errors: int = 0
+    rate_limited: int = 0  # 429 responses, kept out of `errors` so throttling isn't mistaken for failures
+    elapsed: float = 0.0
+    items: int = 0  # work units for throughput when not 1 per request (e.g. cases ingested)
+
+    def summary(self) -> dict:
+        values = sorted(self.latencies)
+        done = self.items or len(values)
+        return {
+            "requests": len(values) + self.errors + self.rate_limited,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_per_s": round(done / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "mean": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+                **{f"p{p}": round(percentile(values, p) * 1000, 2) for p in (50, 90, 95, 99)},
+                "max": round(values[-1] * 1000, 2) if values else 0.0,
+            },
+        }
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(results: list[ScenarioResult], params: dict) -> dict:
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "params": params,
+        },
+        "scenarios": {r.name: r.summary() for r in results},
+    }
+
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def compare(baseline: dict, candidate: dict, threshold: float = 0.10) -> list[dict]:
+    """Per-scenario deltas of p95 latency and throughput; `regressed` when worse than `threshold`."""
+    rows = []
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        old_p95, new_p95 = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        old_tput, new_tput = old["throughput_per_s"], new["throughput_per_s"]
+        p95_change = (new_p95 - old_p95) / old_p95 if old_p95 else 0.0
+        tput_change = (new_tput - old_tput) / old_tput if old_tput else 0.0
+        rows.append(
+            {
+                "scenario": name,
+                "p95_ms": (old_p95, new_p95),
+                "p95_change": round(p95_change, 4),
+                "throughput": (old_tput, new_tput),
+                "throughput_change": round(tput_change, 4),
+                "regressed": p95_change > threshold or tput_change < -threshold,
+            }
+        )
+    return rows
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-request CPU cost of building and serializing API responses.
+Usage: python -m bench.serialization [--rows N] [--iterations N] [--json PATH]
+
+Compares, for a search page, a browse page and a case detail, the previous
+path (a Pydantic model per row, then jsonable_encoder and json.dumps) with
+the fast path the routes use now (plain dicts from the row tuples, dumped by
+orjson). Needs no database; rows are synthetic. Reports microseconds per
+response (best of 5 runs) and the speed-up.
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.serializers import case_detail, case_summary, dumps, search_result
+from app.schemas import CaseDetailResponse, CaseResponse, CaseSearchResult
+from bench import corpus
+
+
+def summary_rows(count: int, rng: random.Random) -> list:
+    rows = []
+    for index in range(count):
+        raw = corpus.raw_case(index, rng, full_text_words=0)
+        rows.append(
+            (
+                SimpleNamespace(
+                    id=index + 1,
+                    case_name=raw["case_name"],
+                    citation=raw["citation"],
+                    year=raw["year"],
+                    bench=raw["bench"],
+                    snippet=corpus.sentence(rng, 40),
+                ),
+                rng.random(),
+            )
+        )
+    return rows
+
+
+def detail_row(rng: random.Random):
+    raw = corpus.raw_case(1, rng, full_text_words=0)
+    fields = {k: raw[k] for k in ("case_name", "citation", "year", "bench", "source_url")}
+    return SimpleNamespace(id=1, **fields, **corpus.summary(rng))
+
+
+def _legacy_summary(c, sim=None) -> CaseResponse:
+    return CaseResponse(
+        id=c.id, case_name=c.case_name, citation=c.citation, year=c.year, bench=c.bench, snippet=c.snippet,
+        similarity=sim,
+    )
+
+
+def _legacy_dumps(content) -> bytes:
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+
+def scenarios(rows: list, case) -> dict:
+    """name -> (previous path, fast path); each returns the response body."""
+    return {
+        "search": (
+            lambda: _legacy_dumps([CaseSearchResult(case=_legacy_summary(c, s), similarity=s) for c, s in rows]),
+            lambda: dumps([search_result(c, s) for c, s in rows]),
+        ),
+        "browse": (
+            lambda: _legacy_dumps([_legacy_summary(c) for c, _ in rows]),
+            lambda: dumps([case_summary(c) for c, _ in rows]),
+        ),
+        "detail": (
+            lambda: _legacy_dumps(CaseDetailResponse(**case_detail(case))),
+            lambda: dumps(case_detail(case)),
+        ),
+    }
+
+
+def measure(fn, iterations: int) -> float:
+    """Best-of-5 microseconds per call."""
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization.")
+    parser.add_argument("--rows", type=int, default=100, help="rows per search/browse page")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--json", type=Path, default=None, help="also write the results here")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    results = {}
+    print(f"{'response':<10} {'previous us':>12} {'fast us':>10} {'speed-up':>9}")
+    for name, (previous, fast) in scenarios(summary_rows(args.rows, rng), detail_row(rng)).items():
+        assert json.loads(previous()) == json.loads(fast()), f"{name}: bodies differ"
+        before, after = measure(previous, args.iterations), measure(fast, args.iterations)
+        results[name] = {"previous_us": round(before, 1), "fast_us": round(after, 1), "speedup": before / after}
+        print(f"{name:<10} {before:>12.1f} {after:>10.1f} {before / after:>8.1f}x")
+    if args.json:
+        args.json.write_text(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
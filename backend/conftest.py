@@ -1,10 +1,12 @@
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.main import app
-from app.db.session import get_db
+from app.db.session import get_db, get_primary_db
 from app.models import Case, Topic
+from app.services.response_cache import response_cache, snapshot_store
 
 
 def _make_case(**overrides) -> MagicMock:
@@ -14,7 +16,6 @@ def _make_case(**overrides) -> MagicMock:
         citation="AIR 2020 SC 100",
         year=2020,
         bench="5 Judge Bench",
-        full_text="Full text of the case.",
         facts="The petitioner challenged the order.",
         legal_issues="Whether the right was violated.",
         judgment="The Court upheld the petition.",
@@ -33,6 +34,20 @@ def _make_case(**overrides) -> MagicMock:
     return m
 
 
+def _make_case_row(**overrides) -> SimpleNamespace:
+    """Slim row as returned by search_cases / get_similar_cases (CASE_SUMMARY_COLUMNS)."""
+    defaults = dict(
+        id=1,
+        case_name="Test Case v. State",
+        citation="AIR 2020 SC 100",
+        year=2020,
+        bench="5 Judge Bench",
+        snippet="Right to equality is fundamental.",
+    )
+    defaults.update(overrides)
+    return SimpleNamespace(**defaults)
+
+
 def _make_topic(**overrides) -> MagicMock:
     defaults = dict(id=1, name="Constitutional Law", slug="constitutional-law")
     defaults.update(overrides)
@@ -42,11 +57,27 @@ def _make_topic(**overrides) -> MagicMock:
     return m
 
 
+@pytest.fixture(autouse=True)
+async def _isolated_response_cache():
+    """Start every test with empty response and snapshot caches and a fixed corpus version."""
+    await response_cache.clear()
+    await snapshot_store.clear()
+    with patch("app.api.caching.get_corpus_version", new_callable=AsyncMock, return_value=1):
+        yield
+    await response_cache.clear()
+    await snapshot_store.clear()
+
+
 @pytest.fixture
 def sample_case():
     return _make_case()
 
 
+@pytest.fixture
+def sample_case_row():
+    return _make_case_row()
+
+
 @pytest.fixture
 def sample_topic():
     return _make_topic()
@@ -65,6 +96,7 @@ def client(mock_db):
         yield mock_db
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_primary_db] = _override_get_db
     transport = ASGITransport(app=app)
     c = AsyncClient(transport=transport, base_url="http://test")
     yield c
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build the HNSW index for a VECTOR_QUANTIZATION mode without blocking writes.
+Usage: python scripts/build_vector_index.py [--quantization none|halfvec|binary]
+                                            [--maintenance-work-mem SIZE] [--drop-unused]
+                                            [--status]
+
+The index is built with CREATE INDEX CONCURRENTLY, so the API and ingestion
+keep running meanwhile. A concurrent build that fails leaves an INVALID
+index behind; it is dropped and rebuilt on the next run.
+
+Switching an existing deployment to a quantized index:
+  1. build it:            python scripts/build_vector_index.py --quantization halfvec
+  2. check recall:        python scripts/compare_recall.py --modes halfvec --factors 2,4,8
+  3. set VECTOR_QUANTIZATION (and VECTOR_RERANK_FACTOR) and roll out the backend
+  4. reclaim the space:   python scripts/build_vector_index.py --quantization halfvec --drop-unused
+
+--status lists the vector indexes present, with their size and validity.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.services.vector_index import VECTOR_INDEXES, index_ddl
+
+INDEX_STATUS_SQL = text(
+    "SELECT c.relname AS name, i.indisvalid AS valid, pg_size_pretty(pg_relation_size(c.oid)) AS size "
+    "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE i.indrelid = 'cases'::regclass AND c.relname = ANY(:names) ORDER BY c.relname"
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the HNSW index for a quantization mode.")
+    parser.add_argument(
+        "--quantization",
+        choices=list(VECTOR_INDEXES),
+        default=settings.vector_quantization,
+        help="index to build (default: VECTOR_QUANTIZATION)",
+    )
+    parser.add_argument(
+        "--maintenance-work-mem", default="", help="e.g. 2GB; a build that fits in memory is much faster"
+    )
+    parser.add_argument(
+        "--drop-unused", action="store_true", help="drop the vector indexes of the other modes afterwards"
+    )
+    parser.add_argument("--status", action="store_true", help="only list the vector indexes present")
+    return parser.parse_args()
+
+
+async def index_status(conn) -> list:
+    names = [name for name, _ in VECTOR_INDEXES.values()]
+    result = await conn.execute(INDEX_STATUS_SQL, {"names": names})
+    return list(result.all())
+
+
+async def main():
+    args = parse_args()
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url)
+    try:
+        async with engine.connect() as conn:
+            # CREATE / DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if not args.status:
+                name, _ = VECTOR_INDEXES[args.quantization]
+                if any(row.name == name and not row.valid for row in await index_status(conn)):
+                    print(f"Dropping invalid index {name} left by an interrupted build")
+                    await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                if args.maintenance_work_mem:
+                    await conn.execute(
+                        text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                        {"value": args.maintenance_work_mem},
+                    )
+                print(f"Building {name} ({args.quantization})...")
+                started = time.perf_counter()
+                await conn.execute(text(index_ddl(args.quantization, concurrently=True)))
+                print(f"Built in {time.perf_counter() - started:.1f}s")
+
+                if args.drop_unused:
+                    for mode, (other, _) in VECTOR_INDEXES.items():
+                        if mode != args.quantization:
+                            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {other}"))
+                            print(f"Dropped {other} (if present)")
+
+            for row in await index_status(conn):
+                print(f"  {row.name:<36} {row.size:>10}  {'valid' if row.valid else 'INVALID'}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Measure recall and latency of two-stage (quantized index + exact re-rank) search.
+Usage: python scripts/compare_recall.py [--queries N] [--k K] [--modes none,halfvec,binary]
+                                        [--factors 1,2,4,8] [--json PATH]
+
+Stored case embeddings are used as queries (the case itself excluded). The
+ground truth is an exact scan with index scans disabled; each mode/factor
+pair then fetches k * factor candidates through that mode's HNSW index,
+re-ranks them by full-precision cosine distance and is scored by recall@k
+against the exact top k. Factor 1 is the quantized index on its own.
+
+Build the indexes first (scripts/build_vector_index.py); a mode whose index
+is missing is skipped. Pick the smallest factor whose recall is acceptable
+and set VECTOR_RERANK_FACTOR to it.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.models import Case
+from app.services.vector_index import VECTOR_INDEXES, ann_candidates, widen_ef_search
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare recall of quantized vector search.")
+    parser.add_argument("--queries", type=int, default=100, help="sampled query cases")
+    parser.add_argument("--k", type=int, default=10, help="results per query")
+    parser.add_argument("--modes", default=",".join(VECTOR_INDEXES), help="comma-separated modes")
+    parser.add_argument("--factors", default="1,2,4,8", help="comma-separated re-rank factors")
+    parser.add_argument("--json", default="", help="also write the results to this file")
+    return parser.parse_args()
+
+
+def excluding(case_id: int):
+    return lambda stmt: stmt.where(Case.id != case_id)
+
+
+async def exact_top_k(session: AsyncSession, case_id: int, embedding: list[float], k: int) -> list[int]:
+    await session.execute(select(func.set_config("enable_indexscan", "off", True)))
+    result = await session.execute(
+        select(Case.id)
+        .where(Case.embedding.isnot(None), Case.id != case_id)
+        .order_by(Case.embedding.cosine_distance(embedding), Case.id)
+        .limit(k)
+    )
+    await session.rollback()
+    return list(result.scalars().all())
+
+
+async def two_stage_top_k(
+    session: AsyncSession, case_id: int, embedding: list[float], k: int, mode: str, factor: int
+) -> tuple[list[int], float]:
+    depth = k * factor
+    started = time.perf_counter()
+    await widen_ef_search(session, depth)
+    candidates = ann_candidates(embedding, depth, excluding(case_id), mode)
+    result = await session.execute(
+        select(Case.id)
+        .join(candidates, candidates.c.id == Case.id)
+        .order_by(Case.embedding.cosine_distance(embedding), Case.id)
+        .limit(k)
+    )
+    ids = list(result.scalars().all())
+    elapsed = time.perf_counter() - started
+    await session.rollback()
+    return ids, elapsed
+
+
+async def main():
+    args = parse_args()
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in VECTOR_INDEXES]
+    if unknown:
+        sys.exit(f"Unknown mode(s): {', '.join(unknown)}")
+    factors = sorted({max(1, int(f)) for f in args.factors.split(",") if f.strip()})
+
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url)
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rows = []
+    try:
+        async with async_session() as session:
+            present = set(
+                (
+                    await session.execute(
+                        text("SELECT indexname FROM pg_indexes WHERE tablename = 'cases'")
+                    )
+                ).scalars()
+            )
+            queries = (
+                await session.execute(
+                    select(Case.id, Case.embedding)
+                    .where(Case.embedding.isnot(None))
+                    .order_by(func.random())
+                    .limit(args.queries)
+                )
+            ).all()
+            if not queries:
+                sys.exit("No embedded cases to sample.")
+            for mode in list(modes):
+                if VECTOR_INDEXES[mode][0] not in present:
+                    print(f"Skipping {mode}: index {VECTOR_INDEXES[mode][0]} not built")
+                    modes.remove(mode)
+
+            print(f"Exact top {args.k} for {len(queries)} queries...")
+            truth = {}
+            for case_id, embedding in queries:
+                truth[case_id] = set(await exact_top_k(session, case_id, list(embedding), args.k))
+
+            for mode in modes:
+                for factor in factors:
+                    recalls, latencies = [], []
+                    for case_id, embedding in queries:
+                        ids, elapsed = await two_stage_top_k(
+                            session, case_id, list(embedding), args.k, mode, factor
+                        )
+                        expected = truth[case_id]
+                        recalls.append(len(expected & set(ids)) / len(expected) if expected else 1.0)
+                        latencies.append(elapsed * 1000)
+                    latencies.sort()
+                    rows.append(
+                        {
+                            "mode": mode,
+                            "factor": factor,
+                            "recall": statistics.fmean(recalls),
+                            "p50_ms": latencies[len(latencies) // 2],
+                            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                        }
+                    )
+    finally:
+        await engine.dispose()
+
+    print(f"\n{'mode':<8} {'factor':>6} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in rows:
+        print(
+            f"{row['mode']:<8} {row['factor']:>6} {row['recall']:>10.3f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}"
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps({"k": args.k, "queries": len(queries), "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
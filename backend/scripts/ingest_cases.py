@@ -1,9 +1,29 @@
 #!/usr/bin/env python3
 """
-Ingest Supreme Court cases from a JSON file.
-Usage: python scripts/ingest_cases.py path/to/cases.json
+Ingest Supreme Court cases from a JSON or JSONL file (optionally gzip-compressed).
+Usage: python scripts/ingest_cases.py path/to/cases.json [--workers N] [--ollama-concurrency N]
+                                     [--force | --only-changed] [--checkpoint PATH]
+                                     [--embed-batch-size N] [--enqueue]
 
-JSON format per case:
+The input is parsed incrementally, so memory stays flat however large the
+dump is and processing starts with the first record.
+
+Cases are processed by N concurrent workers, each with its own session and
+transaction. --ollama-concurrency caps in-flight Ollama requests (defaults to
+the worker count).
+
+By default (--only-changed) cases whose stored content fingerprint matches
+the input are skipped; --force reprocesses everything. With --checkpoint,
+finished cases are recorded in PATH and skipped when the run is restarted.
+
+Embedding requests from concurrent workers are coalesced into batches of up
+to --embed-batch-size texts sent to Ollama's /api/embed (1 disables batching).
+
+--enqueue only queues the cases as one batch for scripts/ingest_worker.py
+(check progress with GET /api/ingest/batches/{id}) instead of processing them.
+
+Input is a JSON array of cases, a single case object, or one case per line
+(.jsonl / .ndjson). Format per case:
 {
   "case_name": "...",
   "citation": "...",
@@ -13,54 +33,204 @@ JSON format per case:
   "source_url": "..."
 }
 """
+import argparse
 import asyncio
-import json
 import sys
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable
 from pathlib import Path
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.config import settings
-from app.services.ingestion_service import process_case
+from app.db.session import async_engine_kwargs
+from app.services.case_reader import iter_cases
+from app.services.corpus_version import bump_corpus_version
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.ingestion_checkpoint import IngestCheckpoint
+from app.services.ingestion_service import case_fingerprint, process_case
+from app.services.job_queue import enqueue_batch
+from app.services.ollama_client import ollama_client
 
 
-async def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/ingest_cases.py <path/to/cases.json>")
-        sys.exit(1)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest Supreme Court cases from a JSON file.")
+    parser.add_argument("path", type=Path, help="path/to/cases.json[l][.gz]")
+    parser.add_argument("--workers", type=int, default=4, help="cases processed concurrently")
+    parser.add_argument(
+        "--ollama-concurrency",
+        type=int,
+        default=None,
+        help="max in-flight Ollama requests (default: --workers)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--force", action="store_true", help="reprocess every case")
+    mode.add_argument(
+        "--only-changed",
+        action="store_true",
+        help="skip cases whose content fingerprint is unchanged (default)",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, default=None, help="file recording finished cases for resuming"
+    )
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=settings.ollama_embed_batch_size,
+        help="texts per batched embedding request (1 = one request per case)",
+    )
+    parser.add_argument(
+        "--enqueue", action="store_true", help="queue the cases for ingestion workers and exit"
+    )
+    return parser.parse_args()
 
-    path = Path(sys.argv[1])
-    if not path.exists():
-        print(f"File not found: {path}")
-        sys.exit(1)
 
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
+@dataclass
+class IngestStats:
+    seen: int = 0
+    processed: int = 0
+    skipped: int = 0
+    failures: list[tuple[str, str]] = field(default_factory=list)
 
-    cases = data if isinstance(data, list) else [data]
 
-    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(db_url, echo=False)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async def ingest(
+    cases: Iterable[dict],
+    async_session,
+    workers: int,
+    force: bool = False,
+    checkpoint: IngestCheckpoint | None = None,
+    embed=None,
+) -> IngestStats:
+    """Run cases through process_case with a bounded worker pool.
 
-    print(f"Ingesting {len(cases)} cases...")
-    async with async_session() as session:
-        for i, raw in enumerate(cases):
+    `cases` is consumed lazily (in a thread, since it may read from disk) and
+    the queue is bounded, so only a few records are held in memory at once.
+    The corpus version is bumped once at the end if any case changed.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    stats = IngestStats()
+
+    async def worker():
+        while True:
+            raw = await queue.get()
+            if raw is None:
+                queue.task_done()
+                return
+            name = "?"
             try:
-                case = await process_case(session, raw)
-                await session.commit()
-                print(f"  [{i+1}/{len(cases)}] {case.case_name} ({case.citation})")
+                # Everything that reads the record stays in here: a malformed one
+                # must be counted as a failure, not kill the worker and leave the
+                # producer blocked on a full queue.
+                name = raw.get("case_name", "?")
+                citation = raw.get("citation", "")
+                fingerprint = case_fingerprint(raw)
+                if not force and checkpoint and checkpoint.is_done(citation, fingerprint):
+                    case = None
+                else:
+                    async with async_session() as session:
+                        case = await process_case(session, raw, force=force, embed=embed)
+                        await session.commit()
+                stats.seen += 1
+                if case is None:
+                    stats.skipped += 1
+                    print(f"  [{stats.seen}] SKIPPED (unchanged): {name} ({citation})")
+                else:
+                    stats.processed += 1
+                    print(f"  [{stats.seen}] {case.case_name} ({case.citation})")
+                if checkpoint:
+                    checkpoint.mark_done(citation, fingerprint)
             except Exception as e:
-                await session.rollback()
-                print(f"  [{i+1}/{len(cases)}] ERROR: {raw.get('case_name', '?')} - {e}")
+                stats.seen += 1
+                stats.failures.append((name, str(e)))
+                print(f"  [{stats.seen}] ERROR: {name} - {e}")
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    records = iter(cases)
+    try:
+        while (raw := await asyncio.to_thread(next, records, None)) is not None:
+            await queue.put(raw)
+    finally:
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+        if stats.processed:
+            async with async_session() as session:
+                await bump_corpus_version(session)
+                await session.commit()
+    return stats
+
+
+async def enqueue(
+    cases: Iterable[dict], async_session, force: bool = False, chunk: int = 1000
+) -> tuple[str | None, int]:
+    """Queue every case under a single batch id, committing `chunk` jobs at a time."""
+    batch_id, queued = None, 0
+    records = iter(cases)
+    while chunk_cases := await asyncio.to_thread(lambda: list(islice(records, chunk))):
+        async with async_session() as session:
+            batch_id, n = await enqueue_batch(session, chunk_cases, force=force, batch_id=batch_id)
+            await session.commit()
+        queued += n
+        print(f"  queued {queued} cases")
+    return batch_id, queued
+
+
+async def main():
+    args = parse_args()
+    if not args.path.exists():
+        print(f"File not found: {args.path}")
+        sys.exit(1)
+    workers = max(1, args.workers)
+
+    ollama_client.limit_concurrency(args.ollama_concurrency or workers)
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=workers))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    if args.enqueue:
+        try:
+            batch_id, queued = await enqueue(iter_cases(args.path), async_session, force=args.force)
+        finally:
+            await engine.dispose()
+        print(f"Queued {queued} cases as batch {batch_id}.")
+        return
+
+    checkpoint = IngestCheckpoint(args.checkpoint) if args.checkpoint else None
+    if checkpoint:
+        print(f"Resuming from checkpoint {args.checkpoint} ({len(checkpoint)} cases done)")
+
+    batcher = EmbeddingBatcher(batch_size=args.embed_batch_size) if args.embed_batch_size > 1 else None
 
-    await engine.dispose()
-    print("Done.")
+    print(f"Ingesting {args.path} with {workers} workers...")
+    try:
+        stats = await ingest(
+            iter_cases(args.path),
+            async_session,
+            workers,
+            force=args.force,
+            checkpoint=checkpoint,
+            embed=batcher.embed if batcher else None,
+        )
+    finally:
+        if batcher:
+            await batcher.aclose()
+        if checkpoint:
+            checkpoint.close()
+        await engine.dispose()
+        await ollama_client.aclose()
+    print(
+        f"Done. {stats.processed} processed, {stats.skipped} skipped, "
+        f"{len(stats.failures)} failed."
+    )
+    for name, error in stats.failures:
+        print(f"  FAILED: {name} - {error}")
 
 
 if __name__ == "__main__":
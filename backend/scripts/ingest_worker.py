@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Ingestion worker: runs queued ingestion jobs until stopped.
+Usage: python scripts/ingest_worker.py [--concurrency N] [--poll-interval S]
+                                       [--embed-batch-size N] [--metrics-port P]
+                                       [--exit-when-empty]
+
+Jobs are queued with POST /api/ingest/batches or `ingest_cases.py --enqueue`.
+Run as many workers, on as many machines, as Ollama can keep busy: each
+claims jobs with FOR UPDATE SKIP LOCKED, so no job is handed out twice.
+A failed job is retried with exponential backoff and dead-lettered after
+INGEST_JOB_MAX_ATTEMPTS; a job whose worker dies is reclaimed when its lease
+(INGEST_JOB_LEASE_SECONDS) expires.
+
+SIGTERM/SIGINT stop claiming new jobs and let in-flight ones finish.
+--exit-when-empty drains the queue and exits (e.g. as a one-off k8s Job).
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.db.session import async_engine_kwargs
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.job_queue import claim_jobs, run_job
+from app.services.ollama_client import ollama_client
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run queued ingestion jobs.")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.ingest_worker_concurrency, help="jobs run at once"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.ingest_worker_poll_seconds,
+        help="seconds to wait when the queue is empty",
+    )
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=settings.ollama_embed_batch_size,
+        help="texts per batched embedding request (1 = one request per case)",
+    )
+    parser.add_argument("--metrics-port", type=int, default=0, help="serve Prometheus metrics (0 = off)")
+    parser.add_argument("--exit-when-empty", action="store_true", help="exit once no job is runnable")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    return parser.parse_args()
+
+
+async def work(
+    async_session,
+    worker_id: str,
+    concurrency: int,
+    poll_interval: float,
+    stop: asyncio.Event,
+    exit_when_empty: bool = False,
+    embed=None,
+) -> dict[str, int]:
+    """Run `concurrency` claim-and-process loops until `stop` is set; returns counts per outcome."""
+    outcomes: dict[str, int] = {}
+
+    async def slot():
+        while not stop.is_set():
+            async with async_session() as session:
+                jobs = await claim_jobs(session, worker_id, limit=1)
+                await session.commit()
+            if not jobs:
+                if exit_when_empty:
+                    return
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            job = jobs[0]
+            status = await run_job(async_session, job, worker_id, embed=embed)
+            outcomes[status] = outcomes.get(status, 0) + 1
+            print(f"  [{worker_id}] job {job.id} {status}: {job.citation}")
+
+    await asyncio.gather(*(slot() for _ in range(concurrency)))
+    return outcomes
+
+
+async def main():
+    args = parse_args()
+    concurrency = max(1, args.concurrency)
+    if args.metrics_port:
+        from prometheus_client import start_http_server
+
+        start_http_server(args.metrics_port)
+
+    ollama_client.limit_concurrency(concurrency)
+    await ollama_client.start()
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=concurrency + 1))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    batcher = EmbeddingBatcher(batch_size=args.embed_batch_size) if args.embed_batch_size > 1 else None
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Worker {args.worker_id} running {concurrency} jobs at a time...")
+    try:
+        outcomes = await work(
+            async_session,
+            args.worker_id,
+            concurrency,
+            args.poll_interval,
+            stop,
+            exit_when_empty=args.exit_when_empty,
+            embed=batcher.embed if batcher else None,
+        )
+    finally:
+        if batcher:
+            await batcher.aclose()
+        await engine.dispose()
+        await ollama_client.aclose()
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(outcomes.items())) or "no jobs"
+    print(f"Worker {args.worker_id} stopped: {summary}.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Re-embed stored cases without re-running LLM summarisation.
+Usage: python scripts/reembed_cases.py [--batch-size N] [--parallel N] [--all]
+                                       [--start-after-id ID] [--rebuild-index]
+                                       [--skip-neighbors]
+
+Embeddings are rebuilt from the stored facts / legal_issues / judgment /
+ratio_decidendi / key_principles with the current OLLAMA_EMBEDDING_MODEL.
+Cases are read through a server-side cursor in batches, embedded with the
+batch /api/embed endpoint (--parallel batches in flight) and written back
+with one bulk UPDATE per batch.
+
+The run is resumable: each case is tagged with the model that embedded it,
+so a restarted run only picks up cases that are still missing or stale.
+With --all (re-embed everything, even cases already on this model), use the
+--start-after-id printed in the progress output to resume.
+
+If EMBEDDING_DIMENSION differs from the cases.embedding column, the column
+is resized (clearing old vectors) before re-embedding, and the HNSW index is
+rebuilt at the end. --rebuild-index does the same without a resize: it drops
+the index for the duration of the run and rebuilds it at the end, which is
+much faster than maintaining it row by row for a full re-embed.
+
+Once every embedding is written, the precomputed similar-cases table is
+brought up to date: incrementally for the re-embedded cases, or rebuilt in
+full when the whole corpus moved to a new model (--all or a resize).
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.db.session import async_engine_kwargs
+from app.models import Case
+from app.services.corpus_version import bump_corpus_version
+from app.services.neighbor_service import refresh_all, update_neighbors
+from app.services.ollama_client import ollama_client
+from app.services.reembed_service import (
+    count_cases_to_reembed,
+    create_vector_index,
+    drop_vector_index,
+    embedding_column_dimension,
+    embedding_text,
+    resize_embedding_column,
+    stream_cases_to_reembed,
+    write_embeddings,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-embed stored cases in bulk.")
+    parser.add_argument("--batch-size", type=int, default=256, help="cases per cursor batch / UPDATE")
+    parser.add_argument("--parallel", type=int, default=4, help="batches embedded concurrently")
+    parser.add_argument(
+        "--embed-batch-size",
+        type=int,
+        default=settings.ollama_embed_batch_size,
+        help="texts per /api/embed request",
+    )
+    parser.add_argument("--all", action="store_true", help="also re-embed cases already on this model")
+    parser.add_argument("--start-after-id", type=int, default=0, help="skip cases with id <= ID")
+    parser.add_argument(
+        "--rebuild-index", action="store_true", help="drop the HNSW index during the run and rebuild it"
+    )
+    parser.add_argument(
+        "--skip-neighbors", action="store_true", help="do not refresh the similar-cases table"
+    )
+    return parser.parse_args()
+
+
+class Watermark:
+    """Highest id below which every batch has been written, for --start-after-id."""
+
+    def __init__(self, start: int):
+        self.value = start
+        self._pending: dict[int, int] = {}
+        self._next = 0
+
+    def complete(self, seq: int, last_id: int) -> None:
+        self._pending[seq] = last_id
+        while self._next in self._pending:
+            self.value = self._pending.pop(self._next)
+            self._next += 1
+
+
+async def update_neighbors_for(async_session, case_ids: list[int], parallel: int) -> None:
+    slots = asyncio.Semaphore(parallel)
+
+    async def update_one(case_id: int):
+        async with slots:
+            try:
+                async with async_session() as session:
+                    embedding = await session.scalar(select(Case.embedding).where(Case.id == case_id))
+                    if embedding is not None:
+                        await update_neighbors(session, case_id, list(embedding))
+                        await session.commit()
+            except Exception as e:
+                print(f"  ERROR: neighbours of case {case_id} - {e}")
+
+    await asyncio.gather(*(update_one(case_id) for case_id in case_ids))
+
+
+async def main():
+    args = parse_args()
+    model = ollama_client.embedding_model
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=args.parallel + 1))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    ollama_client.limit_concurrency(args.parallel)
+
+    resized = False
+    rebuild_index = args.rebuild_index
+    async with async_session() as session:
+        current_dim = await embedding_column_dimension(session)
+        if current_dim and current_dim != settings.embedding_dimension:
+            # Every case is re-embedded, so build the new index once at the end.
+            resized = rebuild_index = True
+            print(f"Resizing cases.embedding from vector({current_dim}) to vector({settings.embedding_dimension})")
+            await resize_embedding_column(session, settings.embedding_dimension, create_index=False)
+        elif rebuild_index:
+            print("Dropping HNSW index for the duration of the run")
+            await drop_vector_index(session)
+        await session.commit()
+        total = await count_cases_to_reembed(session, model, args.all, args.start_after_id)
+
+    print(f"Re-embedding {total} cases with {model}...")
+    done = 0
+    failed = 0
+    started = time.monotonic()
+    watermark = Watermark(args.start_after_id)
+    reembedded: list[int] = []
+    slots = asyncio.Semaphore(args.parallel)
+    tasks: set[asyncio.Task] = set()
+
+    async def embed_batch(seq: int, rows):
+        nonlocal done, failed
+        try:
+            embeddings = await ollama_client.embed_many(
+                [embedding_text(r) for r in rows], args.embed_batch_size
+            )
+            async with async_session() as session:
+                await write_embeddings(session, [(r.id, e) for r, e in zip(rows, embeddings)], model)
+                await session.commit()
+            done += len(rows)
+            reembedded.extend(r.id for r in rows)
+            watermark.complete(seq, rows[-1].id)
+            rate = done / max(time.monotonic() - started, 1e-6)
+            print(
+                f"  [{done}/{total}] {rate:.1f} cases/s "
+                f"(resume with --start-after-id {watermark.value})"
+            )
+        except Exception as e:
+            failed += len(rows)
+            print(f"  ERROR: batch of ids {rows[0].id}..{rows[-1].id} - {e}")
+        finally:
+            slots.release()
+
+    try:
+        try:
+            async with async_session() as reader:
+                seq = 0
+                async for rows in stream_cases_to_reembed(
+                    reader, model, args.batch_size, args.all, args.start_after_id
+                ):
+                    await slots.acquire()
+                    task = asyncio.create_task(embed_batch(seq, rows))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    seq += 1
+                if tasks:
+                    await asyncio.gather(*tasks)
+        finally:
+            # Even an interrupted run must not leave cases.embedding without an index.
+            if rebuild_index:
+                print("Rebuilding HNSW index...")
+                async with async_session() as session:
+                    await create_vector_index(session)
+                    await session.commit()
+
+        if reembedded and not args.skip_neighbors:
+            if args.all or resized:
+                print("Rebuilding similar-cases table...")
+                await refresh_all(async_session, args.batch_size, args.parallel, report=print)
+            else:
+                print(f"Updating similar cases for {len(reembedded)} re-embedded cases...")
+                await update_neighbors_for(async_session, reembedded, args.parallel)
+    finally:
+        if done or resized:
+            # Once per run, after neighbours too, so cached /similar responses are refreshed as well.
+            async with async_session() as session:
+                await bump_corpus_version(session)
+                await session.commit()
+        await engine.dispose()
+        await ollama_client.aclose()
+
+    print(f"Done. {done} re-embedded, {failed} failed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
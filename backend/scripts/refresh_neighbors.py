@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rebuild the precomputed similar-cases table (case_neighbors) for every case.
+Usage: python scripts/refresh_neighbors.py [--batch-size N] [--parallel N]
+
+Ingestion and re-embedding keep the table up to date incrementally; run this
+once after the 005 migration to backfill it, or after changing
+SIMILAR_CASES_PRECOMPUTED. Until a case has a stored list, /cases/{id}/similar
+falls back to an on-the-fly vector search.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.db.session import async_engine_kwargs
+from app.services.neighbor_service import refresh_all
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the case_neighbors table.")
+    parser.add_argument("--batch-size", type=int, default=100, help="cases per transaction")
+    parser.add_argument("--parallel", type=int, default=4, help="batches refreshed concurrently")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    db_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(db_url, **async_engine_kwargs(pool_size=args.parallel + 1))
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"Refreshing top-{settings.similar_cases_precomputed} neighbours for all embedded cases...")
+    try:
+        done, failed = await refresh_all(async_session, args.batch_size, args.parallel, report=print)
+    finally:
+        await engine.dispose()
+    print(f"Done. {done} refreshed, {failed} failed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,7 @@ from httpx import ASGITransport, AsyncClient
 
 from app.main import app
 from app.db.session import get_db
+from app.services.search_service import SearchPage
 
 
 @pytest.fixture
@@ -53,7 +54,7 @@ class TestAuthEnabled:
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
     async def test_valid_header_key(self, mock_search, mock_settings, authed_client):
         mock_settings.api_key = "secret123"
-        mock_search.return_value = []
+        mock_search.return_value = SearchPage([])
         resp = await authed_client.get("/api/search", headers={"X-API-Key": "secret123"})
         assert resp.status_code == 200
 
@@ -61,7 +62,7 @@ class TestAuthEnabled:
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
     async def test_valid_query_key(self, mock_search, mock_settings, authed_client):
         mock_settings.api_key = "secret123"
-        mock_search.return_value = []
+        mock_search.return_value = SearchPage([])
         resp = await authed_client.get("/api/search?api_key=secret123")
         assert resp.status_code == 200
 
@@ -0,0 +1,70 @@
+import json
+import random
+from unittest.mock import patch
+
+from httpx import ASGITransport, AsyncClient
+
+from bench import corpus
+from bench import fake_ollama
+from bench import serialization
+from bench.report import ScenarioResult, compare, percentile
+
+
+def _report(p95, throughput):
+    return {"scenarios": {"search": {"latency_ms": {"p95": p95}, "throughput_per_s": throughput}}}
+
+
+class TestReport:
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_summary_uses_items_for_throughput(self):
+        result = ScenarioResult("ingest", latencies=[0.5, 0.5], elapsed=2.0, items=10)
+        assert result.summary()["throughput_per_s"] == 5.0
+
+    def test_summary_counts_rate_limited_apart_from_errors(self):
+        result = ScenarioResult("search", latencies=[0.1], errors=1, rate_limited=3, elapsed=1.0)
+        summary = result.summary()
+        assert summary["requests"] == 5
+        assert (summary["errors"], summary["rate_limited"]) == (1, 3)
+
+    def test_compare_flags_regressions(self):
+        [row] = compare(_report(100, 50), _report(125, 50))
+        assert row["regressed"] and row["p95_change"] == 0.25
+        [row] = compare(_report(100, 50), _report(105, 48))
+        assert not row["regressed"]
+        [row] = compare(_report(100, 50), _report(100, 40))
+        assert row["regressed"]
+
+
+class TestCorpus:
+    def test_raw_case_is_deterministic(self):
+        first = corpus.raw_case(7, random.Random(1))
+        assert first == corpus.raw_case(7, random.Random(1))
+        assert first["citation"].startswith(corpus.CITATION_PREFIX)
+
+
+class TestFakeOllama:
+    async def test_embeddings_are_deterministic(self):
+        config = fake_ollama.FakeOllamaConfig(embed_latency=0, embed_latency_per_input=0, dimension=8)
+        transport = ASGITransport(app=fake_ollama.app)
+        with patch.object(fake_ollama, "config", config):
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                embed = await client.post("/api/embed", json={"model": "m", "input": ["a", "b"]})
+                single = await client.post("/api/embeddings", json={"model": "m", "prompt": "a"})
+                loaded = await client.get("/api/ps")
+        assert [len(v) for v in embed.json()["embeddings"]] == [8, 8]
+        assert single.json()["embedding"] == embed.json()["embeddings"][0]
+        assert {"name": "m:latest"} in loaded.json()["models"]
+
+
+class TestSerializationBench:
+    def test_fast_path_bodies_match_previous_path(self):
+        rng = random.Random(3)
+        for previous, fast in serialization.scenarios(
+            serialization.summary_rows(5, rng), serialization.detail_row(rng)
+        ).values():
+            assert json.loads(previous()) == json.loads(fast())
@@ -0,0 +1,76 @@
+import gzip
+import json
+
+import pytest
+
+from app.services.case_reader import iter_cases
+
+CASES = [
+    {"case_name": "A v. State", "citation": "AIR 1950 SC 1", "year": 1950, "full_text": "x" * 500},
+    {"case_name": "B v. Union", "citation": "AIR 1973 SC 1461", "year": 1973, "full_text": "[{,}]"},
+    {"case_name": "C v. D", "citation": "(2017) 10 SCC 1", "year": 2017, "full_text": ""},
+]
+
+
+class TestIterCases:
+    def test_json_array(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text(json.dumps(CASES, indent=2))
+        assert list(iter_cases(path)) == CASES
+
+    def test_records_spanning_chunks(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text(json.dumps(CASES))
+        assert list(iter_cases(path, chunk_size=7)) == CASES
+
+    def test_single_object(self, tmp_path):
+        path = tmp_path / "case.json"
+        path.write_text(json.dumps(CASES[0]))
+        assert list(iter_cases(path)) == [CASES[0]]
+
+    def test_empty_array(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text(" [ ] ")
+        assert list(iter_cases(path)) == []
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "cases.jsonl"
+        path.write_text("\n".join(json.dumps(c) for c in CASES) + "\n\n")
+        assert list(iter_cases(path)) == CASES
+
+    def test_gzip_jsonl(self, tmp_path):
+        path = tmp_path / "cases.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(c) for c in CASES))
+        assert list(iter_cases(path)) == CASES
+
+    def test_gzip_detected_by_content(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_bytes(gzip.compress(json.dumps(CASES).encode()))
+        assert list(iter_cases(path, chunk_size=16)) == CASES
+
+    def test_is_lazy(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text(json.dumps(CASES[:1])[:-1] + ", {broken")
+        records = iter_cases(path)
+        assert next(records) == CASES[0]
+        with pytest.raises(ValueError):
+            next(records)
+
+    def test_malformed_record_fails_without_reading_to_eof(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text('[{"case_name": "A" "citation": "x"}, ' + json.dumps(CASES * 200)[1:])
+        with pytest.raises(ValueError, match="Malformed JSON at character 19"):
+            next(iter_cases(path, chunk_size=64))
+
+    def test_oversized_record_is_rejected(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text(json.dumps([{"full_text": "x" * 5000}]))
+        with pytest.raises(ValueError, match="exceeds 1000 characters"):
+            list(iter_cases(path, chunk_size=64, max_record_chars=1000))
+
+    def test_non_object_record(self, tmp_path):
+        path = tmp_path / "cases.json"
+        path.write_text("[1, 2]")
+        with pytest.raises(ValueError, match="not a JSON object"):
+            list(iter_cases(path))
@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.db.pool import PoolStats
+from app.db.session import asyncpg_connect_args
+
+
+class TestPoolStats:
+    def test_observe_tracks_total_and_max(self):
+        stats = PoolStats()
+        stats.observe(0.01)
+        stats.observe(0.03)
+        snapshot = stats.snapshot(MagicMock())
+        assert snapshot["checkouts"] == 2
+        assert snapshot["wait_seconds_max"] == 0.03
+        assert snapshot["wait_seconds_avg"] == 0.02
+
+
+class TestConnectArgs:
+    @patch("app.db.session.settings")
+    def test_statement_cache_size(self, mock_settings):
+        mock_settings.db_pgbouncer = False
+        mock_settings.db_statement_cache_size = 500
+        args = asyncpg_connect_args()
+        assert args == {"statement_cache_size": 500, "prepared_statement_cache_size": 500}
+
+    @patch("app.db.session.settings")
+    def test_pgbouncer_disables_caches_and_names_statements_uniquely(self, mock_settings):
+        mock_settings.db_pgbouncer = True
+        args = asyncpg_connect_args()
+        assert args["statement_cache_size"] == 0
+        assert args["prepared_statement_cache_size"] == 0
+        name_func = args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+
+@pytest.fixture
+def health_client_db():
+    session = AsyncMock()
+    maker = MagicMock()
+    maker.return_value.__aenter__.return_value = session
+    with patch("app.main.async_session_maker", maker):
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestHealthDb:
+    async def test_reports_pool_status(self, health_client_db):
+        resp = await health_client_db.get("/health/db")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["status"] == "ok"
+        assert {"in_use", "size", "checkouts", "wait_seconds_max"} <= set(body["pool"])
+
+    async def test_failure_detail_does_not_leak_the_driver_error(self):
+        maker = MagicMock()
+        maker.return_value.__aenter__.side_effect = OSError("connect to db.internal:5432 as app_user failed")
+        with patch("app.main.async_session_maker", maker):
+            client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+            resp = await client.get("/health/db")
+        assert resp.status_code == 503
+        assert resp.json()["detail"] == "database unavailable"
+        assert "db.internal" not in resp.text
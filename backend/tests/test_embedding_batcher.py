@@ -0,0 +1,31 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+def _client(side_effect):
+    client = MagicMock()
+    client.embed_many = AsyncMock(side_effect=side_effect)
+    return client
+
+
+class TestEmbeddingBatcher:
+    async def test_concurrent_calls_share_one_request(self):
+        client = _client(lambda texts, batch_size: [[float(len(t))] for t in texts])
+        batcher = EmbeddingBatcher(client, batch_size=3, max_wait=10)
+        results = await asyncio.gather(*(batcher.embed("x" * n) for n in (1, 2, 3)))
+        assert results == [[1.0], [2.0], [3.0]]
+        client.embed_many.assert_awaited_once()
+
+    async def test_partial_batch_flushes_after_max_wait(self):
+        client = _client(lambda texts, batch_size: [[0.0] for _ in texts])
+        batcher = EmbeddingBatcher(client, batch_size=10, max_wait=0.01)
+        assert await batcher.embed("a") == [0.0]
+        await batcher.aclose()
+
+    async def test_errors_reach_every_caller(self):
+        client = _client(RuntimeError("ollama down"))
+        batcher = EmbeddingBatcher(client, batch_size=2, max_wait=10)
+        results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,99 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.embedding_cache import EmbeddingCache, embed_query, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNormalizeQuery:
+    def test_strips_but_keeps_case_and_inner_spacing(self):
+        # The key is exactly what gets embedded; case and spacing can change the vector.
+        assert normalize_query("  Right   to\tPrivacy \n") == "Right   to\tPrivacy"
+
+
+class TestEmbeddingCache:
+    def test_miss_then_hit(self):
+        cache = EmbeddingCache(max_entries=10)
+        assert cache.get("m", "article 21") is None
+        cache.put("m", "article 21", [0.1, 0.2])
+        assert cache.get("m", " article 21 ") == [0.1, 0.2]
+        assert cache.get("m", "Article 21") is None
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_key_includes_model(self):
+        cache = EmbeddingCache(max_entries=10)
+        cache.put("model-a", "q", [1.0])
+        assert cache.get("model-b", "q") is None
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")
+        cache.put("m", "c", [3.0])
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") == [1.0]
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.put("m", "a", [1.0])
+        clock.now = 4.9
+        assert cache.get("m", "a") == [1.0]
+        clock.now = 5.0
+        assert cache.get("m", "a") is None
+        assert len(cache) == 0
+
+    def test_zero_size_disables(self):
+        cache = EmbeddingCache(max_entries=0)
+        cache.put("m", "a", [1.0])
+        assert cache.get("m", "a") is None
+
+
+class TestEmbedQuery:
+    async def test_repeated_query_skips_client(self):
+        client = MagicMock()
+        client.embedding_model = "nomic-embed-text"
+        client.embed = AsyncMock(return_value=[0.5] * 3)
+        with patch("app.services.embedding_cache.embedding_cache", EmbeddingCache(max_entries=10)):
+            first = await embed_query("Right to Privacy", client=client)
+            second = await embed_query(" Right to Privacy ", client=client)
+        assert first == second == [0.5] * 3
+        client.embed.assert_awaited_once_with("Right to Privacy")
+
+    async def test_spelling_variants_are_embedded_separately(self):
+        client = MagicMock()
+        client.embedding_model = "nomic-embed-text"
+        client.embed = AsyncMock(side_effect=lambda text: [float(len(text))])
+        with patch("app.services.embedding_cache.embedding_cache", EmbeddingCache(max_entries=10)):
+            assert await embed_query("Article 21", client=client) == [10.0]
+            assert await embed_query("article  21", client=client) == [11.0]
+        assert [c.args[0] for c in client.embed.await_args_list] == ["Article 21", "article  21"]
+
+    async def test_concurrent_misses_share_one_embed_call(self):
+        release = asyncio.Event()
+
+        async def slow_embed(text):
+            await release.wait()
+            return [0.25] * 3
+
+        client = MagicMock()
+        client.embedding_model = "nomic-embed-text"
+        client.embed = AsyncMock(side_effect=slow_embed)
+        with patch("app.services.embedding_cache.embedding_cache", EmbeddingCache(max_entries=0)):
+            queries = ("Privacy", " Privacy", "Privacy ")
+            calls = [asyncio.create_task(embed_query(q, client=client)) for q in queries]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*calls)
+        assert results == [[0.25] * 3] * 3
+        client.embed.assert_awaited_once_with("Privacy")
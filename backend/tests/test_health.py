@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
@@ -14,3 +16,13 @@ async def test_health_returns_ok(health_client):
     resp = await health_client.get("/health")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
+
+
+async def test_health_ollama_reports_instances(health_client):
+    down = {"endpoints": [{"url": "http://a", "available": False}], "embed": ["http://a"], "generate": ["http://a"]}
+    with patch("app.main.ollama_client") as client:
+        client.status.return_value = {**down, "endpoints": [{"url": "http://a", "available": True}]}
+        resp = await health_client.get("/health/ollama")
+        assert resp.status_code == 200 and resp.json()["embed"] == ["http://a"]
+        client.status.return_value = down
+        assert (await health_client.get("/health/ollama")).status_code == 503
@@ -1,11 +1,28 @@
 import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.services.ingestion_checkpoint import IngestCheckpoint
+from app.services.topic_cache import slugify
 from app.services.ingestion_service import (
-    slugify,
+    EXTRACTION_SCHEMA,
     _truncate,
     _extract_json_from_response,
     _parse_topic_list,
+    case_fingerprint,
+    process_case,
 )
 
+RAW_CASE = {
+    "case_name": "Test Case v. State",
+    "citation": "AIR 2020 SC 100",
+    "year": 2020,
+    "bench": "5 Judge Bench",
+    "full_text": "Full text of the case.",
+    "source_url": "https://example.com/case/1",
+}
+
 
 class TestSlugify:
     def test_basic(self):
@@ -75,3 +92,130 @@ class TestParseTopicList:
 
     def test_garbage(self):
         assert _parse_topic_list("not json at all") == []
+
+
+class TestCaseFingerprint:
+    def test_stable(self):
+        assert case_fingerprint(RAW_CASE, "llama3") == case_fingerprint(dict(RAW_CASE), "llama3")
+
+    def test_changes_with_text(self):
+        changed = {**RAW_CASE, "full_text": "Amended text."}
+        assert case_fingerprint(RAW_CASE, "llama3") != case_fingerprint(changed, "llama3")
+
+    def test_changes_with_model_and_prompt_version(self):
+        base = case_fingerprint(RAW_CASE, "llama3")
+        assert base != case_fingerprint(RAW_CASE, "mistral")
+        assert base != case_fingerprint(RAW_CASE, "llama3", prompt_version="999")
+
+    def test_changes_with_extraction_mode(self):
+        with patch.object(settings, "ingestion_extraction_mode", "two_call"):
+            two_call = case_fingerprint(RAW_CASE, "llama3")
+        with patch.object(settings, "ingestion_extraction_mode", "combined"):
+            assert case_fingerprint(RAW_CASE, "llama3") != two_call
+
+    def test_ignores_unrelated_fields(self):
+        assert case_fingerprint(RAW_CASE, "llama3") == case_fingerprint({**RAW_CASE, "extra": 1}, "llama3")
+
+
+def _existing(**row):
+    result = MagicMock()
+    result.one_or_none.return_value = SimpleNamespace(**row) if row else None
+    return result
+
+
+class TestProcessCaseSkip:
+    @patch("app.services.ingestion_service.ollama_client")
+    async def test_unchanged_case_is_skipped(self, mock_ollama):
+        mock_ollama.llm_model = "llama3"
+        mock_ollama.embedding_model = "nomic-embed-text"
+        session = AsyncMock()
+        session.execute.return_value = _existing(
+            id=1, content_hash=case_fingerprint(RAW_CASE, "llama3"), embedding_model="nomic-embed-text"
+        )
+        assert await process_case(session, RAW_CASE) is None
+        mock_ollama.generate.assert_not_called()
+        mock_ollama.embed.assert_not_called()
+
+    @patch("app.services.ingestion_service.update_neighbors", new_callable=AsyncMock)
+    @patch("app.services.ingestion_service.ollama_client")
+    async def test_new_embedding_model_only_reembeds(self, mock_ollama, mock_neighbors):
+        mock_ollama.llm_model = "llama3"
+        mock_ollama.embedding_model = "new-embed"
+        mock_ollama.embed = AsyncMock(return_value=[0.2] * 768)
+        stored = MagicMock(
+            facts="f", legal_issues="l", judgment="j", ratio_decidendi="r", key_principles=["p"]
+        )
+        reload = MagicMock()
+        reload.scalar_one.return_value = stored
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _existing(id=1, content_hash=case_fingerprint(RAW_CASE, "llama3"), embedding_model="old-embed"),
+            reload,
+            MagicMock(),
+        ]
+        case = await process_case(session, RAW_CASE)
+        assert case is stored
+        assert stored.embedding == [0.2] * 768
+        assert stored.embedding_model == "new-embed"
+        mock_ollama.generate.assert_not_called()
+        mock_neighbors.assert_awaited_once_with(session, stored.id, [0.2] * 768)
+
+
+SUMMARY = {
+    "facts": "f",
+    "legal_issues": "l",
+    "judgment": "j",
+    "ratio_decidendi": "r",
+    "key_principles": ["p"],
+}
+
+
+def _new_case_session():
+    missing = MagicMock()
+    missing.one_or_none.return_value = None
+    missing.scalar_one_or_none.return_value = None
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.execute.return_value = missing
+    return session
+
+
+@patch("app.services.ingestion_service.update_neighbors", new_callable=AsyncMock)
+@patch("app.services.ingestion_service.topic_cache")
+@patch("app.services.ingestion_service.ollama_client")
+class TestProcessCaseExtraction:
+    async def test_combined_mode_makes_one_structured_call(self, mock_ollama, mock_topic, *_):
+        mock_ollama.generate = AsyncMock(return_value=json.dumps({**SUMMARY, "topics": ["Privacy", " "]}))
+        mock_ollama.embed = AsyncMock(return_value=[0.1] * 768)
+        mock_topic.resolve = AsyncMock(return_value=[5])
+        with patch.object(settings, "ingestion_extraction_mode", "combined"):
+            case = await process_case(_new_case_session(), RAW_CASE)
+        mock_ollama.generate.assert_awaited_once()
+        assert mock_ollama.generate.call_args.kwargs["format"] == EXTRACTION_SCHEMA
+        assert case.ratio_decidendi == "r"
+        assert mock_topic.resolve.call_args.args[1] == ["Privacy"]
+
+    async def test_two_call_mode_asks_for_topics_separately(self, mock_ollama, mock_topic, *_):
+        mock_ollama.generate = AsyncMock(side_effect=[json.dumps(SUMMARY), '["Privacy", "Equality"]'])
+        mock_ollama.embed = AsyncMock(return_value=[0.1] * 768)
+        mock_topic.resolve = AsyncMock(return_value=[5, 6])
+        with patch.object(settings, "ingestion_extraction_mode", "two_call"):
+            case = await process_case(_new_case_session(), RAW_CASE)
+        assert mock_ollama.generate.await_count == 2
+        assert "format" not in mock_ollama.generate.call_args.kwargs
+        assert case.key_principles == ["p"]
+        assert mock_topic.resolve.call_args.args[1] == ["Privacy", "Equality"]
+
+
+class TestIngestCheckpoint:
+    def test_resume(self, tmp_path):
+        path = tmp_path / "ingest.ckpt"
+        checkpoint = IngestCheckpoint(path)
+        checkpoint.mark_done("AIR 2020 SC 100", "abc")
+        checkpoint.close()
+
+        resumed = IngestCheckpoint(path)
+        assert resumed.is_done("AIR 2020 SC 100", "abc")
+        assert not resumed.is_done("AIR 2020 SC 100", "def")
+        assert len(resumed) == 1
+        resumed.close()
@@ -0,0 +1,242 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.services import job_queue
+from app.services.job_queue import (
+    DEAD,
+    LEASE_EXPIRED_ERROR,
+    LOST,
+    QUEUED,
+    batch_progress,
+    bump_if_batch_finished,
+    claim_jobs,
+    fail_job,
+    retry_delay,
+    run_job,
+)
+
+
+def _job(**overrides):
+    defaults = dict(
+        id=7,
+        batch_id="b1",
+        citation="AIR 2020 SC 100",
+        payload={"citation": "AIR 2020 SC 100"},
+        force=False,
+        attempts=1,
+        max_attempts=3,
+    )
+    defaults.update(overrides)
+    return SimpleNamespace(**defaults)
+
+
+def _session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestBackoff:
+    def test_doubles_and_caps(self):
+        with patch.object(settings, "ingest_job_backoff_seconds", 10.0), patch.object(
+            settings, "ingest_job_backoff_max_seconds", 60.0
+        ):
+            assert [retry_delay(n) for n in (1, 2, 3, 4)] == [10.0, 20.0, 40.0, 60.0]
+
+
+class TestClaim:
+    async def test_claims_with_skip_locked(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=[_job()]), rowcount=0)
+        jobs = await claim_jobs(session, "worker-1", limit=2)
+        assert jobs[0].id == 7
+        sql = _sql(session.execute.call_args.args[0])
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "attempts=(ingestion_jobs.attempts + " in sql
+        assert "RETURNING" in sql
+
+    async def test_crash_looping_job_is_dead_lettered_not_re_leased(self):
+        # A job that kills its worker every time only comes back as an expired
+        # lease; once out of attempts it must be dead-lettered, not claimed again.
+        swept = MagicMock()
+        swept.scalars.return_value.all.return_value = ["b1"]
+        still_pending = MagicMock(first=MagicMock(return_value=(8,)))
+        session = AsyncMock()
+        session.execute.side_effect = [swept, still_pending, MagicMock(all=MagicMock(return_value=[]))]
+        assert await claim_jobs(session, "worker-1") == []
+        sweep, _, claim = (call.args[0] for call in session.execute.call_args_list)
+        sweep_sql = _sql(sweep)
+        assert sweep_sql.startswith("UPDATE ingestion_jobs SET status=")
+        assert "ingestion_jobs.locked_until < " in sweep_sql
+        assert "ingestion_jobs.attempts >= ingestion_jobs.max_attempts" in sweep_sql
+        assert {DEAD, LEASE_EXPIRED_ERROR} <= set(sweep.compile().params.values())
+        assert "ingestion_jobs.attempts < ingestion_jobs.max_attempts" in _sql(claim)
+
+
+def _leased(attempts=1, max_attempts=3):
+    """Result of fail_job's lease check; None means the row is no longer ours."""
+    row = SimpleNamespace(attempts=attempts, max_attempts=max_attempts) if attempts is not None else None
+    return MagicMock(one_or_none=MagicMock(return_value=row))
+
+
+class TestBatchCompletion:
+    async def test_bumps_corpus_version_once_batch_is_finished(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(first=MagicMock(return_value=None))
+        with patch.object(job_queue, "bump_corpus_version", AsyncMock()) as bump:
+            assert await bump_if_batch_finished(session, "b1") is True
+        bump.assert_awaited_once_with(session)
+        sql = _sql(session.execute.call_args.args[0])
+        assert "ingestion_jobs.batch_id = " in sql and "ingestion_jobs.status IN" in sql
+
+    async def test_no_bump_while_jobs_are_pending(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(first=MagicMock(return_value=(8,)))
+        with patch.object(job_queue, "bump_corpus_version", AsyncMock()) as bump:
+            assert await bump_if_batch_finished(session, "b1") is False
+        bump.assert_not_awaited()
+
+
+class TestFailJob:
+    async def test_requeues_with_backoff(self):
+        session = AsyncMock()
+        session.execute.side_effect = [_leased(attempts=1), MagicMock()]
+        assert await fail_job(session, 7, "worker-1", "boom") == QUEUED
+        assert "run_after" in _sql(session.execute.call_args.args[0])
+
+    async def test_dead_letters_after_max_attempts(self):
+        session = AsyncMock()
+        session.execute.side_effect = [_leased(attempts=3), MagicMock()]
+        assert await fail_job(session, 7, "worker-1", "boom") == DEAD
+        assert "run_after" not in _sql(session.execute.call_args.args[0])
+
+    async def test_checks_lease_and_reads_current_attempts(self):
+        session = AsyncMock()
+        session.execute.side_effect = [_leased(attempts=3), MagicMock()]
+        assert await fail_job(session, 7, "worker-1", "boom") == DEAD
+        check = session.execute.call_args_list[0].args[0]
+        sql = _sql(check)
+        assert "ingestion_jobs.locked_by = " in sql and "ingestion_jobs.status = " in sql
+        assert "FOR UPDATE" in sql
+        assert {"worker-1", "running"} <= set(check.compile().params.values())
+
+    async def test_lost_lease_changes_nothing(self):
+        session = AsyncMock()
+        session.execute.return_value = _leased(attempts=None)
+        assert await fail_job(session, 7, "worker-1", "boom") is None
+        session.execute.assert_awaited_once()
+
+
+class TestRunJob:
+    async def test_success_commits_case_and_completion_together(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(rowcount=1)
+        process = AsyncMock(return_value=SimpleNamespace(id=42))
+        with patch.object(job_queue, "process_case", process), patch.object(
+            job_queue, "bump_if_batch_finished", AsyncMock(return_value=False)
+        ) as finished:
+            assert await run_job(_session_factory(session), _job(), "worker-1") == "done"
+        assert session.commit.await_count == 1
+        finished.assert_awaited_once_with(session, "b1")
+        complete = session.execute.call_args.args[0]
+        assert "case_id" in _sql(complete)
+        assert "ingestion_jobs.locked_by = " in _sql(complete)
+        assert {"worker-1", "running"} <= set(complete.compile().params.values())
+
+    async def test_unchanged_case_is_skipped(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(rowcount=1)
+        with patch.object(job_queue, "process_case", AsyncMock(return_value=None)), patch.object(
+            job_queue, "bump_if_batch_finished", AsyncMock(return_value=False)
+        ):
+            assert await run_job(_session_factory(session), _job(), "worker-1") == "skipped"
+
+    async def test_last_job_of_batch_bumps_corpus_version_after_commit(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(rowcount=1)
+        process = AsyncMock(return_value=SimpleNamespace(id=42))
+        with patch.object(job_queue, "process_case", process), patch.object(
+            job_queue, "bump_if_batch_finished", AsyncMock(return_value=True)
+        ):
+            assert await run_job(_session_factory(session), _job(), "worker-1") == "done"
+        assert session.commit.await_count == 2  # the job's outcome, then the bump
+
+    async def test_failure_schedules_retry(self):
+        session = AsyncMock()
+        session.execute.side_effect = [_leased(attempts=1), MagicMock()]
+        with patch.object(job_queue, "process_case", AsyncMock(side_effect=RuntimeError("ollama down"))):
+            assert await run_job(_session_factory(session), _job(attempts=1), "worker-1") == "retry"
+        params = session.execute.call_args.args[0].compile().params
+        assert params["last_error"] == "RuntimeError: ollama down"
+
+    async def test_reclaimed_job_is_not_completed_by_its_old_worker(self):
+        # worker-1's lease expired and worker-2 reclaimed the job, so worker-1's
+        # completion matches no row: its work is rolled back, the job untouched.
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(rowcount=0)
+        with patch.object(job_queue, "process_case", AsyncMock(return_value=SimpleNamespace(id=42))):
+            assert await run_job(_session_factory(session), _job(), "worker-1") == LOST
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
+
+    async def test_reclaimed_job_failure_is_not_recorded(self):
+        session = AsyncMock()
+        session.execute.return_value = _leased(attempts=None)
+        with patch.object(job_queue, "process_case", AsyncMock(side_effect=RuntimeError("ollama down"))):
+            assert await run_job(_session_factory(session), _job(), "worker-1") == LOST
+        session.execute.assert_awaited_once()
+
+
+class TestBatchProgress:
+    async def test_unknown_batch(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+        assert await batch_progress(session, "missing") is None
+
+    async def test_counts_and_errors(self):
+        error = MagicMock()
+        error._asdict.return_value = {"citation": "X", "status": DEAD, "attempts": 3, "last_error": "boom"}
+        session = AsyncMock()
+        session.execute.side_effect = [
+            MagicMock(all=MagicMock(return_value=[("done", 8), ("queued", 1), ("dead", 1)])),
+            MagicMock(all=MagicMock(return_value=[error])),
+        ]
+        progress = await batch_progress(session, "b1")
+        assert progress["total"] == 10
+        assert progress["finished"] == 9
+        assert progress["counts"]["running"] == 0
+        assert progress["errors"][0]["last_error"] == "boom"
+
+
+class TestIngestRoutes:
+    async def test_submit_batch(self, client, mock_db):
+        with patch("app.api.routes.enqueue_batch", AsyncMock(return_value=("b1", 1))) as enqueue:
+            resp = await client.post(
+                "/api/ingest/batches",
+                json={"cases": [{"case_name": "A v. B", "citation": "AIR 2020 SC 1", "year": 2020}]},
+            )
+        assert resp.status_code == 202
+        assert resp.json() == {"batch_id": "b1", "queued": 1}
+        assert enqueue.call_args.args[1] == [{"case_name": "A v. B", "citation": "AIR 2020 SC 1", "year": 2020}]
+        mock_db.commit.assert_awaited_once()
+
+    async def test_rejects_oversized_batch(self, client):
+        case = {"case_name": "A v. B", "citation": "AIR 2020 SC 1", "year": 2020}
+        with patch.object(settings, "ingest_batch_max_cases", 1):
+            resp = await client.post("/api/ingest/batches", json={"cases": [case, case]})
+        assert resp.status_code == 413
+
+    async def test_unknown_batch_is_404(self, client):
+        with patch("app.api.routes.batch_progress", AsyncMock(return_value=None)):
+            resp = await client.get("/api/ingest/batches/missing")
+        assert resp.status_code == 404
@@ -0,0 +1,64 @@
+import httpx
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.services.embedding_cache import embedding_cache
+from app.services.metrics import stage, statement_type
+from app.services.ollama_client import OllamaClient
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestStageTimer:
+    def test_stage_observes_histogram(self):
+        labels = {"operation": "test", "stage": "block"}
+        before = _sample("stage_duration_seconds_count", labels)
+        with stage("test", "block"):
+            pass
+        assert _sample("stage_duration_seconds_count", labels) == before + 1
+
+    def test_statement_type(self):
+        assert statement_type("  SELECT 1") == "select"
+        assert statement_type("WITH x AS (SELECT 1) SELECT * FROM x") == "with"
+        assert statement_type("SET LOCAL hnsw.ef_search = 40") == "other"
+
+
+class TestOllamaMetrics:
+    async def test_outcomes_are_counted(self):
+        responses = iter([httpx.Response(200, json={"embedding": [0.1]}), httpx.Response(500)])
+        client = OllamaClient(base_url="http://ollama.test", embedding_model="m-metrics", llm_model="llm")
+        client._build_client = lambda: httpx.AsyncClient(
+            base_url="http://ollama.test", transport=httpx.MockTransport(lambda request: next(responses))
+        )
+        await client.embed("a")
+        try:
+            await client.embed("b")
+        except httpx.HTTPStatusError:
+            pass
+        await client.aclose()
+        base = {"endpoint": "/api/embeddings", "model": "m-metrics"}
+        assert _sample("ollama_requests_total", {**base, "outcome": "ok"}) == 1
+        assert _sample("ollama_requests_total", {**base, "outcome": "http_error"}) == 1
+
+
+class TestMetricsEndpoint:
+    async def test_exposes_route_histograms(self):
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        await client.get("/health")
+        resp = await client.get("/metrics")
+        assert resp.status_code == 200
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in resp.text
+        assert "db_pool_connections_in_use" in resp.text
+
+    def test_exposes_embedding_cache_counters(self):
+        embedding_cache.clear()
+        embedding_cache.get("m", "privacy")
+        embedding_cache.put("m", "privacy", [0.1])
+        embedding_cache.get("m", "privacy")
+        assert _sample("embedding_cache_hits_total", {}) == 1
+        assert _sample("embedding_cache_misses_total", {}) == 1
+        assert _sample("embedding_cache_size", {}) == 1
+        embedding_cache.clear()
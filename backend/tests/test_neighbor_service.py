@@ -0,0 +1,81 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import neighbor_service
+from app.services.neighbor_service import merge_neighbor, refresh_all, update_neighbors
+
+
+def _rows(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _scalars(values):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+
+class TestMergeNeighbor:
+    def test_inserts_closer_case_and_trims(self):
+        existing = [(2, 0.9), (3, 0.7)]
+        assert merge_neighbor(existing, 9, 0.8, n=2) == [(2, 0.9), (9, 0.8)]
+
+    def test_unchanged_when_not_close_enough(self):
+        assert merge_neighbor([(2, 0.9), (3, 0.7)], 9, 0.1, n=2) is None
+
+    def test_rescores_existing_entry(self):
+        existing = [(9, 0.95), (2, 0.9), (3, 0.7)]
+        assert merge_neighbor(existing, 9, 0.5, n=3) == [(2, 0.9), (3, 0.7), (9, 0.5)]
+
+    def test_short_list_grows(self):
+        assert merge_neighbor([(2, 0.9)], 9, 0.1, n=3) == [(2, 0.9), (9, 0.1)]
+
+
+class TestUpdateNeighbors:
+    async def test_merges_into_neighbour_lists_without_extra_ann_queries(self):
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _rows([SimpleNamespace(id=2, sim=0.9), SimpleNamespace(id=3, sim=0.8)]),  # own ANN
+            _scalars([2]),  # referrers
+            MagicMock(),  # advisory locks
+            _rows([SimpleNamespace(case_id=2, neighbor_id=5, similarity=0.95)]),  # case 3 never computed
+            MagicMock(),  # delete
+            MagicMock(),  # insert
+        ]
+        await update_neighbors(session, 1, [0.1] * 768, n=2)
+        assert session.execute.await_count == 6
+        inserted = session.execute.call_args_list[5].args[1]
+        assert {(r["case_id"], r["rank"], r["neighbor_id"]) for r in inserted} == {
+            (1, 1, 2),
+            (1, 2, 3),
+            (2, 1, 5),
+            (2, 2, 1),
+        }
+
+
+class TestRefreshAll:
+    async def test_counts_refreshed_and_failed_batches(self):
+        session = AsyncMock()
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        async def batches(reader, batch_size):
+            for ids in ([1, 2], [3, 4], [5]):
+                yield ids
+
+        async def refresh(session, ids):
+            if ids == [3, 4]:
+                raise RuntimeError("boom")
+
+        lines = []
+        with patch.object(neighbor_service, "stream_embedded_case_ids", batches), patch.object(
+            neighbor_service, "refresh_neighbors", refresh
+        ):
+            assert await refresh_all(factory, batch_size=2, parallel=2, report=lines.append) == (3, 2)
+        assert session.commit.await_count == 2
+        assert any("ERROR: ids 3..4 - boom" in line for line in lines)
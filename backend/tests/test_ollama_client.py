@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services.ollama_client import OllamaClient
+
+
+def _mock_client(handler, base_url="http://ollama.test", **urls) -> OllamaClient:
+    client = OllamaClient(base_url=base_url, embedding_model="embed", llm_model="llm", **urls)
+    client._build_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestOllamaClient:
+    async def test_embed(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/api/embeddings"
+            assert json.loads(request.content) == {"model": "embed", "prompt": "hello", "keep_alive": "30m"}
+            return httpx.Response(200, json={"embedding": [0.1, 0.2]})
+
+        client = _mock_client(handler)
+        assert await client.embed("hello") == [0.1, 0.2]
+        await client.aclose()
+
+    async def test_generate_sends_system(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            assert request.url.path == "/api/generate"
+            assert body["model"] == "llm"
+            assert body["system"] == "sys"
+            return httpx.Response(200, json={"response": "  out  "})
+
+        client = _mock_client(handler)
+        assert await client.generate("prompt", system="sys") == "out"
+        await client.aclose()
+
+    async def test_generate_sends_format(self):
+        schema = {"type": "object", "properties": {"topics": {"type": "array"}}}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["format"] == schema
+            return httpx.Response(200, json={"response": "{}"})
+
+        client = _mock_client(handler)
+        assert await client.generate("prompt", format=schema) == "{}"
+        await client.aclose()
+
+    async def test_client_is_reused_until_closed(self):
+        client = _mock_client(lambda request: httpx.Response(200, json={"embedding": []}))
+        first = client.client
+        await client.embed("a")
+        await client.embed("b")
+        assert client.client is first
+        await client.aclose()
+        assert first.is_closed
+        assert client.client is not first
+        await client.aclose()
+
+    async def test_limit_concurrency_caps_in_flight_requests(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"embedding": [0.0]})
+
+        client = _mock_client(handler)
+        client.limit_concurrency(2)
+        await asyncio.gather(*(client.embed(str(i)) for i in range(6)))
+        assert peak == 2
+        await client.aclose()
+
+    async def test_embed_many_chunks_batches(self):
+        batches = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            assert request.url.path == "/api/embed"
+            batches.append(body["input"])
+            return httpx.Response(200, json={"embeddings": [[float(t)] for t in body["input"]]})
+
+        client = _mock_client(handler)
+        result = await client.embed_many([str(i) for i in range(5)], batch_size=2)
+        assert result == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        assert sorted(len(b) for b in batches) == [1, 2, 2]
+        await client.aclose()
+
+
+class TestOllamaEndpointPool:
+    async def test_least_loaded_instance_gets_the_request(self):
+        hosts = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"embedding": [0.0]})
+
+        client = _mock_client(handler, base_url="http://a,http://b")
+        await asyncio.gather(*(client.embed(str(i)) for i in range(4)))
+        assert sorted(hosts) == ["a", "a", "b", "b"]
+        await client.aclose()
+
+    async def test_refused_connection_fails_over(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "a":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"embedding": [1.0]})
+
+        client = _mock_client(handler, base_url="http://a,http://b")
+        assert [await client.embed("x") for _ in range(2)] == [[1.0], [1.0]]
+        down = client.endpoints[0]
+        assert down.url == "http://a" and down.failures >= 1
+        await client.aclose()
+
+    async def test_embed_and_generate_use_their_own_instances(self):
+        hosts = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts[request.url.path] = request.url.host
+            return httpx.Response(200, json={"embedding": [0.0], "response": "ok"})
+
+        client = _mock_client(handler, embed_urls="http://embedder", generate_urls="http://llm")
+        await client.embed("x")
+        await client.generate("p")
+        assert hosts == {"/api/embeddings": "embedder", "/api/generate": "llm"}
+        await client.aclose()
+
+    async def test_health_check_ejects_down_instances_and_warms_missing_models(self):
+        warmed = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "down":
+                raise httpx.ConnectError("refused", request=request)
+            if request.url.path == "/api/ps":
+                return httpx.Response(200, json={"models": [{"name": "embed:latest"}]})
+            warmed.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200, json={})
+
+        client = _mock_client(handler, base_url="http://up,http://down")
+        await client.check_endpoints()
+        await asyncio.gather(*client._warming.values())
+        up, down = client.endpoints
+        assert up.available and up.loaded_models == {"embed:latest"}
+        assert not down.available
+        assert warmed == [("/api/generate", {"model": "llm", "keep_alive": "30m"})]
+        assert client.status()["generate"] == ["http://up", "http://down"]
+        await client.aclose()
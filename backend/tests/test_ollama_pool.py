@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from app.services.ollama_pool import EndpointPool, OllamaEndpoint, build_pools, model_key, parse_urls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _endpoints(*urls, clock=None):
+    return [OllamaEndpoint(url, clock=clock or FakeClock()) for url in urls]
+
+
+class TestParsing:
+    def test_parse_urls_strips_and_dedupes(self):
+        assert parse_urls(" http://a:11434/, http://b:11434,,http://a:11434") == [
+            "http://a:11434",
+            "http://b:11434",
+        ]
+
+    def test_model_key_defaults_tag(self):
+        assert model_key("llama3") == "llama3:latest"
+        assert model_key("nomic-embed-text:v1.5") == "nomic-embed-text:v1.5"
+
+    def test_build_pools_falls_back_and_shares_endpoints(self):
+        embed, generate = build_pools("http://a,http://b", generate_urls="http://b,http://c")
+        assert [e.url for e in embed.endpoints] == ["http://a", "http://b"]
+        assert [e.url for e in generate.endpoints] == ["http://b", "http://c"]
+        assert embed.endpoints[1] is generate.endpoints[0]
+
+
+class TestEndpointPool:
+    def test_picks_fewest_in_flight(self):
+        a, b = _endpoints("http://a", "http://b")
+        a.acquire()
+        pool = EndpointPool([a, b])
+        assert pool.pick() is b
+        b.acquire()
+        b.acquire()
+        assert pool.pick() is a
+
+    def test_ties_rotate(self):
+        pool = EndpointPool(_endpoints("http://a", "http://b"))
+        assert {pool.pick().url for _ in range(4)} == {"http://a", "http://b"}
+
+    def test_exclude_skips_tried_endpoints(self):
+        a, b = _endpoints("http://a", "http://b")
+        assert EndpointPool([a, b]).pick(exclude=[a]) is b
+
+    def test_ejection_after_consecutive_failures_and_recovery(self):
+        clock = FakeClock()
+        a, b = _endpoints("http://a", "http://b", clock=clock)
+        pool = EndpointPool([a, b])
+        settings = dict(ollama_eject_after_failures=2, ollama_eject_seconds=30)
+        with patch.multiple("app.services.ollama_pool.settings", **settings):
+            a.record_failure("refused")
+            assert a.available
+            a.record_failure("refused")
+        assert not a.available
+        assert all(pool.pick() is b for _ in range(3))
+        clock.now += 31
+        assert a.available
+        a.record_success()
+        assert a.failures == 0
+
+    def test_fails_open_when_everything_is_ejected(self):
+        clock = FakeClock()
+        a, b = _endpoints("http://a", "http://b", clock=clock)
+        with patch.multiple("app.services.ollama_pool.settings", ollama_eject_seconds=30):
+            a.record_failure("down", eject=True)
+            clock.now += 5
+            b.record_failure("down", eject=True)
+        assert EndpointPool([a, b]).pick() is a
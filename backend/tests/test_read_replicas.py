@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.db.replicas import ReadRouter, Replica
+from app.db.session import open_read_session
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _replica(name, session=None):
+    return Replica(name=name, session_maker=MagicMock(return_value=session or AsyncMock()))
+
+
+class TestReadRouter:
+    def test_round_robin(self):
+        router = ReadRouter([_replica("a"), _replica("b")])
+        assert [r.name for r in router.candidates()] == ["a", "b"]
+        assert [r.name for r in router.candidates()] == ["b", "a"]
+
+    def test_marked_down_replica_is_skipped_until_retry(self):
+        clock = FakeClock()
+        a, b = _replica("a"), _replica("b")
+        router = ReadRouter([a, b], retry_after=30, clock=clock)
+        router.mark_down(a, OSError("connection refused"))
+        assert router.candidates() == [b]
+        assert router.status()[0]["healthy"] is False
+        clock.now = 30
+        assert a in router.candidates()
+
+
+class TestOpenReadSession:
+    async def test_fails_over_to_next_replica(self):
+        broken = AsyncMock()
+        broken.connection.side_effect = OSError("connection refused")
+        healthy = AsyncMock()
+        router = ReadRouter([_replica("a", broken), _replica("b", healthy)])
+        with patch("app.db.session.read_router", router):
+            assert await open_read_session() is healthy
+        broken.close.assert_awaited_once()
+        assert router.replicas[0].failures == 1
+
+    async def test_falls_back_to_primary(self):
+        broken = AsyncMock()
+        broken.connection.side_effect = OSError("connection refused")
+        primary = AsyncMock()
+        router = ReadRouter([_replica("a", broken)])
+        with patch("app.db.session.read_router", router), patch(
+            "app.db.session.async_session_maker", MagicMock(return_value=primary)
+        ):
+            assert await open_read_session() is primary
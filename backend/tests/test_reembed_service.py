@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.reembed_service import (
+    count_cases_to_reembed,
+    embedding_text,
+    resize_embedding_column,
+    write_embeddings,
+)
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestReembedService:
+    async def test_count_targets_missing_or_stale_embeddings(self):
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalar_one.return_value = 3
+        session.execute.return_value = result
+        assert await count_cases_to_reembed(session, "nomic-embed-text") == 3
+        sql = _sql(session.execute.call_args.args[0])
+        assert "cases.embedding IS NULL" in sql
+        assert "IS DISTINCT FROM" in sql
+
+    async def test_count_all_ignores_model(self):
+        session = AsyncMock()
+        session.execute.return_value = MagicMock()
+        await count_cases_to_reembed(session, "nomic-embed-text", include_current=True, after_id=10)
+        sql = _sql(session.execute.call_args.args[0])
+        assert "IS DISTINCT FROM" not in sql
+        assert "cases.id >" in sql
+
+    async def test_write_embeddings_is_one_executemany(self):
+        session = AsyncMock()
+        await write_embeddings(session, [(1, [0.1]), (2, [0.2])], "m")
+        stmt, params = session.execute.call_args.args
+        assert _sql(stmt).startswith("UPDATE cases SET embedding=")
+        assert [p["case_id"] for p in params] == [1, 2]
+        assert all(p["embedding_model"] == "m" for p in params)
+        assert session.execute.await_count == 1  # the corpus version is bumped once per run
+
+    async def test_resize_recreates_vector_index(self):
+        session = AsyncMock()
+        await resize_embedding_column(session, 1024)
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        alter = next(i for i, sql in enumerate(statements) if sql.startswith("ALTER TABLE cases"))
+        assert "vector(1024)" in statements[alter]
+        assert any(sql.startswith("DROP INDEX") for sql in statements[:alter])
+        assert statements[-1].startswith("CREATE INDEX IF NOT EXISTS idx_cases_embedding_hnsw ON cases")
+
+    async def test_resize_can_defer_index_to_caller(self):
+        session = AsyncMock()
+        await resize_embedding_column(session, 1024, create_index=False)
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert not any(sql.startswith("CREATE INDEX") for sql in statements)
+
+    def test_embedding_text_uses_stored_summary(self):
+        row = SimpleNamespace(
+            facts="f", legal_issues="l", judgment="j", ratio_decidendi="r", key_principles=["p1", "p2"]
+        )
+        assert embedding_text(row) == "f l j r p1 p2"
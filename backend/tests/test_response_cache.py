@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.corpus_version import bump_corpus_version, get_corpus_version, reset_corpus_version_cache
+from app.services.response_cache import MemoryCacheBackend, NullCacheBackend, build_snapshot_store
+from app.services.search_service import SearchPage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryCacheBackend:
+    async def test_lru_and_ttl(self):
+        clock = FakeClock()
+        cache = MemoryCacheBackend(max_entries=2, clock=clock)
+        await cache.set("a", b"1", ttl=10)
+        await cache.set("b", b"2", ttl=10)
+        await cache.get("a")
+        await cache.set("c", b"3", ttl=10)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == b"1"
+        clock.now = 10
+        assert await cache.get("a") is None
+
+
+    def test_snapshots_do_not_depend_on_response_cache(self):
+        assert isinstance(build_snapshot_store(NullCacheBackend()), MemoryCacheBackend)
+        response_cache = MemoryCacheBackend()
+        assert build_snapshot_store(response_cache) is not response_cache
+
+
+class TestCorpusVersion:
+    async def test_version_is_memoised(self):
+        reset_corpus_version_cache()
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = 7
+        session.execute.return_value = result
+        assert await get_corpus_version(session) == 7
+        assert await get_corpus_version(session) == 7
+        session.execute.assert_awaited_once()
+        reset_corpus_version_cache()
+
+    async def test_bump_creates_missing_row(self):
+        session = AsyncMock()
+        await bump_corpus_version(session)
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT INTO corpus_state")
+        assert "ON CONFLICT (id) DO UPDATE SET version = (corpus_state.version + " in sql
+
+
+class TestCachedRoutes:
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_repeat_request_is_served_from_cache(self, mock_search, client, sample_case_row):
+        mock_search.return_value = SearchPage([(sample_case_row, 0.9)])
+        first = await client.get("/api/search", params={"q": "Right to Privacy", "topic_ids": "2,1"})
+        second = await client.get("/api/search", params={"topic_ids": "1, 2", "q": " Right to Privacy "})
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.headers["cache-control"] == "public, max-age=60"
+        assert "vary" not in first.headers
+        mock_search.assert_awaited_once()
+
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_if_none_match_returns_304(self, mock_search, client, sample_case_row):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
+        first = await client.get("/api/cases")
+        resp = await client.get("/api/cases", headers={"If-None-Match": first.headers["etag"]})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_corpus_version_bump_invalidates(self, mock_search, client, sample_case_row):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
+        await client.get("/api/cases")
+        with patch("app.api.caching.get_corpus_version", new_callable=AsyncMock, return_value=2):
+            await client.get("/api/cases")
+        assert mock_search.await_count == 2
+
+    @patch("app.api.routes.get_similar_cases", new_callable=AsyncMock)
+    async def test_api_key_does_not_split_cache(self, mock_similar, client, sample_case_row):
+        mock_similar.return_value = [(sample_case_row, 0.8)]
+        await client.get("/api/cases/1/similar", params={"api_key": "a"})
+        await client.get("/api/cases/1/similar")
+        mock_similar.assert_awaited_once()
+
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_keyed_responses_are_private(self, mock_search, client, sample_case_row):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
+        with patch("app.middleware.auth.settings.api_key", "secret"):
+            resp = await client.get("/api/cases", headers={"X-API-Key": "secret"})
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == "private, max-age=60"
+        assert resp.headers["vary"] == "X-API-Key"
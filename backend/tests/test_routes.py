@@ -1,6 +1,10 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
+from conftest import _make_case_row
+from app.services.search_service import SearchPage
+
 
 def _scalars_all(items):
     """Helper to make a mock result whose .scalars().all() returns items."""
@@ -17,25 +21,26 @@ def _scalar_one_or_none(item):
 
 class TestSearchEndpoint:
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
-    async def test_search_no_query(self, mock_search, client, sample_case, mock_db):
-        mock_search.return_value = [(sample_case, None)]
+    async def test_search_no_query(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
         resp = await client.get("/api/search")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data) == 1
         assert data[0]["case"]["case_name"] == "Test Case v. State"
+        assert data[0]["case"]["snippet"] == "Right to equality is fundamental."
 
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
-    async def test_search_with_query(self, mock_search, client, sample_case, mock_db):
-        mock_search.return_value = [(sample_case, 0.92)]
+    async def test_search_with_query(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, 0.92)])
         resp = await client.get("/api/search", params={"q": "right to privacy"})
         assert resp.status_code == 200
         data = resp.json()
         assert data[0]["similarity"] == 0.92
 
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
-    async def test_search_with_filters(self, mock_search, client, sample_case, mock_db):
-        mock_search.return_value = [(sample_case, 0.8)]
+    async def test_search_with_filters(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, 0.8)])
         resp = await client.get(
             "/api/search",
             params={"q": "test", "topic_ids": "1,2", "year_from": 2000, "year_to": 2025},
@@ -45,9 +50,20 @@ class TestSearchEndpoint:
         call_kwargs = mock_search.call_args
         assert call_kwargs.kwargs.get("topic_ids") == [1, 2] or call_kwargs[1].get("topic_ids") == [1, 2]
 
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_search_mode(self, mock_search, client, mock_db):
+        mock_search.return_value = SearchPage([])
+        resp = await client.get("/api/search", params={"q": "Section 377", "mode": "lexical"})
+        assert resp.status_code == 200
+        assert mock_search.call_args.kwargs["mode"] == "lexical"
+
+    async def test_search_invalid_mode(self, client, mock_db):
+        resp = await client.get("/api/search", params={"q": "x", "mode": "fuzzy"})
+        assert resp.status_code == 422
+
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
     async def test_search_empty_results(self, mock_search, client, mock_db):
-        mock_search.return_value = []
+        mock_search.return_value = SearchPage([])
         resp = await client.get("/api/search", params={"q": "nonexistent"})
         assert resp.status_code == 200
         assert resp.json() == []
@@ -55,19 +71,31 @@ class TestSearchEndpoint:
 
 class TestCasesEndpoint:
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
-    async def test_list_cases(self, mock_search, client, sample_case, mock_db):
-        mock_search.return_value = [(sample_case, None)]
+    async def test_list_cases(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
         resp = await client.get("/api/cases")
         assert resp.status_code == 200
         data = resp.json()
         assert data[0]["case_name"] == "Test Case v. State"
 
     @patch("app.api.routes.search_cases", new_callable=AsyncMock)
-    async def test_list_cases_with_filters(self, mock_search, client, sample_case, mock_db):
-        mock_search.return_value = [(sample_case, None)]
+    async def test_list_cases_with_filters(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, None)])
         resp = await client.get("/api/cases", params={"year_from": 2015, "limit": 5})
         assert resp.status_code == 200
 
+    @patch("app.api.routes.search_cases", new_callable=AsyncMock)
+    async def test_list_cases_cursor_round_trip(self, mock_search, client, sample_case_row, mock_db):
+        mock_search.return_value = SearchPage([(sample_case_row, None)], "abc")
+        resp = await client.get("/api/cases", params={"limit": 1})
+        assert resp.headers["x-next-cursor"] == "abc"
+        await client.get("/api/cases", params={"limit": 1, "cursor": "abc"})
+        assert mock_search.call_args.kwargs["cursor"] == "abc"
+
+    async def test_list_cases_invalid_cursor(self, client, mock_db):
+        resp = await client.get("/api/cases", params={"cursor": "bogus"})
+        assert resp.status_code == 400
+
 
 class TestCaseDetailEndpoint:
     async def test_get_case_found(self, client, sample_case, mock_db):
@@ -87,22 +115,34 @@ class TestCaseDetailEndpoint:
 
 class TestSimilarCasesEndpoint:
     @patch("app.api.routes.get_similar_cases", new_callable=AsyncMock)
-    async def test_similar_cases(self, mock_similar, client, sample_case, mock_db):
-        case2 = MagicMock()
-        case2.id = 2
-        case2.case_name = "Another Case"
-        case2.citation = "AIR 2021 SC 200"
-        case2.year = 2021
-        case2.bench = None
-        case2.ratio_decidendi = "Some ratio"
-        case2.facts = None
-        case2.judgment = None
+    async def test_similar_cases(self, mock_similar, client, mock_db):
+        case2 = _make_case_row(
+            id=2, case_name="Another Case", citation="AIR 2021 SC 200", year=2021, bench=None, snippet="Some ratio"
+        )
         mock_similar.return_value = [(case2, 0.85)]
         resp = await client.get("/api/cases/1/similar")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data) == 1
         assert data[0]["similarity"] == 0.85
+        assert data[0]["case"]["snippet"] == "Some ratio"
+
+    @patch("app.api.routes.get_similar_cases", new_callable=AsyncMock)
+    async def test_concurrent_identical_requests_share_one_lookup(self, mock_similar, client, mock_db):
+        release = asyncio.Event()
+
+        async def slow_similar(db, case_id, limit):
+            await release.wait()
+            return [(_make_case_row(id=2), 0.9)]
+
+        mock_similar.side_effect = slow_similar
+        calls = [asyncio.create_task(client.get("/api/cases/1/similar?limit=3")) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*calls)
+        assert [r.status_code for r in responses] == [200] * 4
+        assert len({r.content for r in responses}) == 1
+        mock_similar.assert_awaited_once()
 
 
 class TestTopicsEndpoint:
@@ -0,0 +1,316 @@
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.pagination import InvalidCursor
+from app.services.response_cache import NullCacheBackend, build_snapshot_store
+from app.services.search_service import (
+    PageTooDeep,
+    get_similar_cases,
+    looks_like_citation,
+    reciprocal_rank_fusion,
+    search_cases,
+)
+
+
+def _rows(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _selected_columns(stmt) -> set[str]:
+    return {c.name for c in stmt.selected_columns}
+
+
+class TestSearchCasesProjection:
+    async def test_browse_selects_summary_columns_only(self):
+        session = AsyncMock()
+        row = SimpleNamespace(id=1, snippet="s")
+        session.execute.return_value = _rows([row])
+        page = await search_cases(session, year_from=2000, limit=5)
+        assert page.results == [(row, None)]
+        stmt = session.execute.call_args.args[0]
+        assert _selected_columns(stmt) == {"id", "case_name", "citation", "year", "bench", "snippet"}
+        assert "cases.full_text" not in _sql(stmt)
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_semantic_search_returns_similarity(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        row = SimpleNamespace(id=1, snippet="s", sim=0.9)
+        session.execute.return_value = _rows([row])
+        page = await search_cases(session, q="privacy", mode="semantic")
+        assert page.results == [(row, 0.9)]
+        stmt = session.execute.call_args.args[0]
+        assert "embedding" not in _selected_columns(stmt)
+        assert "cases.full_text" not in _sql(stmt)
+
+
+class TestHybridSearch:
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4]], k=60)
+        assert [case_id for case_id, _ in fused] == [3, 1, 2, 4]
+        assert fused[0][1] == 1 / 63 + 1 / 61
+
+    def test_looks_like_citation(self):
+        assert looks_like_citation("AIR 1973 SC 1461")
+        assert looks_like_citation("(2017) 10 SCC 1")
+        assert not looks_like_citation("Section 377")
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_hybrid_fuses_vector_and_lexical(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        vector_ids, lexical_ids = MagicMock(), MagicMock()
+        vector_ids.scalars.return_value.all.return_value = [1, 2]
+        lexical_ids.scalars.return_value.all.return_value = [2, 3]
+        rows = [SimpleNamespace(id=i, sim=s) for i, s in ((1, 0.9), (2, 0.8), (3, None))]
+        session = AsyncMock()
+        session.execute.side_effect = [MagicMock(), vector_ids, lexical_ids, _rows(rows)]
+        page = await search_cases(session, q="article 14 equality", mode="hybrid", limit=3)
+        assert [(r.id, sim) for r, sim in page.results] == [(2, 0.8), (1, 0.9), (3, None)]
+        assert "@@ websearch_to_tsquery" in _sql(session.execute.call_args_list[2].args[0])
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_citation_query_skips_embedding(self, mock_embed):
+        session = AsyncMock()
+        row = SimpleNamespace(id=7)
+        session.execute.return_value = _rows([row])
+        page = await search_cases(session, q="AIR 1973 SC 1461", mode="hybrid")
+        assert page.results == [(row, None)]
+        mock_embed.assert_not_called()
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_default_mode_is_semantic_even_for_citations(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.return_value = _rows([])
+        await search_cases(session, q="AIR 1973 SC 1461")
+        mock_embed.assert_awaited_once()
+        assert "ann_candidates" in _sql(session.execute.call_args.args[0])
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_lexical_mode_skips_embedding(self, mock_embed):
+        session = AsyncMock()
+        session.execute.return_value = _rows([])
+        assert await search_cases(session, q="Section 377", mode="lexical") == ([], None)
+        mock_embed.assert_not_called()
+
+
+def _count(n):
+    result = MagicMock()
+    result.scalar_one.return_value = n
+    return result
+
+
+def _run_ann_page(stmt, rows) -> list:
+    """Evaluate a semantic page over `rows` as Postgres would, for statements shaped by nearest_stmt.
+
+    The index hands back tied rows in an arbitrary order (here: highest id
+    first), so candidates and page only come out right if both ORDER BYs
+    break ties by id.
+    """
+    sql = _sql(stmt)
+    if "ann_candidates" not in sql:
+        return []  # set_config
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    by_id = sql.count(", cases.id \n LIMIT") == 2
+    depth = params[re.search(r"LIMIT %\((\w+)\)s\)", sql).group(1)]
+    index_order = sorted(rows, key=lambda r: (r.distance, r.id if by_id else -r.id))
+    page = sorted(index_order[:depth], key=lambda r: (r.distance, r.id if by_id else -r.id))
+    seek = re.search(r"\) > \(%\((\w+)\)s, %\((\w+)\)s\)", sql)
+    if seek:
+        page = [r for r in page if (r.distance, r.id) > (params[seek.group(1)], params[seek.group(2)])]
+    return page[stmt._offset or 0 :][: stmt._limit]
+
+
+class TestFilteredVectorSearch:
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_unfiltered_raises_ef_search_for_deep_pages(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.return_value = _rows([])
+        await search_cases(session, q="privacy", mode="semantic", limit=100, offset=200)
+        guc_sql = _sql(session.execute.call_args_list[0].args[0])
+        assert "set_config" in guc_sql
+        params = session.execute.call_args_list[0].args[0].compile().params
+        assert "hnsw.ef_search" in params.values()
+        assert "600" in params.values()
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_selective_filter_uses_exact_scan(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.side_effect = [_count(12), _rows([])]
+        await search_cases(session, q="privacy", mode="semantic", year_from=1950, year_to=1951)
+        sql = _sql(session.execute.call_args_list[1].args[0])
+        assert "WITH candidates AS MATERIALIZED" in sql
+        assert "ORDER BY candidates.distance" in sql
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    @patch("app.services.search_service.settings")
+    async def test_broad_filter_uses_iterative_index_scan(self, mock_settings, mock_embed):
+        mock_settings.exact_scan_threshold = 2000
+        mock_settings.hnsw_ef_search = 40
+        mock_settings.hnsw_iterative_scan = "strict_order"
+        mock_settings.hnsw_max_scan_tuples = 20000
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.side_effect = [_count(2001), MagicMock(), _rows([])]
+        await search_cases(session, q="privacy", mode="semantic", topic_ids=[3])
+        params = session.execute.call_args_list[1].args[0].compile().params
+        assert "strict_order" in params.values()
+        assert "WITH candidates AS" not in _sql(session.execute.call_args_list[2].args[0])
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    @patch("app.services.search_service.settings")
+    async def test_unfiltered_page_past_ef_search_cap_uses_iterative_scan(self, mock_settings, mock_embed):
+        mock_settings.hnsw_ef_search = 40
+        mock_settings.hnsw_iterative_scan = "strict_order"
+        mock_settings.hnsw_max_scan_tuples = 20000
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.return_value = _rows([])
+        await search_cases(session, q="privacy", mode="semantic", limit=20, offset=1500)
+        params = session.execute.call_args_list[0].args[0].compile().params
+        assert "1000" in params.values()
+        assert "strict_order" in params.values()
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    @patch("app.services.search_service.settings")
+    async def test_page_past_ef_search_cap_without_iterative_scan_is_rejected(self, mock_settings, mock_embed):
+        mock_settings.hnsw_ef_search = 40
+        mock_settings.hnsw_iterative_scan = ""
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        with pytest.raises(PageTooDeep):
+            await search_cases(session, q="privacy", mode="semantic", limit=20, offset=1500)
+        session.execute.assert_not_called()
+
+
+class TestKeysetPagination:
+    async def test_browse_cursor_seeks_on_year_and_id(self):
+        session = AsyncMock()
+        rows = [SimpleNamespace(id=9, year=2021), SimpleNamespace(id=4, year=2020)]
+        session.execute.return_value = _rows(rows)
+        first = await search_cases(session, limit=2)
+        assert first.next_cursor
+
+        session.execute.return_value = _rows([SimpleNamespace(id=3, year=2020)])
+        second = await search_cases(session, limit=2, cursor=first.next_cursor)
+        assert second.next_cursor is None
+        stmt = session.execute.call_args.args[0]
+        sql = _sql(stmt)
+        assert "(cases.year, cases.id) < (" in sql
+        assert "OFFSET" not in sql
+        assert {2020, 4} <= set(stmt.compile().params.values())
+
+    async def test_cursor_from_other_query_is_rejected(self):
+        session = AsyncMock()
+        session.execute.return_value = _rows([SimpleNamespace(id=9, year=2021)])
+        page = await search_cases(session, limit=1, year_from=2000)
+        with pytest.raises(InvalidCursor):
+            await search_cases(session, limit=1, year_from=1990, cursor=page.next_cursor)
+        with pytest.raises(InvalidCursor):
+            await search_cases(session, limit=1, cursor="not-a-cursor")
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_semantic_cursor_seeks_on_distance_and_id(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        session = AsyncMock()
+        session.execute.return_value = _rows([SimpleNamespace(id=5, sim=0.75, distance=0.25)])
+        first = await search_cases(session, q="privacy", mode="semantic", limit=1)
+        await search_cases(session, q="privacy", mode="semantic", limit=1, cursor=first.next_cursor)
+        stmt = session.execute.call_args.args[0]
+        assert "OFFSET" not in _sql(stmt)
+        params = [v for v in stmt.compile().params.values() if not isinstance(v, list)]
+        assert 0.25 in params and 5 in params
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_semantic_pages_over_tied_distances_neither_overlap_nor_skip(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        rows = [SimpleNamespace(id=i, distance=0.25 if i < 8 else 0.5, sim=None) for i in range(1, 11)]
+        session = AsyncMock()
+        session.execute.side_effect = lambda stmt: _rows(_run_ann_page(stmt, rows))
+        served, cursor = [], None
+        for _ in range(5):
+            page = await search_cases(session, q="privacy", mode="semantic", limit=3, cursor=cursor)
+            served += [r.id for r, _ in page.results]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert served == list(range(1, 11))
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_hybrid_pages_through_snapshot(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        vector_ids, lexical_ids = MagicMock(), MagicMock()
+        vector_ids.scalars.return_value.all.return_value = [1, 2]
+        lexical_ids.scalars.return_value.all.return_value = [2, 3]
+        session = AsyncMock()
+        session.execute.side_effect = [
+            MagicMock(),
+            vector_ids,
+            lexical_ids,
+            _rows([SimpleNamespace(id=2, sim=0.8), SimpleNamespace(id=1, sim=0.9)]),
+            _rows([SimpleNamespace(id=3, sim=None)]),
+        ]
+        first = await search_cases(session, q="article 14 equality", mode="hybrid", limit=2)
+        second = await search_cases(
+            session, q="article 14 equality", mode="hybrid", limit=2, cursor=first.next_cursor
+        )
+        assert [r.id for r, _ in second.results] == [3]
+        assert second.next_cursor is None
+        assert session.execute.await_count == 5
+
+    @patch("app.services.search_service.embed_query", new_callable=AsyncMock)
+    async def test_hybrid_snapshot_survives_null_response_cache(self, mock_embed):
+        mock_embed.return_value = [0.1] * 768
+        vector_ids, lexical_ids = MagicMock(), MagicMock()
+        vector_ids.scalars.return_value.all.return_value = [1, 2]
+        lexical_ids.scalars.return_value.all.return_value = [2, 3]
+        session = AsyncMock()
+        session.execute.side_effect = [
+            MagicMock(),
+            vector_ids,
+            lexical_ids,
+            _rows([SimpleNamespace(id=2, sim=0.8), SimpleNamespace(id=1, sim=0.9)]),
+            _rows([SimpleNamespace(id=3, sim=None)]),
+        ]
+        store = build_snapshot_store(NullCacheBackend())
+        with patch("app.services.search_service.snapshot_store", store):
+            first = await search_cases(session, q="article 14 equality", mode="hybrid", limit=2)
+            second = await search_cases(
+                session, q="article 14 equality", mode="hybrid", limit=2, cursor=first.next_cursor
+            )
+        assert [r.id for r, _ in second.results] == [3]
+        assert session.execute.await_count == 5  # the second page did not re-fuse
+
+
+class TestSimilarCasesProjection:
+    async def test_missing_embedding_returns_empty(self):
+        session = AsyncMock()
+        lookup = MagicMock()
+        lookup.scalar_one_or_none.return_value = None
+        session.execute.side_effect = [_rows([]), lookup]
+        assert await get_similar_cases(session, case_id=1) == []
+        stmt = session.execute.call_args.args[0]
+        assert _selected_columns(stmt) == {"embedding"}
+
+    async def test_precomputed_neighbours_are_a_single_lookup(self):
+        session = AsyncMock()
+        row = SimpleNamespace(id=2, snippet="s", sim=0.75)
+        session.execute.return_value = _rows([row])
+        assert await get_similar_cases(session, case_id=1) == [(row, 0.75)]
+        session.execute.assert_awaited_once()
+        sql = _sql(session.execute.call_args.args[0])
+        assert "JOIN case_neighbors" in sql
+        assert "ORDER BY case_neighbors.rank" in sql
+        assert "<=>" not in sql
@@ -0,0 +1,39 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.serializers import case_detail, case_summary, dumps, search_result
+from app.schemas import CaseDetailResponse, CaseResponse, CaseSearchResult, TopicResponse
+from conftest import _make_case
+
+ROW = SimpleNamespace(
+    id=3, case_name="Maneka Gandhi v. Union", citation="AIR 1978 SC 597", year=1978, bench=None, snippet="…"
+)
+
+
+class TestSerializers:
+    """The fast-path dicts must stay interchangeable with the published schemas."""
+
+    def test_case_summary_matches_schema(self):
+        body = case_summary(ROW, 0.5)
+        assert list(body) == list(CaseResponse.model_fields)
+        assert CaseResponse.model_validate(body).model_dump() == body
+
+    def test_search_result_matches_schema(self):
+        body = search_result(ROW, 0.25)
+        assert list(body) == list(CaseSearchResult.model_fields)
+        assert CaseSearchResult.model_validate(body).model_dump() == body
+
+    def test_case_detail_matches_schema(self):
+        body = case_detail(_make_case(key_principles=None))
+        assert list(body) == list(CaseDetailResponse.model_fields)
+        assert body["key_principles"] == []
+        assert CaseDetailResponse.model_validate(body).model_dump() == body
+
+    def test_dumps_is_compact_utf8_and_handles_models(self):
+        body = dumps([case_summary(ROW), TopicResponse(id=1, name="Privacy", slug="privacy")])
+        assert b", " not in body and "…".encode() in body
+        assert json.loads(body)[1] == {"id": 1, "name": "Privacy", "slug": "privacy"}
+        with pytest.raises(TypeError):
+            dumps({"x": object()})
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.services.metrics import SINGLE_FLIGHT_CALLS
+from app.services.single_flight import SingleFlight
+
+
+def _count(group: str, role: str) -> float:
+    return SINGLE_FLIGHT_CALLS.labels(group, role)._value.get()
+
+
+class Gate:
+    """An fn for SingleFlight.do that blocks until released and counts its runs."""
+
+    def __init__(self, result="value"):
+        self.result = result
+        self.runs = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        self.started.set()
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        flights, gate = SingleFlight("test_share"), Gate()
+        calls = [asyncio.create_task(flights.do("k", gate)) for _ in range(5)]
+        await gate.started.wait()
+        gate.release.set()
+        assert await asyncio.gather(*calls) == ["value"] * 5
+        assert gate.runs == 1
+        assert len(flights) == 0
+        assert _count("test_share", "leader") == 1
+        assert _count("test_share", "follower") == 4
+
+    async def test_distinct_keys_run_separately(self):
+        flights, gate = SingleFlight("test_keys"), Gate()
+        gate.release.set()
+        assert await asyncio.gather(flights.do("a", gate), flights.do("b", gate)) == ["value", "value"]
+        assert gate.runs == 2
+
+    async def test_error_reaches_every_caller_and_is_not_kept(self):
+        flights, gate = SingleFlight("test_error"), Gate(result=RuntimeError("ollama down"))
+        calls = [asyncio.create_task(flights.do("k", gate)) for _ in range(3)]
+        await gate.started.wait()
+        gate.release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        gate.result = "recovered"
+        assert await flights.do("k", gate) == "recovered"
+        assert gate.runs == 2
+
+    async def test_cancelled_follower_leaves_the_flight_running(self):
+        flights, gate = SingleFlight("test_follower"), Gate()
+        leader = asyncio.create_task(flights.do("k", gate))
+        await gate.started.wait()
+        follower = asyncio.create_task(flights.do("k", gate))
+        await asyncio.sleep(0)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        gate.release.set()
+        assert await leader == "value"
+
+    async def test_cancelled_leader_hands_over_to_a_follower(self):
+        flights, gate = SingleFlight("test_leader"), Gate()
+        leader = asyncio.create_task(flights.do("k", gate))
+        await gate.started.wait()
+        follower = asyncio.create_task(flights.do("k", gate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        gate.release.set()
+        assert await follower == "value"
+        assert gate.runs == 2
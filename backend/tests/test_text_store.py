@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.services import text_store
+from app.services.text_store import compress_text, decompress_text, load_full_text, save_full_text
+
+TEXT = "The petitioner challenged the detention order under Article 21. " * 50
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestTextStore:
+    def test_zlib_round_trip(self):
+        with patch.object(settings, "full_text_codec", "zlib"):
+            codec, data = compress_text(TEXT)
+        assert codec == "zlib"
+        assert len(data) < len(TEXT) / 5
+        assert decompress_text(codec, data) == TEXT
+
+    def test_zstd_falls_back_to_zlib_when_not_installed(self):
+        with patch.object(settings, "full_text_codec", "zstd"), patch.object(text_store, "zstandard", None):
+            assert compress_text("x")[0] == "zlib"
+            with pytest.raises(RuntimeError, match="zstandard"):
+                decompress_text("zstd", b"")
+
+    def test_zstd_round_trip(self):
+        pytest.importorskip("zstandard")
+        with patch.object(settings, "full_text_codec", "zstd"):
+            codec, data = compress_text(TEXT)
+        assert codec == "zstd"
+        assert decompress_text(codec, data) == TEXT
+
+    async def test_save_upserts_compressed_text(self):
+        session = AsyncMock()
+        await save_full_text(session, 7, "naïve")
+        stmt = session.execute.call_args.args[0]
+        assert "ON CONFLICT (case_id) DO UPDATE" in _sql(stmt)
+        params = stmt.compile().params
+        assert params["case_id"] == 7 and params["raw_size"] == 6
+        assert decompress_text(params["codec"], params["data"]) == "naïve"
+
+    async def test_save_empty_text_deletes(self):
+        session = AsyncMock()
+        await save_full_text(session, 7, "")
+        assert _sql(session.execute.call_args.args[0]).startswith("DELETE FROM case_texts")
+
+    async def test_load_decompresses_on_demand(self):
+        codec, data = compress_text(TEXT)
+        result = MagicMock()
+        result.one_or_none.return_value = MagicMock(codec=codec, data=data)
+        session = AsyncMock()
+        session.execute.return_value = result
+        assert await load_full_text(session, 7) == TEXT
+        result.one_or_none.return_value = None
+        assert await load_full_text(session, 8) is None
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services.topic_cache import TopicCache
+
+
+def _rows(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _session(*results):
+    session = AsyncMock()
+    session.info = {}
+    session.execute.side_effect = list(results)
+    return session
+
+
+class TestTopicCache:
+    async def test_dedupes_by_slug_and_creates_missing_in_one_insert(self):
+        cache = TopicCache()
+        session = _session(
+            _rows([("privacy", 1)]),  # existing
+            _rows([("equality", 2), ("free-speech", 3)]),  # inserted
+        )
+        ids = await cache.resolve(session, ["Privacy", "privacy ", "Free Speech", "Equality", "!!"])
+        assert ids == [1, 3, 2]
+        assert session.execute.await_count == 2
+        insert = session.execute.call_args_list[1].args[0]
+        assert "ON CONFLICT DO NOTHING" in str(insert.compile(dialect=postgresql.dialect()))
+
+    async def test_cached_topics_need_no_queries(self):
+        cache = TopicCache()
+        await cache.resolve(_session(_rows([("privacy", 1)])), ["Privacy"])
+        session = _session()
+        assert await cache.resolve(session, ["Privacy"]) == [1]
+        session.execute.assert_not_awaited()
+
+    async def test_concurrently_created_topic_is_reselected(self):
+        cache = TopicCache()
+        session = _session(
+            _rows([]),  # not there yet
+            _rows([]),  # another worker inserted it first; ON CONFLICT skipped ours
+            _rows([("privacy", 9)]),
+        )
+        assert await cache.resolve(session, ["Privacy"]) == [9]
+        assert len(cache) == 1
+
+    async def test_created_ids_are_cached_only_after_commit(self):
+        cache = TopicCache()
+        sync_session = Session()
+        sync_session.begin()
+        session = _session(_rows([]), _rows([("privacy", 4)]))
+        session.info = sync_session.info
+        assert await cache.resolve(session, ["Privacy"]) == [4]
+        assert len(cache) == 0
+        sync_session.rollback()
+        assert len(cache) == 0
+
+        sync_session.begin()
+        session = _session(_rows([]), _rows([("privacy", 5)]))
+        session.info = sync_session.info
+        await cache.resolve(session, ["Privacy"])
+        sync_session.commit()
+        assert await cache.resolve(_session(), ["Privacy"]) == [5]
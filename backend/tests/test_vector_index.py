@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import Case
+from app.services.reembed_service import create_vector_index, drop_vector_index
+from app.services.vector_index import index_ddl, index_depth, nearest_stmt, widen_ef_search
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _settings(mode: str, factor: int = 4):
+    return patch.multiple(
+        "app.services.vector_index.settings",
+        vector_quantization=mode,
+        vector_rerank_factor=factor,
+        embedding_dimension=768,
+        hnsw_ef_search=40,
+    )
+
+
+class TestVectorIndex:
+    def test_index_ddl_per_mode(self):
+        assert index_ddl("none") == (
+            "CREATE INDEX IF NOT EXISTS idx_cases_embedding_hnsw ON cases USING hnsw (embedding vector_cosine_ops)"
+        )
+        assert "(embedding::halfvec(768)) halfvec_cosine_ops" in index_ddl("halfvec", dim=768)
+        ddl = index_ddl("binary", dim=1024, concurrently=True)
+        assert ddl.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_embedding_bit_hnsw")
+        assert "(binary_quantize(embedding)::bit(1024)) bit_hamming_ops" in ddl
+
+    def test_unquantized_takes_index_order_then_breaks_ties_by_id(self):
+        with _settings("none"):
+            assert index_depth(10) == 10
+            stmt = nearest_stmt((Case.id,), [0.1] * 768, 10).limit(10)
+            sql = _sql(stmt)
+        assert "WITH ann_candidates AS MATERIALIZED" in sql
+        assert sql.count("ORDER BY cases.embedding <=> %(embedding_") == 2
+        assert sql.count(", cases.id \n LIMIT") == 2
+        assert "CAST(" not in sql
+
+    def test_halfvec_fetches_candidates_and_reranks_exactly(self):
+        with _settings("halfvec", factor=3):
+            assert index_depth(10) == 30
+            stmt = nearest_stmt((Case.id,), [0.1] * 768, 10, lambda s: s.where(Case.year == 2020))
+            sql = _sql(stmt)
+        assert "WITH ann_candidates AS MATERIALIZED" in sql
+        assert "CAST(cases.embedding AS HALFVEC(768)) <=> CAST(" in sql
+        assert "cases.year =" in sql
+        assert "ORDER BY cases.embedding <=> %(embedding_1)s, cases.id" in sql
+        assert 30 in stmt.compile().params.values()
+
+    def test_binary_uses_hamming_distance(self):
+        with _settings("binary"):
+            sql = _sql(nearest_stmt((Case.id,), [0.1] * 768, 5))
+        assert "CAST(binary_quantize(cases.embedding) AS BIT(768)) <~>" in sql
+
+    def test_unknown_mode_is_rejected(self):
+        with _settings("int8"), pytest.raises(ValueError, match="VECTOR_QUANTIZATION"):
+            index_depth(10)
+
+    async def test_widen_ef_search_only_when_needed(self):
+        session = AsyncMock()
+        with _settings("halfvec"):
+            await widen_ef_search(session, 40)
+            session.execute.assert_not_awaited()
+            await widen_ef_search(session, 5000)
+        assert "1000" in session.execute.call_args.args[0].compile().params.values()
+
+    async def test_reembed_drops_every_index_and_builds_configured_one(self):
+        session = AsyncMock()
+        with _settings("binary"):
+            await drop_vector_index(session)
+            await create_vector_index(session)
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert [s.split()[-1] for s in statements[:3]] == [
+            "idx_cases_embedding_hnsw",
+            "idx_cases_embedding_halfvec_hnsw",
+            "idx_cases_embedding_bit_hnsw",
+        ]
+        assert "bit_hamming_ops" in statements[3]
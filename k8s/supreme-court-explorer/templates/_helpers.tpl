@@ -15,3 +15,31 @@ Usage: {{ include "sc.selectorLabels" (dict "component" "backend" "root" .) }}
 app.kubernetes.io/name: {{ .component }}
 app.kubernetes.io/part-of: supreme-court-explorer
 {{- end -}}
+
+{{/*
+Ollama base URLs for a list of StatefulSet ordinals, comma-separated.
+Usage: {{ include "sc.ollamaUrls" (list 0 1) }}
+*/}}
+{{- define "sc.ollamaUrls" -}}
+{{- $urls := list -}}
+{{- range . -}}
+{{- $urls = append $urls (printf "http://ollama-%d.ollama-headless:11434" (int .)) -}}
+{{- end -}}
+{{- join "," $urls -}}
+{{- end -}}
+
+{{/*
+Ollama client env for pods that call Ollama: every replica as the default pool,
+embedReplicas / generateReplicas (ordinals) to split traffic, and keep_alive.
+Usage: {{- include "sc.ollamaEnv" . | nindent 12 }}
+*/}}
+{{- define "sc.ollamaEnv" -}}
+- name: OLLAMA_BASE_URL
+  value: {{ include "sc.ollamaUrls" (until (int .Values.ollama.replicas)) | quote }}
+- name: OLLAMA_EMBED_URLS
+  value: {{ include "sc.ollamaUrls" .Values.ollama.embedReplicas | quote }}
+- name: OLLAMA_GENERATE_URLS
+  value: {{ include "sc.ollamaUrls" .Values.ollama.generateReplicas | quote }}
+- name: OLLAMA_KEEP_ALIVE
+  value: {{ .Values.ollama.keepAlive | quote }}
+{{- end -}}